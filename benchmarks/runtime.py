@@ -0,0 +1,288 @@
+"""
+Benchmarks for jab's runtime path: the ASGI dispatch layer of `Harness.asgi` and the
+orchestration of the `on_start`, `run` and `on_stop` lifecycle methods.
+
+Everything runs in-process against synthetic ASGI scopes, so the numbers reflect the
+overhead of the harness alone. Results can be written to a JSON file and compared
+against a previous run:
+
+    $ python -m benchmarks.runtime --json baseline.json
+    $ python -m benchmarks.runtime --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import jab
+
+App = Callable[[Dict[str, Any], jab.Receive, jab.Send], Awaitable[None]]
+
+
+class Echo:
+    def __init__(self) -> None:
+        self.body = b"Hello, world!"
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        if scope["type"] == "http":
+            await receive()
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"13")]}
+            )
+            await send({"type": "http.response.body", "body": self.body})
+            return
+
+        await receive()
+        await send({"type": "websocket.accept"})
+        while True:
+            msg = await receive()
+            if msg["type"] == "websocket.disconnect":
+                return
+            await send({"type": "websocket.send", "bytes": msg["bytes"]})
+
+
+class FakeClient:
+    """
+    `FakeClient` drives an ASGI v3 callable with synthetic HTTP requests and websocket sessions.
+    """
+
+    def __init__(self, app: App, ws_messages: int) -> None:
+        self._app = app
+        self._ws_messages = ws_messages
+
+    async def http(self) -> None:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/hello",
+            "raw_path": b"/hello",
+            "query_string": b"",
+            "headers": [(b"host", b"localhost")],
+        }
+        sent: List[Dict[str, Any]] = []
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        await self._app(scope, receive, send)
+        if not sent:
+            raise RuntimeError("No response was sent")
+
+    async def websocket(self) -> None:
+        scope = {"type": "websocket", "asgi": {"version": "3.0"}, "path": "/ws", "headers": []}
+        incoming: List[Dict[str, Any]] = [{"type": "websocket.connect"}]
+        incoming += [{"type": "websocket.receive", "bytes": b"ping"}] * self._ws_messages
+        incoming += [{"type": "websocket.disconnect", "code": 1000}]
+        messages = iter(incoming)
+
+        async def receive() -> Dict[str, Any]:
+            return next(messages)
+
+        async def send(msg: Dict[str, Any]) -> None:
+            pass
+
+        await self._app(scope, receive, send)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1e6
+
+    return {"p50_us": at(0.50), "p90_us": at(0.90), "p99_us": at(0.99), "max_us": ordered[-1] * 1e6}
+
+
+async def drive(request: Callable[[], Awaitable[None]], requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+
+    async def worker(n: int) -> None:
+        for _ in range(n):
+            start = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - start)
+
+    per_worker = max(1, requests // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {"rps": len(latencies) / elapsed, **percentiles(latencies)}
+
+
+class Lifespan:
+    """
+    `Lifespan` runs a harness's ASGI lifespan protocol in the background.
+    """
+
+    def __init__(self, harness: jab.Harness) -> None:
+        self._harness = harness
+        self._incoming: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._outgoing: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._task: Optional["asyncio.Future[None]"] = None
+
+    async def _expect(self, type_: str) -> None:
+        await self._incoming.put({"type": f"lifespan.{type_}"})
+        msg = await self._outgoing.get()
+        if msg["type"] != f"lifespan.{type_}.complete":
+            raise RuntimeError(f"lifespan {type_} failed")
+
+    async def startup(self) -> None:
+        self._task = asyncio.ensure_future(
+            self._harness.asgi({"type": "lifespan"})(self._incoming.get, self._outgoing.put)
+        )
+        await self._expect("startup")
+
+    async def shutdown(self) -> None:
+        await self._expect("shutdown")
+        if self._task is not None:
+            await self._task
+
+
+def bench_dispatch(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """
+    `bench_dispatch` measures requests through `Harness.asgi` and, as a reference, straight
+    into the handler, so that the difference is the cost of the harness's dispatch layer.
+    """
+    harness = jab.Harness().provide(Echo)
+
+    async def through_harness(scope: Dict[str, Any], receive: jab.Receive, send: jab.Send) -> None:
+        await harness.asgi(scope)(receive, send)
+
+    async def run() -> Dict[str, Dict[str, float]]:
+        lifespan = Lifespan(harness)
+        await lifespan.startup()
+        direct = FakeClient(harness._env["Echo"].asgi, args.ws_messages)
+        dispatched = FakeClient(through_harness, args.ws_messages)
+
+        results = {}
+        for name, client in (("direct", direct), ("harness", dispatched)):
+            await drive(client.http, args.requests // 10, args.concurrency)
+            await drive(client.websocket, args.requests // 100, args.concurrency)
+            results[f"http.{name}"] = await drive(client.http, args.requests, args.concurrency)
+            results[f"websocket.{name}"] = await drive(
+                client.websocket, args.requests // 10, args.concurrency
+            )
+
+        await lifespan.shutdown()
+        return results
+
+    return asyncio.new_event_loop().run_until_complete(run())
+
+
+def lifecycle_graph(providers: int, fanout: int) -> List[type]:
+    """
+    `lifecycle_graph` generates provider classes that each depend on up to `fanout` earlier
+    providers and implement all of `on_start`, `run` and `on_stop`, alternating between
+    synchronous and asynchronous `on_start` and `on_stop` methods.
+    """
+    classes: List[type] = []
+
+    for i in range(providers):
+        first = max(0, i - fanout)
+        deps = classes[first:i]
+
+        def __init__(self: Any, **kwargs: Any) -> None:
+            self.deps = kwargs
+
+        __init__.__annotations__ = {f"d{n}": dep for n, dep in enumerate(deps)}
+        __init__.__annotations__["return"] = None
+
+        def sync_hook(self) -> None:  # type: ignore
+            pass
+
+        async def async_hook(self) -> None:  # type: ignore
+            await asyncio.sleep(0)
+
+        async def run(self) -> None:  # type: ignore
+            await asyncio.sleep(0)
+
+        hook = async_hook if i % 2 else sync_hook
+        classes.append(
+            type(f"Provider{i}", (), {"__init__": __init__, "on_start": hook, "run": run, "on_stop": hook})
+        )
+
+    return classes
+
+
+def bench_lifecycle(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """
+    `bench_lifecycle` times each lifecycle phase of a harness with many lifecycle methods.
+    """
+    classes = lifecycle_graph(args.providers, args.fanout)
+    phases: Dict[str, List[float]] = {"resolve": [], "build": [], "on_start": [], "run": [], "on_stop": []}
+
+    for _ in range(args.iterations):
+        harness = jab.Harness().provide(*classes)
+        loop = harness._loop
+
+        for phase, step in (
+            ("resolve", harness.resolve),
+            ("build", harness.build),
+            ("on_start", lambda: loop.run_until_complete(harness._on_start())),
+            ("run", harness._run),
+            ("on_stop", lambda: loop.run_until_complete(harness._on_stop())),
+        ):
+            start = time.perf_counter()
+            step()
+            phases[phase].append(time.perf_counter() - start)
+
+        loop.close()
+
+    return {
+        f"lifecycle.{phase}": {"mean_ms": statistics.mean(samples) * 1e3, "min_ms": min(samples) * 1e3}
+        for phase, samples in phases.items()
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    print("\nchange against baseline")
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+            if before:
+                print(f"  {name:<24} {metric:<8} {(value - before) / before * 100:+7.1f}%")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=20000, help="HTTP requests per measurement")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent in-process clients")
+    parser.add_argument("--ws-messages", type=int, default=10, help="messages per websocket session")
+    parser.add_argument("--providers", type=int, default=500, help="providers in the lifecycle graph")
+    parser.add_argument("--fanout", type=int, default=3, help="dependencies per lifecycle provider")
+    parser.add_argument("--iterations", type=int, default=5, help="lifecycle iterations")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare results against this file")
+    args = parser.parse_args(argv)
+
+    results = {**bench_dispatch(args), **bench_lifecycle(args)}
+
+    for name, metrics in results.items():
+        print(f"{name:<24} " + "  ".join(f"{k}={v:,.1f}" for k, v in metrics.items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
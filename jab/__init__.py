@@ -3,12 +3,26 @@ from jab.exceptions import (
     MissingDependency,
     NoAnnotation,
     NoConstructor,
+    UnknownConstructor,
     DuplicateProvide,
+    FrozenHarness,
+    UnfrozenHarness,
+    NotFreezable,
 )
 from jab.harness import Harness  # NOQA
 from jab.logging import DefaultJabLogger, Logger  # NOQA
-from jab.asgi import Receive, Send, Handler  # NOQA
+from jab.asgi import App, Receive, Send, Handler, Middleware  # NOQA
 from jab.closures import closure  # NOQA
+from jab.cache import shared, shared_cache  # NOQA
+from jab.readiness import Readiness, deferred  # NOQA
+from jab.lazy import Lazy, Provider  # NOQA
+from jab.pool import Pool, pooled  # NOQA
+from jab.transient import transient  # NOQA
+from jab.memoize import memoize  # NOQA
+from jab.scheduler import Scheduler  # NOQA
+from jab.ref import ref  # NOQA
+from jab.scan import provided, scan  # NOQA
+from jab.metrics import Counter, Gauge, Histogram, Metrics, Registry  # NOQA
 
 
 class Exceptions:
@@ -16,4 +30,8 @@ class Exceptions:
     NoConstructor = NoConstructor
     MissingDependency = MissingDependency
     InvalidLifecycleMethod = InvalidLifecycleMethod
+    UnknownConstructor = UnknownConstructor
     DuplicateProvide = DuplicateProvide
+    FrozenHarness = FrozenHarness
+    UnfrozenHarness = UnfrozenHarness
+    NotFreezable = NotFreezable
@@ -0,0 +1,5 @@
+import sys
+
+from jab.cli import main
+
+sys.exit(main())
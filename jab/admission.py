@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dataclasses import dataclass
+
+from jab.asgi import App, Receive, Send
+from jab.metrics import Registry
+
+Priority = Callable[[Dict[str, Any]], int]
+
+_REJECTION = b"Service Unavailable"
+
+
+@dataclass
+class AdmissionStats:
+    """
+    `AdmissionStats` counts the requests handled by `AdmissionControl`. `rejected` includes the
+    requests that timed out in the queue.
+    """
+
+    in_flight: int
+    queued: int
+    admitted: int
+    rejected: int
+    timed_out: int
+
+
+def _equal(scope: Dict[str, Any]) -> int:
+    return 0
+
+
+class AdmissionControl:
+    """
+    `AdmissionControl` limits the number of HTTP requests an ASGI application handles at once. Requests
+    beyond `max_in_flight` wait in a queue of at most `max_queue` requests for up to `queue_timeout`
+    seconds. Requests that find the queue full or time out in it are rejected right away with a 503
+    response, which keeps the latency of admitted requests from collapsing under overload.
+
+    Queued requests are admitted in order of their priority, lowest first, and then in order of arrival.
+    When the queue is full, a request with a lower priority than the last request in the queue takes
+    that request's place, and the displaced request is rejected instead.
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        max_in_flight: int,
+        max_queue: int = 0,
+        queue_timeout: float = 1.0,
+        priority: Optional[Priority] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._priority = priority or _equal
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, "asyncio.Future[bool]"]] = []
+        self._order = itertools.count()
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._in_flight_gauge = registry.gauge("jab_admission_in_flight", "Admitted requests in flight")
+        self._queued_gauge = registry.gauge("jab_admission_queued", "Requests waiting for admission")
+        self._rejections = registry.counter("jab_admission_rejected_total", "Requests rejected with a 503")
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            in_flight=self._in_flight,
+            queued=len(self._queue),
+            admitted=self._admitted,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+        )
+
+    async def _acquire(self, priority: int) -> bool:
+        """
+        `_acquire` waits until a request with the given priority may be handled. It returns False if
+        the request must be rejected.
+        """
+        if self._in_flight < self.max_in_flight and not self._queue:
+            self._in_flight += 1
+            self._admitted += 1
+            self._in_flight_gauge.set(self._in_flight)
+            return True
+
+        # Waiters that timed out or were cancelled stay queued until they dequeue themselves.
+        pending = [x for x in self._queue if not x[2].done()]
+        if len(pending) >= self.max_queue:
+            displaced = max(pending, default=None)
+            if displaced is None or displaced[0] <= priority:
+                return False
+
+            self._dequeue(displaced)
+            if not displaced[2].done():
+                displaced[2].set_result(False)
+
+        waiter: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._order), waiter)
+        heapq.heappush(self._queue, entry)
+        self._queued_gauge.set(len(self._queue))
+
+        try:
+            return await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the request was cancelled.
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self._release()
+            raise
+        finally:
+            self._dequeue(entry)
+
+    def _dequeue(self, entry: Tuple[int, int, "asyncio.Future[bool]"]) -> None:
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._queued_gauge.set(len(self._queue))
+
+    def _release(self) -> None:
+        """
+        `_release` hands the slot of a completed request to the next queued request, if there is one.
+        """
+        while self._queue:
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                self._admitted += 1
+                self._queued_gauge.set(len(self._queue))
+                waiter.set_result(True)
+                return
+
+        self._in_flight -= 1
+        self._in_flight_gauge.set(self._in_flight)
+        self._queued_gauge.set(0)
+
+    def wrap(self, app: App) -> App:
+        """
+        `wrap` returns an ASGI application that admits HTTP requests to `app` or rejects them.
+        """
+        priority = self._priority
+
+        async def admitted(scope: Dict[str, str], receive: Receive, send: Send) -> None:
+            if scope.get("type") != "http":
+                return await app(scope, receive, send)
+
+            if not await self._acquire(priority(scope)):
+                self._rejected += 1
+                self._rejections.inc()
+                return await _reject(send)
+
+            try:
+                await app(scope, receive, send)
+            finally:
+                self._release()
+
+        return admitted
+
+
+async def _reject(send: Send) -> None:
+    headers = [(b"content-type", b"text/plain"), (b"retry-after", b"1")]
+    await send({"type": "http.response.start", "status": 503, "headers": headers})
+    await send({"type": "http.response.body", "body": _REJECTION})
@@ -5,6 +5,7 @@ from typing_extensions import Protocol
 Receive = Callable[[], Awaitable[Dict[str, Any]]]
 Send = Callable[[Dict[str, Any]], Awaitable[None]]
 Handler = Callable[[Receive, Send], Awaitable[None]]
+App = Callable[[Dict[str, str], Receive, Send], Awaitable[None]]
 
 
 class EventHandler(Protocol):
@@ -12,6 +13,11 @@ class EventHandler(Protocol):
         pass
 
 
+class Middleware(Protocol):
+    def middleware(self, app: App) -> App:
+        pass
+
+
 class NoopHandler:
     async def asgi(self, scope: Dict[str, str], receive: Receive, send: Send) -> None:
         pass
@@ -0,0 +1,181 @@
+import threading
+from collections import OrderedDict
+from inspect import isasyncgenfunction, isfunction, isgeneratorfunction, unwrap
+from typing import Any, Dict, Hashable, Optional, Tuple, TypeVar
+
+from dataclasses import dataclass
+
+from jab.exceptions import NoConstructor
+
+T = TypeVar("T")
+
+Key = Tuple[Any, Tuple[Tuple[str, int], ...]]
+
+
+def shared(constructor: T) -> T:
+    """
+    `shared` marks a constructor whose output depends only on the constructor itself and its
+    injected dependencies. Instances built by shared constructors are stored in a process-wide
+    cache and reused by every Harness that builds the same constructor with the same dependencies.
+    Shared instances must be immutable. Because they outlive any single Harness, the harness
+    never calls their `on_stop` method and they cannot be built by generator constructors.
+    """
+    from jab.harness import _yields  # jab.harness imports this module.
+
+    fn = unwrap(constructor)  # type: ignore
+    if isgeneratorfunction(fn) or isasyncgenfunction(fn) or (isfunction(fn) and _yields(fn)):
+        raise NoConstructor(
+            f"Shared constructor '{str(constructor)}' cannot be a generator or context manager"
+        )
+
+    setattr(constructor, "_jab_shared", True)
+    return constructor
+
+
+def isshared(constructor: Any) -> bool:
+    return getattr(constructor, "_jab_shared", False) is True
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+@dataclass
+class SharedStats:
+    hits: int
+    misses: int
+    instances: int
+    references: int
+
+
+class _Entry:
+    __slots__ = ("obj", "deps", "refs")
+
+    def __init__(self, obj: Any, deps: Tuple[Any, ...]) -> None:
+        self.obj = obj
+        # Holding on to the dependencies keeps their identities, which are part of the key, unique.
+        self.deps = deps
+        self.refs = 0
+
+
+class SharedCache:
+    """
+    `SharedCache` is the process-wide store of instances built by shared constructors. Instances are
+    keyed on their constructor and the identities of their dependencies and reference counted by the
+    harnesses using them. Once the cache holds more than `maxsize` instances, the least recently used
+    instances that no harness references anymore are evicted.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[Hashable, int] = {}
+        self._misses: Dict[Hashable, int] = {}
+        self._evictions = 0
+
+    @staticmethod
+    def key(constructor: Any, kwargs: Dict[str, Any]) -> Key:
+        return (constructor, tuple(sorted((k, id(v)) for k, v in kwargs.items())))
+
+    def acquire(self, key: Key) -> Optional[Any]:
+        """
+        `acquire` looks up a shared instance and takes a reference to it.
+
+        Returns
+        -------
+        Optional[Any]
+            The cached instance or None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses[key[0]] = self._misses.get(key[0], 0) + 1
+                return None
+
+            self._hits[key[0]] = self._hits.get(key[0], 0) + 1
+            self._entries.move_to_end(key)
+            entry.refs += 1
+            return entry.obj
+
+    def insert(self, key: Key, obj: Any, deps: Dict[str, Any]) -> Any:
+        """
+        `insert` stores a newly built shared instance and takes a reference to it. If another
+        harness inserted an instance under the same key in the meantime, that instance wins.
+
+        Returns
+        -------
+        Any
+            The instance stored under the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(obj, tuple(deps.values()))
+                self._entries[key] = entry
+
+            self._entries.move_to_end(key)
+            entry.refs += 1
+            self._evict()
+            return entry.obj
+
+    def release(self, key: Key) -> None:
+        """
+        `release` drops a reference to a shared instance, making it evictable once no harness
+        references it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            entry.refs = max(0, entry.refs - 1)
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        `clear` evicts every instance no harness references.
+        """
+        with self._lock:
+            for key in [k for k, v in self._entries.items() if v.refs == 0]:
+                del self._entries[key]
+                self._evictions += 1
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.maxsize:
+            return
+
+        for key in [k for k, v in self._entries.items() if v.refs == 0]:
+            del self._entries[key]
+            self._evictions += 1
+
+            if len(self._entries) <= self.maxsize:
+                return
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=sum(self._hits.values()),
+                misses=sum(self._misses.values()),
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def stats_for(self, constructor: Any) -> SharedStats:
+        with self._lock:
+            entries = [v for k, v in self._entries.items() if k[0] is constructor]
+            return SharedStats(
+                hits=self._hits.get(constructor, 0),
+                misses=self._misses.get(constructor, 0),
+                instances=len(entries),
+                references=sum(v.refs for v in entries),
+            )
+
+
+shared_cache = SharedCache()
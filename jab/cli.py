@@ -0,0 +1,170 @@
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+from typing import Any, List, Optional, TextIO
+
+import toposort
+
+from jab.exceptions import (
+    DuplicateProvide,
+    InvalidLifecycleMethod,
+    MissingDependency,
+    NoAnnotation,
+    NoConstructor,
+    NotFreezable,
+    UnknownConstructor,
+)
+from jab.harness import Harness
+from jab.plan import generate
+
+WIRING_ERRORS = (
+    DuplicateProvide,
+    InvalidLifecycleMethod,
+    MissingDependency,
+    NoAnnotation,
+    NoConstructor,
+    UnknownConstructor,
+    toposort.CircularDependencyError,
+)
+
+
+class TargetError(Exception):
+    pass
+
+
+def load(target: str) -> Harness:
+    """
+    `load` imports the Harness referenced by a `module:attribute` target. The attribute
+    may also be a method bound to a Harness, like the `harness.asgi` passed to ASGI servers.
+
+    Parameters
+    ----------
+    target : str
+        A reference to a Harness of the form `module:attribute`.
+
+    Returns
+    -------
+    Harness
+        The referenced Harness.
+
+    Raises
+    ------
+    TargetError
+        If the target cannot be imported or does not reference a Harness.
+    """
+    module_name, _, attr = target.partition(":")
+    if not module_name or not attr:
+        raise TargetError(f"Target '{target}' must be of the form module:harness")
+
+    try:
+        obj: Any = importlib.import_module(module_name)
+    except ImportError as e:
+        raise TargetError(f"Could not import module '{module_name}' ({str(e)})")
+
+    for part in attr.split("."):
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            raise TargetError(f"Module '{module_name}' has no attribute '{attr}'")
+
+    obj = getattr(obj, "__self__", obj)
+    if not isinstance(obj, Harness):
+        raise TargetError(f"Target '{target}' is not a jab Harness")
+
+    return obj
+
+
+def check(target: str, out: TextIO = sys.stdout, err: TextIO = sys.stderr) -> int:
+    """
+    `check` resolves the wiring of the referenced Harness without constructing anything
+    and reports statistics about its dependency graph.
+
+    Returns
+    -------
+    int
+        0 if the wiring resolved, 1 on any wiring error and 2 if the target could not be loaded.
+    """
+    try:
+        harness = load(target)
+        resolution = harness.resolve()
+    except TargetError as e:
+        print(f"error: {str(e)}", file=err)
+        return 2
+    except WIRING_ERRORS as e:
+        print(f"FAILED {target}", file=err)
+        print(f"  {type(e).__name__}: {str(e)}", file=err)
+        return 1
+
+    print(f"OK {target}", file=out)
+    print(f"  providers:      {resolution.providers}", file=out)
+    print(f"  edges:          {resolution.edges}", file=out)
+    print(f"  depth:          {resolution.depth}", file=out)
+    print(f"  on_start hooks: {resolution.on_start_hooks}", file=out)
+    print(f"  resolved in:    {resolution.duration * 1000:.2f}ms", file=out)
+    return 0
+
+
+def freeze(
+    target: str, output: Optional[str] = None, out: TextIO = sys.stdout, err: TextIO = sys.stderr
+) -> int:
+    """
+    `freeze` resolves the wiring of the referenced Harness and generates a module that constructs and
+    starts everything with direct calls, without resolving anything at run time. The module is written
+    to `output`, replacing it atomically, or to `out`. See `jab.plan.Frozen`.
+
+    Returns
+    -------
+    int
+        0 if the module was generated, 1 on any wiring error or if the Harness can't be frozen and 2
+        if the target could not be loaded.
+    """
+    try:
+        source = generate(load(target), target)
+    except TargetError as e:
+        print(f"error: {str(e)}", file=err)
+        return 2
+    except WIRING_ERRORS + (NotFreezable,) as e:
+        print(f"FAILED {target}", file=err)
+        print(f"  {type(e).__name__}: {str(e)}", file=err)
+        return 1
+
+    if output is None:
+        out.write(source)
+        return 0
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(source)
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    print(f"OK {target} -> {output}", file=out)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jab")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    check_parser = commands.add_parser(
+        "check", help="resolve a harness's wiring without constructing anything"
+    )
+    check_parser.add_argument("target", help="the harness to check, as module:harness")
+
+    freeze_parser = commands.add_parser(
+        "freeze", help="generate a module that runs a harness's wiring without resolving it"
+    )
+    freeze_parser.add_argument("target", help="the harness to freeze, as module:harness")
+    freeze_parser.add_argument("-o", "--output", help="the file to write the module to instead of stdout")
+
+    args = parser.parse_args(argv)
+    if args.command == "freeze":
+        return freeze(args.target, args.output)
+
+    return check(args.target)
@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from dataclasses import dataclass
+
+from jab.asgi import App, Receive, Send
+from jab.metrics import Registry
+
+Key = Callable[[Dict[str, Any]], Optional[Hashable]]
+
+_IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+# Request headers that identify the client. Requests carrying them may be answered differently.
+_CREDENTIALS = {b"authorization", b"cookie"}
+
+
+@dataclass
+class CoalescingStats:
+    executions: int
+    coalesced: int
+    fallbacks: int
+    in_flight: int
+
+
+def request_key(scope: Dict[str, Any]) -> Optional[Hashable]:
+    """
+    `request_key` is the default key of coalesced requests. GET and HEAD requests for the same path
+    and query string are coalesced, other requests aren't. Neither are requests with an Authorization
+    or Cookie header, since the response to one client must not be replayed to another.
+    """
+    method = scope.get("method", "GET")
+    if method not in _IDEMPOTENT_METHODS:
+        return None
+
+    if any(name.lower() in _CREDENTIALS for name, _ in scope.get("headers", [])):
+        return None
+
+    return (method, scope.get("path", ""), scope.get("query_string", b""))
+
+
+class _Flight:
+    __slots__ = ("messages", "done")
+
+    def __init__(self) -> None:
+        self.messages: List[Dict[str, Any]] = []
+        self.done: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+
+
+class Coalescer:
+    """
+    `Coalescer` lets concurrent HTTP requests with the same key share a single execution of an ASGI
+    application. The first request is passed on to the application while the requests arriving
+    before it completes wait for it and receive copies of the messages it sent. Requests that wait
+    longer than `timeout`, or whose shared execution fails, are passed on to the application on
+    their own. Requests whose key is None are never coalesced.
+    """
+
+    def __init__(self, registry: Registry, key: Key = request_key, timeout: float = 1.0) -> None:
+        self.timeout = timeout
+        self._key = key
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._executions = registry.counter("jab_coalesced_executions_total", "Shared request executions")
+        self._coalesced = registry.counter(
+            "jab_coalesced_requests_total", "Requests served by a shared execution"
+        )
+        self._fallbacks = registry.counter(
+            "jab_coalesced_fallbacks_total", "Coalesced requests that were executed on their own"
+        )
+
+    def stats(self) -> CoalescingStats:
+        return CoalescingStats(
+            executions=int(self._executions.value),
+            coalesced=int(self._coalesced.value),
+            fallbacks=int(self._fallbacks.value),
+            in_flight=len(self._flights),
+        )
+
+    def wrap(self, app: App) -> App:
+        """
+        `wrap` returns an ASGI application that coalesces concurrent requests to `app`.
+        """
+        key_of = self._key
+
+        async def coalesced(scope: Dict[str, str], receive: Receive, send: Send) -> None:
+            key = key_of(scope) if scope.get("type") == "http" else None
+            if key is None:
+                return await app(scope, receive, send)
+
+            flight = self._flights.get(key)
+            if flight is None:
+                return await self._lead(key, app, scope, receive, send)
+
+            try:
+                shared = await asyncio.wait_for(asyncio.shield(flight.done), self.timeout)
+            except asyncio.TimeoutError:
+                shared = False
+
+            if not shared:
+                self._fallbacks.inc()
+                return await app(scope, receive, send)
+
+            self._coalesced.inc()
+            for msg in flight.messages:
+                await send(dict(msg))
+
+        return coalesced
+
+    async def _lead(
+        self, key: Hashable, app: App, scope: Dict[str, str], receive: Receive, send: Send
+    ) -> None:
+        """
+        `_lead` executes a request whose execution concurrent requests with the same key share.
+        """
+        flight = self._flights[key] = _Flight()
+        self._executions.inc()
+
+        async def record(msg: Dict[str, Any]) -> None:
+            flight.messages.append(dict(msg))
+            await send(msg)
+
+        try:
+            await app(scope, receive, record)
+            flight.done.set_result(True)
+        finally:
+            del self._flights[key]
+            if not flight.done.done():
+                flight.done.set_result(False)
@@ -20,3 +20,15 @@ class UnknownConstructor(Exception):
 
 class DuplicateProvide(Exception):
     pass
+
+
+class FrozenHarness(Exception):
+    pass
+
+
+class UnfrozenHarness(Exception):
+    pass
+
+
+class NotFreezable(Exception):
+    pass
@@ -1,27 +1,227 @@
 from __future__ import annotations
 
 import asyncio
-from inspect import isclass, iscoroutinefunction, isfunction, ismethod
-from typing import Any, Callable, Dict, List, Optional, Type, Union, get_type_hints, overload
+import collections.abc
+import time
+from functools import partial
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    AsyncExitStack,
+    contextmanager,
+    nullcontext,
+)
+from inspect import (
+    isasyncgen,
+    isasyncgenfunction,
+    isawaitable,
+    isclass,
+    iscoroutinefunction,
+    isfunction,
+    isgenerator,
+    isgeneratorfunction,
+    ismethod,
+    unwrap,
+)
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_type_hints,
+    overload,
+)
 
 import toposort
 import uvloop
 from typing_extensions import Protocol
 
-from jab.asgi import EventHandler, Handler, Receive, Send, NoopHandler
+from jab.asgi import App, EventHandler, Handler, Middleware, Receive, Send, NoopHandler
+from jab.cache import SharedCache, isshared, shared_cache
 from jab.exceptions import (
     DuplicateProvide,
+    FrozenHarness,
+    UnfrozenHarness,
     InvalidLifecycleMethod,
     MissingDependency,
     NoAnnotation,
     NoConstructor,
     UnknownConstructor,
 )
-from jab.inspect import Dependency, Provided
+from jab.inspect import Dependency, Provided, Resolution
+from jab.lazy import LAZY, Lazy, islazy, lazy_target
 from jab.logging import DefaultJabLogger, Logger
-from jab.search import isimplementation
+from jab.memory import TRACEMALLOC, MemoryAccountant, MemoryUsage
+from jab.admission import AdmissionControl, AdmissionStats, Priority
+from jab.coalesce import Coalescer, CoalescingStats, Key, request_key
+from jab.instrument import Route, RouteInstrumentation, path
+from jab.memoize import memo_stats
+from jab.metrics import Metrics, Registry
+from jab.monitor import LoopMonitor, LoopStats
+from jab.plan import fingerprint, load_plan, store_plan
+from jab.pool import POOL, Pool, PoolStats, ispool, pool_settings, pool_target
+from jab.responses import ResponseCache, ResponseCacheStats
+from jab.readiness import Readiness, isdeferred
+from jab.ref import isref
+from jab.scheduler import JobStats, Scheduler
+from jab.search import isimplementation, protocol_attrs
+from jab.snapshot import SnapshotStore
+from jab.transient import istransient
+
+T = TypeVar("T")
 
 DEFAULT_LOGGER = "DEFAULT LOGGER"
+READINESS = "READINESS"
+METRICS = "METRICS"
+SCHEDULER = "SCHEDULER"
+
+# Return annotations of functional constructors that yield the provided object
+# rather than return it. The yielded type is the first type argument.
+_YIELDING = {
+    collections.abc.Generator,
+    collections.abc.AsyncGenerator,
+    AbstractContextManager,
+    AbstractAsyncContextManager,
+}
+
+# Return annotations that only mean the provided object is yielded when the constructor is
+# written as an (async) generator. Other constructors annotated like this provide the iterable.
+_ITERATING = {
+    collections.abc.Iterator,
+    collections.abc.Iterable,
+    collections.abc.AsyncIterator,
+    collections.abc.AsyncIterable,
+}
+
+
+def _yields(fn: Callable[..., Any]) -> bool:
+    """
+    `_yields` reports whether a functional constructor is written as an (async) generator
+    or context manager, in which case the code after its `yield` is the provided object's teardown.
+    """
+    origin = getattr(get_type_hints(fn).get("return"), "__origin__", None)
+    if origin in _YIELDING:
+        return True
+
+    generator = unwrap(fn)
+    return origin in _ITERATING and (isgeneratorfunction(generator) or isasyncgenfunction(generator))
+
+
+def _constructed_type(fn: Callable[..., Any]) -> Any:
+    """
+    `_constructed_type` returns the type provided by a functional constructor. For
+    generator and context manager constructors this is the type of the yielded object.
+    """
+    t = get_type_hints(fn)["return"]
+    if _yields(fn):
+        return t.__args__[0]
+
+    return t
+
+
+def _constructor_hints(obj: Any) -> Dict[str, Any]:
+    """
+    `_constructor_hints` returns the type hints of a provided constructor. Referenced constructors
+    are imported.
+    """
+    if isref(obj):
+        obj = obj.load()
+
+    if isfunction(obj):
+        return get_type_hints(obj)
+
+    return get_type_hints(obj.__init__)
+
+
+def _parameters(fn: Callable[..., Any]) -> List[str]:
+    """
+    `_parameters` returns the names of a function's type-annotated parameters in order.
+    """
+    return [x for x in get_type_hints(fn) if x != "return"]
+
+
+def _constructor(obj: Any) -> Any:
+    """
+    `_constructor` returns a provided constructor, importing it if it is referenced.
+    """
+    return obj.load() if isref(obj) else obj
+
+
+def _provided_type(obj: Any) -> Any:
+    """
+    `_provided_type` returns the type of the object built by a provided constructor. For
+    referenced constructors this is their declared type.
+    """
+    if isref(obj):
+        return obj.provides
+
+    if isfunction(obj):
+        return _constructed_type(obj)
+
+    return obj
+
+
+def _target(name: str) -> str:
+    """
+    `_target` returns the name of the provided object a lazy handle or pool refers to, or `name`
+    itself if it is the name of a provided object.
+    """
+    return lazy_target(name) or pool_target(name) or name
+
+
+def _push_on_stop(stack: AsyncExitStack, obj: Any) -> None:
+    on_stop = getattr(obj, "on_stop", None)
+    if on_stop is not None:
+        if iscoroutinefunction(on_stop):
+            stack.push_async_callback(on_stop)
+        else:
+            stack.callback(on_stop)
+
+
+def _finish(gen: Iterator[Any]) -> None:
+    try:
+        next(gen)
+    except StopIteration:
+        return
+
+    raise InvalidLifecycleMethod(f"Constructor generator {gen} yielded more than once")
+
+
+async def _afinish(gen: AsyncIterator[Any]) -> None:
+    try:
+        await gen.__anext__()
+    except StopAsyncIteration:
+        return
+
+    raise InvalidLifecycleMethod(f"Constructor generator {gen} yielded more than once")
+
+
+def _expose(app: App, metrics: Registry, path: str) -> App:
+    """
+    `_expose` wraps an ASGI application so that HTTP requests for `path` are answered with the
+    contents of a metrics registry in the Prometheus text exposition format.
+    """
+
+    async def exposed(scope: Dict[str, str], receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http" or scope.get("path") != path:
+            return await app(scope, receive, send)
+
+        body = metrics.expose().encode()
+        headers = [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return exposed
 
 
 class Harness:
@@ -38,9 +238,330 @@ class Harness:
         self._dep_graph: Dict[Any, Dict[str, Any]] = {}
         self._env: Dict[str, Any] = {}
         self._exec_order: List[str] = []
+        self._teardowns: Dict[str, AsyncExitStack] = {}
+        self._on_start_graph: Dict[str, Dict[str, str]] = {}
+        self._resolution: Optional[Resolution] = None
+        self._frozen = False
+        self._decorators: List[Callable[..., Any]] = []
+        self._decorator_graph: Dict[str, List[Tuple[Callable[..., Any], Dict[str, str]]]] = {}
         self._loop = asyncio.get_event_loop()
         self._logger = DefaultJabLogger()
+        self._readiness = Readiness(self._search)
+        self._metrics = Registry()
+        self._scheduler = Scheduler(self._logger, self._metrics)
+        self._builtins: Dict[str, Any] = {
+            DEFAULT_LOGGER: self._logger,
+            READINESS: self._readiness,
+            METRICS: self._metrics,
+            SCHEDULER: self._scheduler,
+        }
+        self._metrics_path: Optional[str] = None
+        self._plan_path: Optional[str] = None
+        self._snapshots: Optional[SnapshotStore] = None
+        self._instrumentation: Optional[RouteInstrumentation] = None
+        self._admission: Optional[AdmissionControl] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._coalescer: Optional[Coalescer] = None
+        self._lifecycle_seconds = partial(
+            self._metrics.histogram,
+            "jab_lifecycle_seconds",
+            "Duration of lifecycle methods of provided objects",
+        )
+        self._http_requests = self._metrics.counter(
+            "jab_asgi_requests_total", "ASGI connections dispatched to the handler", {"type": "http"}
+        )
+        self._ws_requests = self._metrics.counter(
+            "jab_asgi_requests_total", "ASGI connections dispatched to the handler", {"type": "websocket"}
+        )
+        self._deferred: Optional["asyncio.Future[None]"] = None
+        self._running: Optional["asyncio.Future[None]"] = None
+        self._released: Set[str] = set()
+        self._lazy: Set[str] = set()
+        self._lazy_builds: Dict[str, "asyncio.Future[None]"] = {}
+        self._lazy_starts: Dict[str, "asyncio.Future[None]"] = {}
+        self._started = False
         self._asgi_handler: EventHandler = NoopHandler()
+        self._asgi_handler_name = "NoopHandler"
+        self._asgi_app: App = self._asgi_handler.asgi
+        self._monitor: Optional[LoopMonitor] = None
+        self._memory: Optional[MemoryAccountant] = None
+
+    def monitor(self, interval: float = 0.1, threshold: float = 0.05) -> Harness:
+        """
+        `monitor` enables the Harness's event loop monitor. While the Harness is started, the monitor
+        samples the scheduling lag of the event loop and times every step of the `run`, `on_start`
+        and `asgi` coroutines of the provided objects, so that steps blocking the loop can be
+        attributed to the object that owns them. Lag and steps above `threshold` are logged as
+        warnings. See `loop_stats`.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between lag samples.
+        threshold : float
+            Lag or step duration in seconds above which a warning is logged.
+        """
+        self._monitor = LoopMonitor(self._logger, interval=interval, threshold=threshold)
+        return self
+
+    def loop_stats(self) -> Optional[LoopStats]:
+        """
+        `loop_stats` returns the statistics gathered by the event loop monitor or None if
+        the monitor is not enabled.
+        """
+        if self._monitor is None:
+            return None
+
+        return self._monitor.stats()
+
+    def account_memory(self, mode: str = TRACEMALLOC, top: int = 5) -> Harness:
+        """
+        `account_memory` makes the Harness record the memory each provided object retains after
+        its constructor and its `on_start` method have run. The usage is recorded on the `memory`
+        field of the object's inspection record and available sorted through `memory_report`.
+
+        Parameters
+        ----------
+        mode : str
+            `tracemalloc` traces allocations and records the top allocation sites of each object.
+            `rss` records the change of the process's resident set size, which is cheaper but coarser.
+        top : int
+            Number of allocation sites to record per provided object.
+        """
+        self._memory = MemoryAccountant(mode=mode, top=top)
+        return self
+
+    def memory_report(self) -> List[MemoryUsage]:
+        """
+        `memory_report` returns the recorded memory usage of the provided objects, largest first.
+        Memory accounting must be enabled with `account_memory`.
+        """
+        if self._memory is None:
+            return []
+
+        return self._memory.report()
+
+    def expose_metrics(self, path: str = "/metrics") -> Harness:
+        """
+        `expose_metrics` makes the Harness answer HTTP requests for `path` with the contents of its
+        metrics registry in the Prometheus text exposition format, in front of the ASGI handler and
+        any middleware. See `metrics`.
+
+        Parameters
+        ----------
+        path : str
+            The path the metrics are served under.
+        """
+        self._metrics_path = path
+        return self
+
+    def instrument(self, route: Route = path, max_routes: int = 100) -> Harness:
+        """
+        `instrument` makes the Harness record the time to first byte, total latency, status and
+        response body bytes of every HTTP request it dispatches in its metrics registry, grouped by
+        route. Requests pass through the instrumentation before any middleware. See `metrics`.
+
+        Parameters
+        ----------
+        route : Callable[[Dict[str, Any]], str]
+            Returns the route of a request from its ASGI scope, usually the template of the route the
+            request matches. Defaults to the request's path.
+        max_routes : int
+            The number of distinct routes recorded. Requests for further routes are recorded under
+            the `other` route.
+        """
+        self._instrumentation = RouteInstrumentation(self._metrics, route=route, max_routes=max_routes)
+        return self
+
+    def admit(
+        self,
+        max_in_flight: int,
+        max_queue: int = 0,
+        queue_timeout: float = 1.0,
+        priority: Optional[Priority] = None,
+    ) -> Harness:
+        """
+        `admit` limits the number of HTTP requests the Harness handles at once. Requests beyond
+        `max_in_flight` wait for up to `queue_timeout` seconds in a queue of at most `max_queue`
+        requests. Requests that find the queue full or time out in it are rejected with a 503 response
+        without reaching the ASGI handler. See `admission_stats`.
+
+        Parameters
+        ----------
+        max_in_flight : int
+            The number of requests handled at once.
+        max_queue : int
+            The number of requests waiting for admission at once.
+        queue_timeout : float
+            Seconds a request waits for admission before it is rejected.
+        priority : Optional[Callable[[Dict[str, Any]], int]]
+            Returns the priority class of a request from its ASGI scope, for example based on its path
+            or headers. Queued requests with lower priorities are admitted first and displace queued
+            requests with higher priorities when the queue is full.
+        """
+        self._admission = AdmissionControl(
+            self._metrics,
+            max_in_flight=max_in_flight,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout,
+            priority=priority,
+        )
+        return self
+
+    def admission_stats(self) -> Optional[AdmissionStats]:
+        """
+        `admission_stats` returns the statistics of the Harness's admission control or None if
+        admission control is not enabled.
+        """
+        if self._admission is None:
+            return None
+
+        return self._admission.stats()
+
+    def cache_responses(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 1.0,
+        vary: Iterable[str] = (),
+        statuses: Iterable[int] = (200,),
+    ) -> Harness:
+        """
+        `cache_responses` makes the Harness cache the complete responses of the ASGI handler to GET
+        and HEAD requests and replay them to later requests for the same method, path, query string
+        and values of the `vary` request headers without calling the handler. Middlewares still see
+        every request, so they can authenticate requests before they are answered from the cache.
+        Responses are cached for `ttl` seconds unless their Cache-Control header sets a `max-age`, and
+        responses marked `no-store`, `no-cache` or `private` aren't cached. See `response_cache_stats`.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The size of the cached responses above which the least recently used ones are evicted.
+        ttl : float
+            Seconds responses without a `max-age` are cached for.
+        vary : Iterable[str]
+            Names of request headers whose values are part of the cache key.
+        statuses : Iterable[int]
+            The statuses of cacheable responses.
+        """
+        self._response_cache = ResponseCache(
+            self._metrics, max_bytes=max_bytes, ttl=ttl, vary=vary, statuses=statuses
+        )
+        return self
+
+    def response_cache_stats(self) -> Optional[ResponseCacheStats]:
+        """
+        `response_cache_stats` returns the statistics of the Harness's response cache or None if
+        response caching is not enabled.
+        """
+        if self._response_cache is None:
+            return None
+
+        return self._response_cache.stats()
+
+    def coalesce_requests(self, key: Key = request_key, timeout: float = 1.0) -> Harness:
+        """
+        `coalesce_requests` makes concurrent HTTP requests with the same key share a single execution
+        of the ASGI handler. Requests arriving while a request with the same key is being handled wait
+        for it and receive copies of the messages it sent, which keeps a burst of identical requests
+        for an expensive resource from recomputing it over and over. Requests that wait longer than
+        `timeout`, or whose shared execution fails, are handled on their own. Coalescing happens
+        behind the response cache, so a burst of requests for an expired response refills it once.
+        See `coalescing_stats`.
+
+        Parameters
+        ----------
+        key : Callable[[Dict[str, Any]], Optional[Hashable]]
+            Returns the key of a request from its ASGI scope or None if the request must not be
+            coalesced. By default GET and HEAD requests with the same path and query string are
+            coalesced, unless they carry an Authorization or Cookie header.
+        timeout : float
+            Seconds a request waits for a shared execution before it is handled on its own.
+        """
+        self._coalescer = Coalescer(self._metrics, key=key, timeout=timeout)
+        return self
+
+    def coalescing_stats(self) -> Optional[CoalescingStats]:
+        """
+        `coalescing_stats` returns the statistics of the Harness's request coalescing or None if
+        request coalescing is not enabled.
+        """
+        if self._coalescer is None:
+            return None
+
+        return self._coalescer.stats()
+
+    def background(self, concurrency: int = 8, queue_size: int = 1024) -> Harness:
+        """
+        `background` configures the background task queue of the Harness's `jab.Scheduler`, which
+        provided objects can depend on to run periodic jobs and background tasks. Jobs registered in
+        `on_start` methods start running with the `run` methods and are cancelled when the Harness
+        stops, after which the queued background tasks are completed before any `on_stop` method is
+        called. See `job_stats`.
+
+        Parameters
+        ----------
+        concurrency : int
+            The number of background tasks run at once.
+        queue_size : int
+            The number of background tasks that can be queued before submitting more waits.
+        """
+        self._scheduler.concurrency = concurrency
+        self._scheduler.queue_size = queue_size
+        return self
+
+    def job_stats(self) -> Dict[str, JobStats]:
+        """
+        `job_stats` returns the run-time statistics of the jobs scheduled on the Harness's
+        `jab.Scheduler` by job name.
+        """
+        return self._scheduler.stats()
+
+    def snapshots(self, directory: str) -> Harness:
+        """
+        `snapshots` lets provided objects keep their state across restarts in snapshot files in
+        `directory`. When the Harness stops, the `snapshot` method of every provided object that has
+        one is called right before its `on_stop` method and the bytes-like object it returns are
+        written as its snapshot. When the object is constructed again, its `restore` method is called
+        with a read-only memoryview of the memory-mapped snapshot before any decorator or `on_start`
+        method, so large snapshots aren't copied. The view stays valid until the Harness has stopped.
+
+        Snapshots are replaced atomically and checked against a crc32 when they are read. An object's
+        `snapshot_version` attribute, 0 by default, is stored with its snapshot, and snapshots written
+        by another version are discarded, as are corrupt snapshots and snapshots that fail to restore.
+        Shared objects are never snapshotted.
+
+        Parameters
+        ----------
+        directory : str
+            The directory the snapshots are kept in. It is created when the first snapshot is written.
+        """
+        self._snapshots = SnapshotStore(directory, self._logger)
+        return self
+
+    def metrics(self) -> Registry:
+        """
+        `metrics` returns the Harness's metrics registry. The Harness records the durations of the
+        constructors, `on_start` and `on_stop` methods of the provided objects and the number of ASGI
+        connections it dispatches in it. Provided objects that depend on `jab.Metrics` receive the
+        same registry unless another implementation has been provided.
+        """
+        return self._metrics
+
+    @contextmanager
+    def _measure(self, name: str, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with self._memory.measure(name, phase) if self._memory is not None else nullcontext():
+                yield
+        finally:
+            self._lifecycle_seconds({"provider": name, "phase": phase}).observe(time.perf_counter() - start)
+
+    def _watch(self, coro: Awaitable[T], owner: str, method: str) -> Awaitable[T]:
+        if self._monitor is None:
+            return coro
+
+        return self._monitor.watch(coro, owner, method)
 
     @overload
     def inspect(self) -> List[Provided]:
@@ -59,195 +580,887 @@ class Harness:
         the environment as well as the ability to examine the dependency
         graph as understood by the harness.
 
-        Parameters
-        ----------
-        arg : Optional[Union[Type, Callable]]
-            Optional argument of either a class or a functional constructor.
-            If no argument is provided, a full inspection record of all
-            provided classes is returned
+        Parameters
+        ----------
+        arg : Optional[Union[Type, Callable]]
+            Optional argument of either a class or a functional constructor.
+            If no argument is provided, a full inspection record of all
+            provided classes is returned
+
+        Returns
+        -------
+        Union[List[Provided], Provided]
+            The Provided class represents metadata around a provided, constructed
+            class and its dependencies as well as the constructed instance itself.
+        """
+        if arg:
+            name = next((k for k, v in self._provided.items() if v is arg), None)
+            return self._build_inspect(arg, name or self._name_of(arg))
+
+        return [self._build_inspect(v, k) for k, v in self._provided.items()]
+
+    def _build_inspect(self, arg: Any, name: str) -> Provided:
+        """
+        `_build_inspect` creates the Provided dataclass for a specific constructor.
+        The function is called recursively on a constructor's depdencies to create
+        the dependecy list.
+
+        Parameters
+        ----------
+        arg : Any
+            The constructor whose inspection record should be generated.
+        name : str
+            The name the constructor is provided under.
+
+        Returns
+        -------
+        Provided
+            An inspection record of a constructor, its name, its concrete, constructed
+            instance and all of its dependencies.
+
+        Raises
+        ------
+        UnknownConstructor
+            If the provided constructor is unknown to the jab harness, this
+            exception will be raised.
+        """
+        if name not in self._provided:
+            raise UnknownConstructor(f"{arg} not registered with jab harness")
+
+        deps = _constructor_hints(arg) if not isref(arg) or arg.loaded else {}
+        dependencies = []
+
+        for p, x in self._dep_graph.get(name, {}).items():
+            x = _target(x)
+            if x in self._builtins:
+                continue
+
+            dependencies.append(
+                Dependency(provided=self._build_inspect(self._provided[x], x), parameter=p, type=deps[p])
+            )
+
+        return Provided(
+            name=name,
+            constructor=arg,
+            obj=self._env.get(name),
+            dependencies=dependencies,
+            shared=shared_cache.stats_for(arg) if isshared(arg) else None,
+            memory=self._memory.usage(name) if self._memory is not None else None,
+            released=name in self._released,
+            memoized=memo_stats(self._env.get(name)),
+            imported=arg.imported if isref(arg) else None,
+            pool=self._pool_stats(name),
+        )
+
+    def provide(self, *args: Any) -> Harness:  # NOQA
+        """
+        `provide` provides the Harness with the class definitions it is to construct, maintain,
+        and run inside its local environment.
+
+        Parameters
+        ----------
+        args : Any
+            Each element of args must be a class definition with a type-annotated constructor.
+
+        Raises
+        ------
+        FrozenHarness
+            If the Harness has been frozen.
+        """
+        self._check_frozen()
+
+        for arg in args:
+
+            if isinstance(arg, Harness):
+                self.provide(*arg._provided.values())
+                continue
+
+            self._add(arg)
+            self._resolution = None
+
+        return self
+
+    def _add(self, arg: Any) -> str:
+        """
+        `_add` checks a single provided argument and registers it under its name.
+
+        Returns
+        -------
+        str
+            The name the argument was registered under.
+        """
+        self._check_provide(arg)
+        name = self._name_of(arg)
+
+        if self._provided.get(name):
+            raise DuplicateProvide(
+                f'Cannot provide object {arg} under name "{name}". Name is already taken by object {self._provided[name]}'  # NOQA
+            )
+        self._provided[name] = arg
+        return name
+
+    def _name_of(self, arg: Any) -> str:
+        """
+        `_name_of` returns the name a constructor is registered under in the Harness.
+        """
+        if isref(arg):
+            return str(arg.name)
+
+        name: str = arg.__name__
+
+        if isfunction(arg):
+            name = _constructed_type(arg).__name__
+
+            closures = arg.__closure__ or []
+            for free_var in closures:
+                try:
+                    name = free_var.cell_contents._jab
+                except AttributeError:
+                    pass
+
+        return name
+
+    def decorate(self, *fns: Callable[..., Any]) -> Harness:
+        """
+        `decorate` registers functions that wrap or modify a provided object after it is constructed.
+        The first parameter of a decorator is annotated with the type or Protocol of the object to
+        decorate and its return value replaces that object in the environment, so every dependent
+        receives the decorated object. Any further parameters are injected like a constructor's.
+
+        Parameters
+        ----------
+        fns : Callable
+            Type-annotated decorator functions. Decorators may be async.
+
+        Raises
+        ------
+        FrozenHarness
+            If the Harness has been frozen.
+        """
+        self._check_frozen()
+
+        for fn in fns:
+            if not isfunction(fn) or len(_parameters(fn)) == 0:
+                raise NoAnnotation(f"Decorator '{str(fn)}' must annotate the type it decorates")
+
+            self._decorators.append(fn)
+            self._resolution = None
+
+        return self
+
+    def freeze(self) -> Harness:
+        """
+        `freeze` resolves the Harness and prevents any further changes to its wiring. Frozen
+        harnesses can cheaply derive copies with `derive`.
+        """
+        if self._resolution is None:
+            self.resolve()
+
+        self._frozen = True
+        return self
+
+    def cache_plan(self, path: str) -> Harness:
+        """
+        `cache_plan` makes the Harness store its resolved wiring in a JSON file at `path`: the edges of
+        the dependency graph, the dependencies of the `on_start` methods and decorators, and the
+        execution order. The plan is stored along with a fingerprint of the qualified names and
+        annotations of the provided constructors and decorators, and of the public attributes and
+        method signatures of the provided and annotated types. As long as the fingerprint matches,
+        later processes load the plan instead of searching for and resolving the dependencies again.
+        Otherwise the wiring is resolved as usual and the file is replaced. See `jab.plan.fingerprint`.
+
+        Parameters
+        ----------
+        path : str
+            The file the plan is stored in. It is replaced atomically.
+        """
+        self._plan_path = path
+        self._resolution = None
+        return self
+
+    def derive(
+        self,
+        *args: Any,
+        replace: Optional[Dict[Any, Any]] = None,
+        decorate: Optional[List[Callable[..., Any]]] = None,
+    ) -> Harness:
+        """
+        `derive` creates a new Harness from a frozen Harness, replacing, adding or decorating
+        providers. The derived Harness shares all resolution metadata with this one and only the
+        edges that touch the changed providers are resolved again, which makes deriving far
+        cheaper than providing and resolving a new Harness. The Harness must be frozen with `freeze` first.
+
+        Parameters
+        ----------
+        args : Any
+            Additional constructors to provide to the derived Harness.
+        replace : Optional[Dict[Any, Any]]
+            Maps provided constructors (or the names they are provided under) to the constructors
+            that replace them. Replacements take over the name of the constructor they replace.
+        decorate : Optional[List[Callable]]
+            Additional decorators. See `decorate`.
+
+        Returns
+        -------
+        Harness
+            The derived Harness. It is not frozen and has not been built.
+
+        Raises
+        ------
+        UnfrozenHarness
+            If the Harness has not been frozen.
+        UnknownConstructor
+            If a replaced constructor is unknown to the Harness.
+        MissingDependency
+            If a replacement does not satisfy a dependency on the constructor it replaces.
+        """
+        if not self._frozen:
+            raise UnfrozenHarness("Only frozen harnesses can be derived from. Call `freeze` first.")
+
+        start = time.perf_counter()
+
+        child = Harness()
+        child._provided = dict(self._provided)
+        child._dep_graph = dict(self._dep_graph)
+        child._on_start_graph = dict(self._on_start_graph)
+        child._decorators = list(self._decorators)
+
+        replaced = set()
+        for old, new in (replace or {}).items():
+            name = old if isinstance(old, str) else self._name_of(old)
+            if name not in self._provided:
+                raise UnknownConstructor(f"{old} not registered with jab harness")
+
+            child._check_provide(new)
+            child._provided[name] = new
+            replaced.add(name)
+
+        added = {child._add(arg) for arg in args}
+        child._decorators.extend(decorate or [])
+
+        touched = replaced | added
+        for name, edges in self._dep_graph.items():
+            if name in touched:
+                continue
+
+            if added and any(x in self._builtins for x in edges.values()):
+                child._dep_graph[name] = child._resolve_parameters(
+                    name, _constructor_hints(child._provided[name])
+                )
+                continue
+
+            child._check_replaced(name, edges, replaced, lambda: _constructor_hints(child._provided[name]))
+
+        for name in touched:
+            child._dep_graph[name] = child._resolve_parameters(
+                name, _constructor_hints(child._provided[name])
+            )
+
+        for name, edges in self._on_start_graph.items():
+            if name in touched:
+                continue
+
+            if added and any(x in self._builtins for x in edges.values()):
+                child._resolve_on_start(name)
+                continue
+
+            on_start = getattr(_provided_type(child._provided[name]), "on_start", None)
+            if on_start is None:
+                # Discovered on the constructed object, so it's discovered again on the derived Harness.
+                del child._on_start_graph[name]
+                continue
+
+            child._check_replaced(name, edges, replaced, lambda: get_type_hints(on_start))
+
+        for name in touched:
+            child._resolve_on_start(name)
+
+        child._order(start)
+        return child
+
+    def _check_replaced(
+        self,
+        owner: str,
+        edges: Dict[str, str],
+        replaced: Set[str],
+        hints: Callable[[], Dict[str, Any]],
+    ) -> None:
+        """
+        `_check_replaced` checks that the replacements of a derived Harness still satisfy the
+        resolved parameters that point at them. Type hints are only computed when a parameter
+        points at a replaced constructor.
+
+        Raises
+        ------
+        MissingDependency
+            If a replacement does not satisfy a parameter that points at it.
+        """
+        params = [param for param, x in edges.items() if _target(x) in replaced]
+        if not params:
+            return
+
+        resolved = hints()
+        for param in params:
+            if not self._satisfies(edges[param], resolved[param]):
+                raise MissingDependency(
+                    f"Can't build dependencies for {owner}. Replacement {self._provided[_target(edges[param])]} does not satisfy parameter {param} [{str(resolved[param])}]."  # NOQA
+                )
+
+    def _satisfies(self, name: str, dep: Any) -> bool:
+        """
+        `_satisfies` checks whether the constructor provided under `name` satisfies a dependency on
+        `dep`. Replacements are trusted to stand in for concrete classes, while Protocols must still
+        be implemented.
+        """
+        if islazy(dep) or ispool(dep):
+            dep = dep.__args__[0]
+
+        if issubclass(dep, Protocol):  # type: ignore
+            return isimplementation(_provided_type(self._provided[_target(name)]), dep)
+
+        return True
+
+    def _check_frozen(self) -> None:
+        if self._frozen:
+            raise FrozenHarness("Cannot change the wiring of a frozen harness. Use `derive` instead.")
+
+    def _resolve_parameters(self, owner: str, hints: Dict[str, Any]) -> Dict[str, str]:
+        """
+        `_resolve_parameters` matches the type-annotated parameters of a constructor, `on_start` method
+        or decorator to the names of the provided objects that satisfy them.
+
+        Parameters
+        ----------
+        owner : str
+            A description of the function whose parameters are resolved, used in error messages.
+        hints : Dict[str, Any]
+            The type hints of the function.
+
+        Returns
+        -------
+        Dict[str, str]
+            A mapping of parameter names to the names of the provided objects.
+
+        Raises
+        ------
+        MissingDependency
+            If a parameter cannot be satisfied by any of the provided objects.
+        """
+        concrete = {}
+
+        for key, dep in hints.items():
+            if key == "return":
+                continue
+
+            # Lazy handles and pools are named after the provided object they refer to.
+            handle = LAZY if islazy(dep) else POOL if ispool(dep) else ""
+            match = self._search(dep.__args__[0] if handle else dep)
+            if match is not None:
+                match = handle + match
+
+            if match is None:
+                raise MissingDependency(
+                    f"Can't build dependencies for {owner}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
+                )
+
+            concrete[key] = match
+
+        return concrete
+
+    def _build_graph(self) -> None:
+        """
+        `_build_graph` builds the dependency graph based on the type annotations of the provided
+        constructors and resolves their `on_start` methods. Referenced constructors are only imported
+        and resolved once a constructor, `on_start` method or decorator depends on them.
+
+        Raises
+        ------
+        MissingDependency
+            If a class's constructor requires a dependency that has not been provided. This exception
+            will be raised.
+        """
+        self._dep_graph = {}
+        self._on_start_graph = {}
+
+        pending = [name for name, obj in self._provided.items() if not isref(obj)]
+        for fn in self._decorators:
+            pending.extend(self._resolve_parameters(f"decorator {fn.__name__}", get_type_hints(fn)).values())
+
+        while pending:
+            name = pending.pop()
+            name = lazy_target(name) or name
+            if name in self._dep_graph or _target(name) not in self._provided:
+                continue
+
+            # A pool depends on what the object it pools depends on, so it can construct instances.
+            obj = self._provided[_target(name)]
+            if isref(obj):
+                self._check_provide(obj.load())
+
+            self._dep_graph[name] = self._resolve_parameters(name, _constructor_hints(obj))
+            if pool_target(name) is None:
+                self._resolve_on_start(name)
+            pending.extend(self._dep_graph[name].values())
+            pending.extend(self._on_start_graph.get(name, {}).values())
+
+    def resolve(self) -> Resolution:
+        """
+        `resolve` wires the provided constructors together without constructing anything.
+        Every provided argument is checked, the dependency graph and the dependencies of all
+        `on_start` methods are resolved and both are checked for cycles. This makes it possible
+        to validate a Harness's wiring without opening connections or loading data.
+
+        Returns
+        -------
+        Resolution
+            Statistics about the resolved dependency graph.
+
+        Raises
+        ------
+        MissingDependency
+            If a constructor or `on_start` method requires a dependency that has not been provided.
+        toposort.CircularDependencyError
+            If a circular dependency exists in the provided objects.
+        """
+        start = time.perf_counter()
+
+        digest = None
+        if self._plan_path is not None:
+            digest = fingerprint(self._provided, self._decorators)
+            plan = load_plan(self._plan_path, digest)
+            if plan is not None:
+                return self._load_plan(plan, start)
+
+        for arg in self._provided.values():
+            self._check_provide(arg)
+
+        self._build_graph()
+
+        resolution = self._order(start)
+
+        if self._plan_path is not None and digest is not None:
+            try:
+                store_plan(self._plan_path, digest, self._plan())
+            except OSError as e:
+                self._logger.warning(f"Could not store the resolved plan in {self._plan_path} ({str(e)})")
+
+        return resolution
+
+    def _plan(self) -> Dict[str, Any]:
+        """
+        `_plan` returns the resolved wiring in a form that can be stored as JSON. Decorators are
+        referenced by their position in `_decorators`.
+        """
+        return {
+            "dep_graph": self._dep_graph,
+            "on_start_graph": self._on_start_graph,
+            "decorator_graph": {
+                name: [[self._decorators.index(fn), edges] for fn, edges in decorators]
+                for name, decorators in self._decorator_graph.items()
+            },
+            "exec_order": self._exec_order,
+            "lazy": sorted(self._lazy),
+            "depth": self._resolution.depth if self._resolution is not None else 0,
+        }
+
+    def _load_plan(self, plan: Dict[str, Any], start: float) -> Resolution:
+        """
+        `_load_plan` installs a resolved wiring stored by `resolve` and records the Harness's `Resolution`.
+        """
+        self._dep_graph = plan["dep_graph"]
+        self._on_start_graph = plan["on_start_graph"]
+        self._decorator_graph = {
+            name: [(self._decorators[i], edges) for i, edges in decorators]
+            for name, decorators in plan["decorator_graph"].items()
+        }
+        self._exec_order = plan["exec_order"]
+        self._lazy = set(plan["lazy"])
+
+        self._resolution = Resolution(
+            providers=len(self._provided),
+            edges=sum(len(v) for v in self._dep_graph.values()),
+            depth=plan["depth"],
+            on_start_hooks=len(self._on_start_graph),
+            exec_order=list(self._exec_order),
+            duration=time.perf_counter() - start,
+            cached=True,
+        )
+
+        return self._resolution
+
+    def _order(self, start: float) -> Resolution:
+        """
+        `_order` resolves the decorators, computes the execution order of the resolved dependency
+        graph, checks the `on_start` methods for cycles and records the Harness's `Resolution`.
+        """
+        self._decorator_graph = {}
+        for fn in self._decorators:
+            hints = get_type_hints(fn)
+            target = _parameters(fn)[0]
+            name = self._resolve_parameters(f"decorator {fn.__name__}", {target: hints[target]})[target]
+            del hints[target]
+
+            edges = self._resolve_parameters(f"decorator {fn.__name__}", hints)
+            self._decorator_graph.setdefault(name, []).append((fn, edges))
+
+        deps = {k: set(v.values()) for k, v in self._dep_graph.items()}
+        for name, decorators in self._decorator_graph.items():
+            for _, edges in decorators:
+                deps[name] |= set(edges.values())
+
+        levels = list(toposort.toposort(deps))
+        self._exec_order = [x for level in levels for x in sorted(level)]
+
+        toposort.toposort_flatten({k: set(v.values()) for k, v in self._on_start_graph.items()})
+
+        # Objects only reachable through lazy handles are constructed on first access. These are
+        # the objects that only lazy handles point at, along with their dependencies, unless
+        # something constructed eagerly depends on them as well.
+        pointed = [e for v in self._dep_graph.values() for e in v.values()]
+        pointed += [e for v in self._on_start_graph.values() for e in v.values()]
+        pointed += [e for v in self._decorator_graph.values() for _, d in v for e in d.values()]
+
+        targets = {lazy_target(e) for e in pointed} - set(pointed) - {None}
+        deferred = self._closure({x for x in targets if x is not None})
+        # Referenced constructors that nothing depends on are never constructed.
+        unused = {x for x, obj in self._provided.items() if isref(obj) and x not in self._dep_graph}
+        # Objects that are only depended on through pools are only constructed by their pools, and
+        # pools that nothing constructed eagerly depends on are constructed on first access.
+        pools = {x for x in self._dep_graph if pool_target(x) is not None}
+        pooled = {_target(x) for x in pools} - set(pointed)
+        self._lazy = (set(self._provided) | pools) - self._closure(
+            set(self._provided) - deferred - unused - pooled
+        )
+
+        self._resolution = Resolution(
+            providers=len(self._provided),
+            edges=sum(len(v) for v in self._dep_graph.values()),
+            depth=len(levels),
+            on_start_hooks=len(self._on_start_graph),
+            exec_order=list(self._exec_order),
+            duration=time.perf_counter() - start,
+        )
+
+        return self._resolution
+
+    def _resolve_on_start(self, x: str) -> None:
+        """
+        `_resolve_on_start` resolves the parameters of a provided object's `on_start` method
+        from the type annotations of the provided type, so no object needs to be constructed.
+
+        Raises
+        ------
+        MissingDependency
+            If the `on_start` method requires a dependency that has not been provided.
+        """
+        self._on_start_graph.pop(x, None)
+
+        on_start = getattr(_provided_type(self._provided[x]), "on_start", None)
+        if on_start is None:
+            return
+
+        self._on_start_graph[x] = self._resolve_parameters(f"{x}'s on_start method", get_type_hints(on_start))
+
+    def _closure(self, names: Set[str]) -> Set[str]:
+        """
+        `_closure` returns the given provided objects together with everything that must be
+        constructed before them or before their `on_start` methods are called. Lazy handles
+        are part of the closure, the objects they point at aren't.
+        """
+        closure: Set[str] = set()
+        pending = list(names)
+
+        while pending:
+            x = pending.pop()
+            if x in closure:
+                continue
+
+            closure.add(x)
+            pending.extend(self._dep_graph.get(x, {}).values())
+            pending.extend(self._on_start_graph.get(x, {}).values())
+            for _, edges in self._decorator_graph.get(x, []):
+                pending.extend(edges.values())
+
+        return closure
+
+    def build(self) -> None:
+        self._build_env()
+
+    def _build_env(self) -> None:
+        """
+        `_build_env` constructs the Harness's environment inside of the Harness's event loop.
+        See `_abuild_env`.
+        """
+        self._loop.run_until_complete(self._abuild_env())
+
+    async def _abuild_env(self, names: Optional[Set[str]] = None) -> None:
+        """
+        `_abuild_env` takes the dependency graph and topologically sorts
+        the Harness's dependencies and then constructs then in order,
+        providing each constructor with the necessary constructed objects.
+
+        Parameters
+        ----------
+        names : Optional[Set[str]]
+            If given, only these objects are constructed. Their dependencies must
+            be part of the set or already be constructed.
+
+        Raises
+        ------
+        toposort.CircularDependencyError
+            If a circular dependency exists in the provided objects this function
+            will fail.
+        """
+        if self._resolution is None:
+            self.resolve()
+
+        if names is None:
+            names = set(self._exec_order) - self._lazy
+
+        self._readiness._expect(x for x in self._provided if x not in self._lazy)
+
+        for x in self._exec_order:
+
+            if x in self._env or x not in names:
+                continue
+
+            if x in self._builtins:
+                self._env[x] = self._builtins[x]
+                continue
+
+            target = lazy_target(x)
+            if target is not None:
+                self._env[x] = Lazy(partial(self._build_lazily, target))
+                continue
 
-        Returns
-        -------
-        Union[List[Provided], Provided]
-            The Provided class represents metadata around a provided, constructed
-            class and its dependencies as well as the constructed instance itself.
-        """
-        if arg:
-            return self._build_inspect(arg)
+            target = pool_target(x)
+            if target is not None:
+                with self._measure(x, "construct"):
+                    self._env[x] = await self._build_pool(x, target)
+                continue
 
-        return [self._build_inspect(x) for x in self._provided.values()]
+            reqs = self._dep_graph[x]
+            kwargs = {k: self._env[v] for k, v in reqs.items()}
 
-    def _build_inspect(self, arg: Any) -> Provided:
-        """
-        `_build_inspect` creates the Provided dataclass for a specific constructor.
-        The function is called recursively on a constructor's depdencies to create
-        the dependecy list.
+            with self._measure(x, "construct"):
+                obj = await self._construct(x, kwargs)
 
-        Parameters
-        ----------
-        arg : Any
-            The constructor whose inspection record should be generated.
+            self._env[x] = obj
 
-        Returns
-        -------
-        Provided
-            An inspection record of a constructor, its name, its concrete, constructed
-            instance and all of its dependencies.
+            if x not in self._on_start_graph and callable(getattr(obj, "on_start", None)):
+                await self._discover_on_start(x, obj)
+
+            if x not in self._on_start_graph:
+                self._readiness._set(x)
+
+    async def _discover_on_start(self, x: str, obj: Any) -> None:
+        """
+        `_discover_on_start` resolves the `on_start` method of a constructed object whose provided
+        type doesn't declare one, like an object returned by a functional constructor annotated with
+        a Protocol. Dependencies of the `on_start` method that haven't been constructed yet are
+        constructed right away.
 
         Raises
         ------
-        UnknownConstructor
-            If the provided constructor is unknown to the jab harness, this
-            exception will be raised.
+        MissingDependency
+            If the `on_start` method requires a dependency that has not been provided.
         """
-        t = arg
+        edges = self._resolve_parameters(f"{x}'s on_start method", get_type_hints(obj.on_start))
+        self._on_start_graph[x] = edges
 
-        if isfunction(arg):
-            deps = get_type_hints(arg)
-            t = deps["return"]
+        missing = self._closure(set(edges.values())) - set(self._env)
+        if missing:
+            await self._abuild_env(missing)
 
-            closures = arg.__closure__ or []
-            for free_var in closures:
-                try:
-                    t = free_var.cell_contents._jab
-                except AttributeError:
-                    pass
+    async def _build_lazily(self, name: str) -> Any:
+        """
+        `_build_lazily` constructs a provided object on first access through a lazy handle, along with
+        any of its dependencies that haven't been constructed yet. If the Harness has already been
+        started, the `on_start` methods of the newly constructed objects are called as well. Every
+        object is constructed and started by a single future that concurrent accesses wait on, so
+        constructors and `on_start` methods may themselves access other lazy handles.
 
-        else:
-            deps = get_type_hints(arg.__init__)
+        Raises
+        ------
+        InvalidLifecycleMethod
+            If an `on_start` method of a newly constructed object fails.
+        """
+        if name in self._readiness._ready:
+            return self._env[name]
 
-        if isinstance(t, str):
-            name: Optional[str] = t
-            obj: Any = self._env[t]
-        else:
-            name, obj = next(
-                ((name, obj) for name, obj in self._env.items() if isinstance(obj, t)), (None, None)
-            )
+        names = self._closure({name}) - set(self._env) - self._released
+        for x in self._exec_order:
+            if x in names:
+                await self._once(self._lazy_builds, x, partial(self._abuild_env, {x}))
 
-        if not name or not obj:
-            raise UnknownConstructor(f"{arg} not registered with jab harness")
+        if self._started:
+            closure = self._closure({name})
+            for x in toposort.toposort_flatten({k: set(v.values()) for k, v in self._on_start_graph.items()}):
+                if x in closure and x in self._on_start_graph and x not in self._readiness._ready:
+                    await self._once(self._lazy_starts, x, partial(self._start_lazily, x))
 
-        matched = self._dep_graph[name]
+        self._logger.debug(f"Lazily constructed {name}")
+        return self._env[name]
 
-        dependencies = [
-            Dependency(provided=self._build_inspect(self._provided[x]), parameter=p, type=deps[p])
-            for p, x in matched.items()
-        ]
+    async def _start_lazily(self, x: str) -> None:
+        if await self._on_start({x}):
+            raise InvalidLifecycleMethod(f"on_start method of {x} failed while lazily constructing it")
+
+    async def _once(
+        self, running: Dict[str, "asyncio.Future[None]"], x: str, step: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        `_once` runs a step of lazily constructing `x` unless another access is already running it, in
+        which case it waits for that access instead. Failed steps are forgotten so they can be retried.
+        """
+        future = running.get(x)
+        if future is None:
+            future = running[x] = asyncio.ensure_future(step())
 
-        return Provided(name=name, constructor=arg, obj=obj, dependencies=dependencies)
+        try:
+            await asyncio.shield(future)
+        except Exception:
+            if running.get(x) is future:
+                del running[x]
+            raise
 
-    def provide(self, *args: Any) -> Harness:  # NOQA
+    async def _construct(self, name: str, kwargs: Dict[str, Any]) -> Any:
         """
-        `provide` provides the Harness with the class definitions it is to construct, maintain,
-        and run inside its local environment.
+        `_construct` calls the constructor provided under `name`, applies its decorators and records
+        the teardown of the constructed object. Constructors written as (async) generators or context
+        managers have everything after their `yield` registered as teardown, followed by the `on_stop`
+        method of the decorated object if it has one, so that `on_stop` runs first.
 
         Parameters
         ----------
-        args : Any
-            Each element of args must be a class definition with a type-annotated constructor.
+        name : str
+            The name the constructor was provided under.
+        kwargs : Dict[str, Any]
+            The constructed dependencies of the constructor.
+
+        Returns
+        -------
+        Any
+            The constructed object.
         """
-        for arg in args:
+        constructor = _constructor(self._provided[name])
+        stack = AsyncExitStack()
+        self._teardowns[name] = stack
 
-            if isinstance(arg, Harness):
-                self.provide(*arg._provided.values())
-                continue
+        if isshared(constructor):
+            obj = await self._construct_shared(constructor, kwargs, stack)
+        else:
+            obj = await self._call_constructor(constructor, kwargs, stack)
+            if self._snapshots is not None:
+                await self._snapshots.restore(name, obj)
 
-            self._check_provide(arg)
-            name = arg.__name__
+        constructed = obj
+        for fn, edges in self._decorator_graph.get(name, []):
+            obj = fn(obj, **{k: self._env[v] for k, v in edges.items()})
+            if isawaitable(obj):
+                obj = await obj
 
-            if isfunction(arg):
-                name = get_type_hints(arg)["return"].__name__
+        # Shared instances outlive the Harness, so only their decorated wrappers are stopped.
+        if isshared(constructor) and obj is constructed:
+            return obj
 
-                closures = arg.__closure__ or []
-                for free_var in closures:
-                    try:
-                        name = free_var.cell_contents._jab
-                    except AttributeError:
-                        pass
+        _push_on_stop(stack, obj)
 
-            if self._provided.get(name):
-                raise DuplicateProvide(
-                    f'Cannot provide object {arg} under name "{name}". Name is already taken by object {self._provided[name]}'  # NOQA
-                )
-            self._provided[name] = arg
+        # Pushed last, so the snapshot is taken before the object is stopped.
+        if self._snapshots is not None and not isshared(constructor) and hasattr(constructed, "snapshot"):
+            stack.push_async_callback(self._snapshots.save, name, constructed)
 
-        return self
+        return obj
 
-    def _build_graph(self) -> None:
+    async def _call_constructor(self, constructor: Any, kwargs: Dict[str, Any], stack: AsyncExitStack) -> Any:
         """
-        `_build_graph` builds the dependency graph based on the type annotations of the provided
-        constructors.
-
-        Raises
-        ------
-        MissingDependency
-            If a class's constructor requires a dependency that has not been provided. This exception
-            will be raised.
+        `_call_constructor` calls a constructor and, for (async) generator and context manager
+        constructors, enters the yielded object and registers the rest of the constructor as teardown.
         """
-        for name, obj in self._provided.items():
-            if isfunction(obj):
-                dependencies = get_type_hints(obj)
+        obj = constructor(**kwargs)
+        if isawaitable(obj):
+            obj = await obj
+
+        if isfunction(constructor) and _yields(constructor):
+            if isgenerator(obj):
+                gen = obj
+                obj = next(gen)
+                stack.callback(_finish, gen)
+            elif isasyncgen(obj):
+                agen = obj
+                obj = await agen.__anext__()
+                stack.push_async_callback(_afinish, agen)
+            elif hasattr(obj, "__aenter__"):
+                obj = await stack.enter_async_context(obj)
             else:
-                dependencies = get_type_hints(obj.__init__)
+                obj = stack.enter_context(obj)
 
-            concrete = {}
+        return obj
 
-            for key, dep in dependencies.items():
-                if key == "return":
-                    continue
+    async def _construct_shared(self, constructor: Any, kwargs: Dict[str, Any], stack: AsyncExitStack) -> Any:
+        """
+        `_construct_shared` takes the instance of a shared constructor from the process-wide cache,
+        building and caching it if no Harness has built it with the same dependencies before.
+        The Harness's reference to the instance is released on teardown.
+        """
+        key = SharedCache.key(constructor, kwargs)
 
-                if issubclass(dep, Protocol):  # type: ignore
-                    match = self._search_protocol(dep)
-                    if match is None:
-                        raise MissingDependency(
-                            f"Can't build depdencies for {name}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                        )
-                else:
-                    match = self._search_concrete(dep)
-                    if match is None:
-                        raise MissingDependency(
-                            f"Can't build depdencies for {name}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                        )
+        obj = shared_cache.acquire(key)
+        if obj is None:
+            obj = constructor(**kwargs)
+            if isawaitable(obj):
+                obj = await obj
 
-                concrete[key] = match
-            self._dep_graph[name] = concrete
+            obj = shared_cache.insert(key, obj, kwargs)
 
-    def build(self) -> None:
-        self._build_env()
+        stack.callback(shared_cache.release, key)
+        return obj
 
-    def _build_env(self) -> None:
+    async def _build_pool(self, name: str, target: str) -> Pool[Any]:
         """
-        `build_env` takes the dependency graph and topologically sorts
-        the Harness's dependencies and then constructs then in order,
-        providing each constructor with the necessary constructed objects.
-
-        Raises
-        ------
-        toposort.CircularDependencyError
-            If a circular dependency exists in the provided objects this function
-            will fail.
+        `_build_pool` constructs the pool of the object provided under `target` and fills it. Pooled
+        instances are constructed like the object itself, without applying decorators, restoring
+        snapshots or calling their `on_start` methods, and torn down when the pool discards them. The
+        pool is closed on teardown, once everything that depends on it has been torn down, which
+        stops the pool from discarding its idle instances.
         """
-        self._build_graph()
+        constructor = _constructor(self._provided[target])
+        kwargs = {k: self._env[v] for k, v in self._dep_graph[name].items()}
 
-        deps = {}
+        async def create() -> Tuple[Any, Callable[[], Awaitable[None]]]:
+            stack = AsyncExitStack()
+            try:
+                obj = await self._call_constructor(constructor, kwargs, stack)
+            except BaseException:
+                await stack.aclose()
+                raise
 
-        for k, v in self._dep_graph.items():
-            deps[k] = {i for _, i in v.items()}
+            _push_on_stop(stack, obj)
+            return obj, stack.aclose
 
-        execution_order = toposort.toposort_flatten(deps)
-        self._exec_order = execution_order
-        for x in execution_order:
+        size, limit, idle = pool_settings(constructor)
+        pool: Pool[Any] = Pool(target, create, self._logger, size, limit, idle)
 
-            if x == DEFAULT_LOGGER:
-                continue
+        stack = AsyncExitStack()
+        self._teardowns[name] = stack
+        stack.push_async_callback(pool.close)
 
-            reqs = self._dep_graph[x]
-            kwargs = {k: self._env[v] for k, v in reqs.items()}
+        await pool.fill()
+        return pool
 
-            if iscoroutinefunction(self._provided[x]):
-                self._env[x] = self._loop.run_until_complete(self._provided[x](**kwargs))
-            else:
-                self._env[x] = self._provided[x](**kwargs)
+    def _pool_stats(self, name: str) -> Optional[PoolStats]:
+        pool = self._env.get(POOL + name)
+        return pool.stats() if isinstance(pool, Pool) else None
+
+    def _search(self, dep: Any) -> Optional[str]:
+        """
+        `_search` finds the name of the provided object that satisfies a dependency on a Protocol
+        or concrete class. See `_search_protocol` and `_search_concrete`.
+        """
+        if issubclass(dep, Protocol):  # type: ignore
+            return self._search_protocol(dep)
+
+        return self._search_concrete(dep)
 
     def _search_protocol(self, dep: Any) -> Optional[str]:
         """
@@ -267,17 +1480,25 @@ class Harness:
             If an object can be found that implements the provided Protocol, its key-value
             is returned, otherwise None is returned.
         """
+        attrs = protocol_attrs(dep)
         for name, obj in self._provided.items():
-            if isfunction(obj):
-                obj = get_type_hints(obj)["return"]
+            if isref(obj):
+                # A referenced type is only imported to be matched if its members may implement `dep`.
+                if obj.members is None and not obj.typed:
+                    continue
+
+                if obj.members is not None and not attrs <= obj.members:
+                    continue
 
-            if isimplementation(obj, dep):
+            if isimplementation(_provided_type(obj), dep):
                 return name
 
         if dep is Logger:
-            self._env[DEFAULT_LOGGER] = self._logger
             return DEFAULT_LOGGER
 
+        if dep is Metrics:
+            return METRICS
+
         return None
 
     def _search_concrete(self, dep: Any) -> Optional[str]:
@@ -296,10 +1517,20 @@ class Harness:
             If the appropriate object can be found, its key-name is returned. If
             an appropriate object can't be found, None is returned.
         """
+        if dep is Readiness:
+            return READINESS
+
+        if dep is Registry:
+            return METRICS
+
+        if dep is Scheduler:
+            return SCHEDULER
+
         for name, obj in self._provided.items():
-            if isfunction(obj):
-                obj = get_type_hints(obj)["return"]
+            if isref(obj) and obj.provides_name != dep.__name__:
+                continue
 
+            obj = _provided_type(obj)
             if obj.__module__ == dep.__module__ and obj.__name__ == dep.__name__:
                 return name
 
@@ -308,7 +1539,8 @@ class Harness:
     def _check_provide(self, arg: Any) -> None:
         """
         `check_provide` ensures that an argument to the provide function meets the requirements
-        necessary to build and receive dependencies.
+        necessary to build and receive dependencies. Referenced constructors are checked once they
+        are imported.
 
         Parameters
         ----------
@@ -323,6 +1555,11 @@ class Harness:
             Raised when the constructor function of the class definition lacks
             type annotations necessary for dependency wiring.
         """
+        if isref(arg):
+            if arg.loaded:
+                self._check_provide(arg.load())
+            return
+
         _is_func = False
         if not isclass(arg):
             if not isfunction(arg):
@@ -361,61 +1598,49 @@ class Harness:
                 f"Provided argument '{arg.__name__}' does not have a type-annotated constructor"
             )
 
-    async def _on_start(self) -> bool:
+    async def _on_start(self, names: Optional[Set[str]] = None) -> bool:
         """
         `_on_start` gathers and calls all `on_start` methods of the provided objects.
         The futures of the `on_start` methods are collected and awaited inside of the
         Harness's event loop. `on_start` methods are the only methods that are allowed
         to take arguments. The paramters must be satisfied by the objects or classes
         passed into the Harness's `provide` function like a constructor.
-        """
-        _on_start_deps = {}
-        _deps_map = {}
-        for x in self._exec_order:
-            try:
-                in_ = get_type_hints(self._env[x].on_start)
-
-                map_ = {}
-                for key, dep in in_.items():
-                    if key == "return":
-                        continue
-
-                    if issubclass(dep, Protocol):  # type: ignore
-                        match = self._search_protocol(dep)
-                        if match is None:
-                            raise MissingDependency(
-                                f"Can't build dependencies for {x}'s on_start method. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                            )
-                    else:
-                        match = self._search_concrete(dep)
-                        if match is None:
-                            raise MissingDependency(
-                                f"Can't build dependencies for {x}'s on_start method. Missing suitable argument for paramater {key} [{str(dep)}]."  # NOQA
-                            )
 
-                    map_[key] = match
-
-                _on_start_deps[x] = {dep for _, dep in map_.items()}
-                _deps_map[x] = {k: self._env[v] for k, v in map_.items()}
-            except AttributeError:
-                pass
+        Parameters
+        ----------
+        names : Optional[Set[str]]
+            If given, only the `on_start` methods of these objects are called.
+        """
+        call_order = toposort.toposort_flatten({k: set(v.values()) for k, v in self._on_start_graph.items()})
 
-        call_order = toposort.toposort_flatten(_on_start_deps)
+        if self._monitor is not None:
+            self._monitor.start()
 
         try:
             self._logger.debug("Executing on_start methods.")
 
             for x in call_order:
-                kwargs = _deps_map.get(x, {})
+                if x not in self._on_start_graph or (names is not None and x not in names):
+                    continue
 
-                try:
+                if x not in self._env or x in self._readiness._ready:
+                    continue
+
+                kwargs = {k: self._env[v] for k, v in self._on_start_graph[x].items()}
+
+                with self._measure(x, "on_start"):
                     if iscoroutinefunction(self._env[x].on_start):
-                        await self._env[x].on_start(**kwargs)
+                        await self._watch(self._env[x].on_start(**kwargs), x, "on_start")
                     else:
                         self._env[x].on_start(**kwargs)
-                    self._logger.debug(f"Executed {x}.on_start()")
-                except AttributeError:
-                    pass
+                self._logger.debug(f"Executed {x}.on_start()")
+                self._readiness._set(x)
+
+            self._started = True
+            if self._memory is not None and self._readiness.complete:
+                self._memory.stop()
+
+            await self._release_transients()
 
         except KeyboardInterrupt:
             self._logger.critical("Keyboard interrupt during execution of on_start methods.")
@@ -428,21 +1653,106 @@ class Harness:
 
         return False
 
+    async def _release_transients(self) -> None:
+        """
+        `_release_transients` tears down the transient objects that nothing needs anymore and drops
+        the Harness's references to them. A transient object is released once it is ready and every
+        object that depends on it, through its constructor, its `on_start` method or a decorator,
+        is ready as well. Transient objects held through lazy handles are kept.
+        """
+        users: Dict[str, Set[str]] = {}
+        for graph in (self._dep_graph, self._on_start_graph):
+            for x, edges in graph.items():
+                for dep in edges.values():
+                    # Lazy handles are never ready, since they can construct their target at any time.
+                    target = lazy_target(dep)
+                    users.setdefault(target or dep, set()).add(x if target is None else dep)
+
+        for x, decorators in self._decorator_graph.items():
+            for _, edges in decorators:
+                for dep in edges.values():
+                    users.setdefault(dep, set()).add(x)
+
+        for x in self._exec_order:
+            if (
+                x not in self._env
+                or x not in self._provided
+                or not istransient(_constructor(self._provided[x]))
+            ):
+                continue
+
+            if not all(y in self._readiness._ready for y in users.get(x, set()) | {x}):
+                continue
+
+            del self._env[x]
+            self._released.add(x)
+            try:
+                await self._teardowns.pop(x).aclose()
+                self._logger.debug(f"Released transient {x}")
+            except Exception as e:
+                self._logger.error(f"Encountered an unexpected error during teardown of {x} ({str(e)})")
+
     async def _on_stop(self) -> None:
         """
-        `_on_stop` gathers and calls all `on_stop` methods of the provided objects.
-        Unlike `_on_start` and `_run` it thee `on_stop` methods are called serially.
+        `_on_stop` unwinds the teardowns recorded while building the environment: the `on_stop`
+        methods of the provided objects and the code after the `yield` of generator and context
+        manager constructors. An object is only torn down once everything that depends on it has
+        been torn down. The teardowns of objects that do not depend on each other run concurrently.
+        Scheduled jobs are cancelled and queued background tasks are completed first.
         """
-        for x in self._exec_order[::-1]:
+        await self._scheduler.stop()
+
+        if self._monitor is not None:
+            await self._monitor.stop()
+
+        dependents: Dict[str, Set[str]] = {x: set() for x in self._teardowns}
+        for x in self._teardowns:
+            deps = list(self._dep_graph.get(x, {}).values())
+            for _, edges in self._decorator_graph.get(x, []):
+                deps.extend(edges.values())
+
+            for dep in deps:
+                if dep in dependents:
+                    dependents[dep].add(x)
+
+        # Objects held through lazy handles are torn down after their holders, unless the lazy handle
+        # breaks a dependency cycle, in which case the holder depends on the object the other way round.
+        def waits(x: str, target: str) -> bool:
+            pending, seen = [x], set()
+            while pending:
+                y = pending.pop()
+                if y == target:
+                    return True
+                if y not in seen:
+                    seen.add(y)
+                    pending.extend(dependents[y])
+            return False
+
+        for x in self._teardowns:
+            for dep in self._dep_graph.get(x, {}).values():
+                target = lazy_target(dep)
+                if target is not None and target in dependents and not waits(x, target):
+                    dependents[target].add(x)
+
+        unwinding: Dict[str, "asyncio.Future[None]"] = {}
+
+        async def unwind(x: str) -> None:
+            await asyncio.gather(*(unwinding[d] for d in dependents[x]))
+
             try:
-                fn = self._env[x].on_stop
-                if iscoroutinefunction(fn):
-                    await fn()
-                else:
-                    fn()
-                self._logger.debug(f"Executed on_stop method for {x}")
-            except AttributeError:
-                pass
+                with self._measure(x, "on_stop"):
+                    await self._teardowns.pop(x).aclose()
+                self._logger.debug(f"Executed teardown for {x}")
+            except Exception as e:
+                self._logger.error(f"Encountered an unexpected error during teardown of {x} ({str(e)})")
+
+        for x in dependents:
+            unwinding[x] = asyncio.ensure_future(unwind(x))
+
+        await asyncio.gather(*unwinding.values())
+
+        if self._snapshots is not None:
+            self._snapshots.close()
 
     def _run(self) -> None:
         """
@@ -450,21 +1760,33 @@ class Harness:
         These methods must be async and are run inside of a `gather` call.
         The main execution thread blocks until all of these `run` methods complete.
         """
-        run_awaits = []
+        try:
+            self._loop.run_until_complete(self._arun())
+        except KeyboardInterrupt:
+            self._logger.critical("Keyboard interrupt during execution of run methods.")
+
+    async def _arun(self) -> None:
+        """
+        `_arun` calls all `run` methods of the provided objects and waits for them to complete
+        on the running event loop. See `_run`.
+        """
+        run_awaits: List[Awaitable[Any]] = []
         for x in self._exec_order:
+            if x not in self._env or x in self._builtins:
+                continue
+
             try:
                 if not iscoroutinefunction(self._env[x].run):
                     raise InvalidLifecycleMethod(f"{x}.run must be an async method")
-                run_awaits.append(self._env[x].run())
+                run_awaits.append(self._watch(self._env[x].run(), x, "run"))
                 self._logger.debug(f"Added run method for {x}")
             except AttributeError:
                 pass
 
+        run_awaits.append(self._scheduler.run())
         try:
             self._logger.debug("Executing run methods.")
-            self._loop.run_until_complete(asyncio.gather(*run_awaits))
-        except KeyboardInterrupt:
-            self._logger.critical("Keyboard interrupt during execution of run methods.")
+            await asyncio.gather(*run_awaits)
         except Exception as e:
             self._logger.critical(f"Encountered unexpected error during execution of run methods ({str(e)})")
 
@@ -483,6 +1805,48 @@ class Harness:
         self._loop.run_until_complete(self._on_stop())
         self._loop.close()
 
+    async def start(self) -> None:
+        """
+        `start` builds the Harness and calls all `on_start` methods on the running event loop, then
+        runs all `run` methods in the background until `stop` is called. ASGI traffic passed to `asgi`
+        is served from then on. Unlike `run`, `start` never
+        drives or closes an event loop itself, so a Harness can be embedded in an application that
+        already runs one, like an async test or a server that isn't ASGI.
+
+        Raises
+        ------
+        InvalidLifecycleMethod
+            If an `on_start` method fails. Everything constructed so far is torn down first.
+        """
+        handlers, middlewares = self._asgi_providers()
+        await self._abuild_env()
+        self._serve(handlers, middlewares)
+
+        if await self._on_start():
+            await self._on_stop()
+            raise InvalidLifecycleMethod("on_start methods failed while starting the harness")
+
+        self._running = asyncio.ensure_future(self._arun())
+
+    async def stop(self) -> None:
+        """
+        `stop` cancels any `run` methods that haven't completed yet and calls all `on_stop` methods on
+        the running event loop.
+        """
+        if self._running is not None and not self._running.done():
+            self._running.cancel()
+            await asyncio.gather(self._running, return_exceptions=True)
+
+        self._running = None
+        await self._on_stop()
+
+    async def __aenter__(self) -> Harness:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
     def asgi(self, scope: Dict[str, str]) -> Handler:
 
         if scope.get("type") == "lifespan":
@@ -497,47 +1861,225 @@ class Harness:
         raise Exception
 
     async def _asgi_lifespan(self, receive: Receive, send: Send) -> None:
-        # search through the provided classes for something with a handler
-        # method and register that
-        for name, provided in self._env.items():
-            if isimplementation(type(provided), EventHandler):
-                if self._asgi_handler is not None:
-                    # TODO log a better warning
-                    print("there already is an _asgi_handler. not replacing it.")
-                    continue
-
-                self._asgi_handler = provided
-
-        if self._asgi_handler is None:
-            raise Exception  # TODO Write an actual exception
-
         while True:
             msg = await receive()
 
             if msg.get("type") == "lifespan.startup":
-                self.build()
-                interrupt = True
-                interrupt = interrupt and await self._on_start()
+                try:
+                    interrupt = await self._start_progressively()
+                except Exception as e:
+                    self._logger.critical(f"Encountered an unexpected error during startup ({str(e)})")
+                    interrupt = True
+
+                if not interrupt:
+                    # ASGI servers don't call `run`, so the scheduled jobs are run in the background.
+                    self._running = asyncio.ensure_future(self._scheduler.run())
 
                 status = "lifespan.startup.failed" if interrupt else "lifespan.startup.complete"
                 await send({"type": status})
 
-                return
+                if interrupt:
+                    return
 
             if msg.get("type") == "lifespan.shutdown":
+                if self._deferred is not None and not self._deferred.done():
+                    self._deferred.cancel()
+                    await asyncio.gather(self._deferred, return_exceptions=True)
+
+                await self._scheduler.stop()
+                if self._running is not None:
+                    await asyncio.gather(self._running, return_exceptions=True)
+                    self._running = None
+
                 await self._on_stop()
                 await send({"type": "lifespan.shutdown.complete"})
-                self._loop.close()
+                if self._loop is not asyncio.get_running_loop():
+                    self._loop.close()
                 return
 
-    def _asgi_http(self, scope: Dict[str, str]) -> Handler:
-        async def handler(receive: Receive, send: Send) -> None:
-            await self._asgi_handler.asgi(scope, receive, send)
+    async def _start_progressively(self) -> bool:
+        """
+        `_start_progressively` constructs and starts everything the ASGI handler depends on as well
+        as all work that has not been marked as deferrable. Everything else is constructed and
+        started in the background, tracked by the Harness's `Readiness`.
+
+        Returns
+        -------
+        bool
+            Whether the critical `on_start` methods were interrupted.
+        """
+        handlers, middlewares = self._asgi_providers()
+        providers, hooks = self._critical(handlers + middlewares)
 
-        return handler
+        await self._abuild_env(providers)
+        self._serve(handlers, middlewares)
 
-    def _asgi_ws(self, scope: Dict[str, str]) -> Handler:
-        async def handler(receive: Receive, send: Send) -> None:
-            await self._asgi_handler.asgi(scope, receive, send)
+        if await self._on_start(hooks):
+            return True
+
+        if (
+            len(providers | self._lazy) < len(self._exec_order)
+            or hooks < set(self._on_start_graph) - self._lazy
+        ):
+            self._deferred = asyncio.ensure_future(self._start_deferred())
+
+        return False
+
+    async def _start_deferred(self) -> None:
+        """
+        `_start_deferred` constructs and starts everything `_start_progressively` has left behind.
+        """
+        try:
+            await self._abuild_env()
+            if await self._on_start(set(self._on_start_graph) - self._readiness._ready):
+                raise InvalidLifecycleMethod("Deferred on_start methods were interrupted")
+
+            self._logger.debug("Finished deferred construction and on_start methods.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._logger.critical(f"Encountered an unexpected error during deferred startup ({str(e)})")
+            self._readiness._fail(e)
+
+    def _asgi_providers(self) -> Tuple[List[str], List[str]]:
+        """
+        `_asgi_providers` resolves the Harness and finds the provided ASGI handler, if any, and the
+        provided middlewares in execution order.
+        """
+        if self._resolution is None:
+            self.resolve()
+
+        handlers = [
+            name
+            for name, obj in self._provided.items()
+            if name in self._dep_graph and isimplementation(_provided_type(obj), EventHandler)
+        ]
+        if len(handlers) > 1:
+            self._logger.warning(
+                f"Multiple ASGI handlers provided. Only {handlers[0]} receives ASGI messages."
+            )
+
+        middlewares = [
+            x
+            for x in self._exec_order
+            if x in self._provided
+            and x not in self._lazy
+            and isimplementation(_provided_type(self._provided[x]), Middleware)
+        ]
+
+        return handlers[:1], middlewares
+
+    def _serve(self, handlers: List[str], middlewares: List[str]) -> None:
+        """
+        `_serve` routes ASGI traffic to the constructed ASGI handler through the middlewares.
+        """
+        if handlers:
+            self._asgi_handler = self._env[handlers[0]]
+            self._asgi_handler_name = handlers[0]
+
+        self._asgi_app = self._compile(middlewares)
+
+    def _compile(self, middlewares: List[str]) -> App:
+        """
+        `_compile` composes the ASGI middlewares provided to the Harness in front of the ASGI handler
+        once, so that requests pass through a single precomposed callable. Middlewares constructed
+        earlier wrap the ones constructed later, so a middleware that depends on another one sees
+        requests after it.
+
+        Parameters
+        ----------
+        middlewares : List[str]
+            The names of the middlewares in execution order.
+        """
+        app: App = self._asgi_handler.asgi
+
+        if self._monitor is not None:
+            handler, monitor, name = app, self._monitor, self._asgi_handler_name
 
-        return handler
+            def watched(scope: Dict[str, str], receive: Receive, send: Send) -> Awaitable[None]:
+                return monitor.watch(handler(scope, receive, send), name, "asgi")
+
+            app = watched
+
+        if self._coalescer is not None:
+            app = self._coalescer.wrap(app)
+
+        if self._response_cache is not None:
+            app = self._response_cache.wrap(app)
+
+        for x in reversed(middlewares):
+            app = self._env[x].middleware(app)
+            self._logger.debug(f"Added ASGI middleware {x}")
+
+        if self._instrumentation is not None:
+            app = self._instrumentation.wrap(app)
+
+        if self._admission is not None:
+            app = self._admission.wrap(app)
+
+        if self._metrics_path is not None:
+            app = _expose(app, self._metrics, self._metrics_path)
+
+        return app
+
+    def _critical(self, roots: List[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        `_critical` computes the objects that must be constructed and the `on_start` methods that
+        must be called before the Harness can serve ASGI traffic. These are the dependency closure
+        of the ASGI handler and middlewares and of all constructors and `on_start` methods not
+        marked as deferrable.
+
+        Parameters
+        ----------
+        roots : List[str]
+            The names of the ASGI handler and middlewares.
+
+        Returns
+        -------
+        Tuple[Set[str], Set[str]]
+            The names of the critical objects and of the objects whose `on_start` methods are critical.
+        """
+        providers: Set[str] = set()
+        hooks: Set[str] = set()
+
+        def hook(x: str) -> None:
+            if x in hooks or x not in self._on_start_graph:
+                return
+
+            hooks.add(x)
+            for dep in self._on_start_graph[x].values():
+                provider(dep)
+                hook(dep)
+
+        def provider(x: str) -> None:
+            if x in providers:
+                return
+
+            providers.add(x)
+            for dep in self._dep_graph.get(x, {}).values():
+                provider(dep)
+            for _, edges in self._decorator_graph.get(x, []):
+                for dep in edges.values():
+                    provider(dep)
+
+            if x in self._on_start_graph and not isdeferred(_provided_type(self._provided[x]).on_start):
+                hook(x)
+
+        for x in self._exec_order:
+            if x in self._builtins or lazy_target(x) is not None:
+                providers.add(x)
+            elif pool_target(x) is not None:
+                # Pools are critical if their dependents are.
+                continue
+            elif x in roots or (x not in self._lazy and not isdeferred(_constructor(self._provided[x]))):
+                provider(x)
+
+        return providers, hooks
+
+    def _asgi_http(self, scope: Dict[str, str]) -> Handler:
+        self._http_requests.inc()
+        return partial(self._asgi_app, scope)
+
+    def _asgi_ws(self, scope: Dict[str, str]) -> Handler:
+        self._ws_requests.inc()
+        return partial(self._asgi_app, scope)
@@ -1,7 +1,13 @@
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
 from dataclasses import dataclass, field
 
+from jab.cache import SharedStats
+from jab.memoize import MemoStats
+from jab.memory import MemoryUsage
+from jab.pool import PoolStats
+from jab.ref import ImportStats
+
 
 @dataclass
 class Provided:
@@ -9,6 +15,12 @@ class Provided:
     constructor: Any
     obj: Any
     dependencies: List["Dependency"] = field(default_factory=list)
+    shared: Optional[SharedStats] = None
+    memory: Optional[MemoryUsage] = None
+    released: bool = False
+    memoized: Dict[str, MemoStats] = field(default_factory=dict)
+    imported: Optional[ImportStats] = None
+    pool: Optional[PoolStats] = None
 
 
 @dataclass
@@ -16,3 +28,14 @@ class Dependency:
     parameter: str
     type: Any
     provided: Provided
+
+
+@dataclass
+class Resolution:
+    providers: int
+    edges: int
+    depth: int
+    on_start_hooks: int
+    exec_order: List[str]
+    duration: float
+    cached: bool = False
@@ -0,0 +1,108 @@
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from jab.asgi import App, Receive, Send
+from jab.metrics import Registry, RegistryCounter
+
+OTHER = "other"
+
+Route = Callable[[Dict[str, Any]], str]
+
+
+def path(scope: Dict[str, Any]) -> str:
+    return str(scope.get("path", ""))
+
+
+class _RouteStats:
+    __slots__ = ("route", "ttfb", "latency", "bytes", "statuses", "_registry")
+
+    def __init__(self, registry: Registry, route: str) -> None:
+        self.route = route
+        self._registry = registry
+        labels = {"route": route}
+        self.ttfb = registry.histogram(
+            "jab_http_ttfb_seconds", "Time until the response was started per route", labels
+        )
+        self.latency = registry.histogram(
+            "jab_http_request_seconds", "Time until the response was completed per route", labels
+        )
+        self.bytes = registry.counter(
+            "jab_http_response_bytes_total", "Response body bytes per route", labels
+        )
+        self.statuses: Dict[int, RegistryCounter] = {}
+
+    def status(self, status: int) -> RegistryCounter:
+        counter = self.statuses.get(status)
+        if counter is None:
+            counter = self.statuses[status] = self._registry.counter(
+                "jab_http_responses_total",
+                "Responses per route and status",
+                {"route": self.route, "status": str(status)},
+            )
+
+        return counter
+
+
+class RouteInstrumentation:
+    """
+    `RouteInstrumentation` records the time to first byte, total latency, status and response body
+    bytes of the HTTP requests passing through an ASGI application in a metrics registry. Requests are
+    grouped by the route returned by `route`, usually the route template the request matches. Once
+    `max_routes` distinct routes have been seen, requests for new routes are recorded under `other`,
+    which bounds the memory the instrumentation uses.
+    """
+
+    def __init__(self, registry: Registry, route: Route = path, max_routes: int = 100) -> None:
+        self._registry = registry
+        self._route = route
+        self._max_routes = max_routes
+        self._routes: Dict[str, _RouteStats] = {}
+        self._other = _RouteStats(registry, OTHER)
+
+    def stats(self, route: str) -> _RouteStats:
+        stats = self._routes.get(route)
+        if stats is not None:
+            return stats
+
+        if len(self._routes) >= self._max_routes:
+            return self._other
+
+        stats = self._routes[route] = _RouteStats(self._registry, route)
+        return stats
+
+    def routes(self) -> Tuple[str, ...]:
+        return tuple(self._routes)
+
+    def wrap(self, app: App) -> App:
+        """
+        `wrap` returns an ASGI application that instruments the HTTP requests it passes on to `app`.
+        """
+        route, lookup = self._route, self.stats
+        perf_counter = time.perf_counter
+
+        async def instrumented(scope: Dict[str, str], receive: Receive, send: Send) -> None:
+            if scope.get("type") != "http":
+                return await app(scope, receive, send)
+
+            stats = lookup(route(scope))
+            start = perf_counter()
+            status = 500
+
+            async def timed(msg: Dict[str, Any]) -> None:
+                nonlocal status
+                kind = msg["type"]
+                if kind == "http.response.start":
+                    stats.ttfb.observe(perf_counter() - start)
+                    status = msg["status"]
+                elif kind == "http.response.body":
+                    stats.bytes.inc(len(msg.get("body", b"")))
+
+                await send(msg)
+
+            try:
+                await app(scope, receive, timed)
+            finally:
+                stats.latency.observe(perf_counter() - start)
+                stats.status(status).inc()
+
+        return instrumented
@@ -0,0 +1,53 @@
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+LAZY = "LAZY "
+
+
+class Lazy(Generic[T]):
+    """
+    `Lazy` is a handle to a provided object that is only constructed when it is first accessed.
+    Constructors that depend on `Lazy[T]` receive a handle instead of the `T` itself. Unless some
+    other object depends on `T` directly, `T` and any of its dependencies that haven't been
+    constructed yet are constructed on the first call to `get`. Depending on `Lazy[T]` also
+    breaks dependency cycles through `T`.
+    """
+
+    __slots__ = ("_build", "_obj")
+
+    def __init__(self, build: Callable[[], Awaitable[T]]) -> None:
+        self._build = build
+        self._obj: Optional[T] = None
+
+    @property
+    def built(self) -> bool:
+        return self._obj is not None
+
+    async def get(self) -> T:
+        """
+        `get` returns the provided object, constructing it if necessary. Concurrent first accesses
+        construct the object only once.
+        """
+        if self._obj is None:
+            self._obj = await self._build()
+
+        return self._obj
+
+
+Provider = Lazy
+
+
+def islazy(dep: object) -> bool:
+    return getattr(dep, "__origin__", None) is Lazy
+
+
+def lazy_target(name: str) -> Optional[str]:
+    """
+    `lazy_target` returns the name of the provided object a lazy handle's name refers to,
+    or None if `name` is not the name of a lazy handle.
+    """
+    if name.startswith(LAZY):
+        return name.replace(LAZY, "", 1)
+
+    return None
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type, TypeVar
+
+from dataclasses import dataclass
+
+T = TypeVar("T")
+
+MEMOIZED = "_jab_memoized"
+
+
+@dataclass
+class MemoStats:
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class _MethodCache:
+    """
+    `_MethodCache` caches the results of one method of one object by its arguments. Entries expire
+    after `ttl` seconds, if given, and the least recently used entries are evicted once more than
+    `maxsize` are cached. Concurrent calls of an async method with the same arguments share a single
+    call. Exceptions aren't cached.
+    """
+
+    def __init__(self, ttl: Optional[float], maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def stats(self) -> MemoStats:
+        return MemoStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        value, expires = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def wrap(self, method: Callable[..., Any]) -> Callable[..., Any]:
+        if not iscoroutinefunction(method):
+
+            @wraps(method)
+            def cached(*args: Any, **kwargs: Any) -> Any:
+                key = _key(args, kwargs)
+                found, value = self.get(key)
+                if found:
+                    return value
+
+                self._misses += 1
+                value = method(*args, **kwargs)
+                self.put(key, value)
+                return value
+
+            return cached
+
+        @wraps(method)
+        async def acached(*args: Any, **kwargs: Any) -> Any:
+            key = _key(args, kwargs)
+            found, value = self.get(key)
+            if found:
+                return value
+
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                return await asyncio.shield(call)
+
+            self._misses += 1
+            call = self._calls[key] = asyncio.ensure_future(method(*args, **kwargs))
+            try:
+                value = await asyncio.shield(call)
+            finally:
+                del self._calls[key]
+
+            self.put(key, value)
+            return value
+
+        return acached
+
+
+def _key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    if not kwargs:
+        return args
+
+    return args, tuple(sorted(kwargs.items()))
+
+
+def memoize(
+    target: Type[T], *methods: str, ttl: Optional[float] = None, maxsize: int = 1024
+) -> Callable[[T], T]:
+    """
+    `memoize` creates a decorator for `Harness.decorate` that caches the results of methods of the
+    provided object satisfying `target`, a type or Protocol. Results are cached per method by the
+    method's arguments, which must be hashable. Cached results expire after `ttl` seconds, if given,
+    and the least recently used results are evicted once a method has more than `maxsize` cached.
+    Concurrent calls of an async method with the same arguments share a single call. The decorated
+    object itself is passed on to its dependents, with its memoized methods replaced, and the cache
+    statistics are reported on the `memoized` field of `Harness.inspect`'s records.
+
+    Parameters
+    ----------
+    target : Type[T]
+        The type or Protocol of the object whose methods are memoized.
+    methods : str
+        The names of the memoized methods.
+    ttl : Optional[float]
+        Seconds results are cached for. Results don't expire by default.
+    maxsize : int
+        The number of results cached per method.
+
+    Raises
+    ------
+    AttributeError
+        If the decorated object lacks a memoized method or doesn't allow replacing it.
+    """
+
+    def memoized(obj: T) -> T:
+        caches: Dict[str, _MethodCache] = getattr(obj, MEMOIZED, {})
+        for name in methods:
+            cache = caches[name] = _MethodCache(ttl, maxsize)
+            setattr(obj, name, cache.wrap(getattr(obj, name)))
+
+        setattr(obj, MEMOIZED, caches)
+        return obj
+
+    memoized.__annotations__ = {"obj": target, "return": target}
+    memoized.__name__ = f"memoize_{getattr(target, '__name__', 'target')}"
+    return memoized
+
+
+def memo_stats(obj: Any) -> Dict[str, MemoStats]:
+    """
+    `memo_stats` returns the cache statistics of the memoized methods of an object by method name.
+    """
+    return {name: cache.stats() for name, cache in getattr(obj, MEMOIZED, {}).items()}
@@ -0,0 +1,123 @@
+import os
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from dataclasses import dataclass, field
+
+TRACEMALLOC = "tracemalloc"
+RSS = "rss"
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryUsage:
+    name: str
+    construct: int = 0
+    on_start: int = 0
+    top: List[AllocationSite] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.construct + self.on_start
+
+
+def _rss() -> int:
+    """
+    `_rss` returns the resident set size of the process in bytes.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # ru_maxrss is the peak RSS in kilobytes, the best approximation available
+        # on platforms without procfs.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryAccountant:
+    """
+    `MemoryAccountant` records how much memory each provided object retains after its constructor
+    and its `on_start` method have run. In `tracemalloc` mode the retained allocations are traced
+    and the top allocation sites are recorded as well. In `rss` mode only the change in the
+    process's resident set size is recorded, which is cheaper but coarser.
+
+    Parameters
+    ----------
+    mode : str
+        Either `tracemalloc` or `rss`.
+    top : int
+        Number of allocation sites to record per provided object in `tracemalloc` mode.
+    """
+
+    def __init__(self, mode: str = TRACEMALLOC, top: int = 5) -> None:
+        if mode not in (TRACEMALLOC, RSS):
+            raise ValueError(f"Unknown memory accounting mode '{mode}'")
+
+        self.mode = mode
+        self._top = top
+        self._usage: Dict[str, MemoryUsage] = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def measure(self, name: str, phase: str) -> Iterator[None]:
+        """
+        `measure` records the memory retained by the code run inside of it as the `phase`
+        ("construct" or "on_start") of the provided object `name`.
+        """
+        if self.mode == RSS:
+            before = _rss()
+            yield
+            self._record(name, phase, _rss() - before, [])
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        snapshot = tracemalloc.take_snapshot()
+        yield
+        diff = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+
+        ignored = (tracemalloc.__file__, __file__)
+        diff = [x for x in diff if x.traceback[0].filename not in ignored]
+
+        sites = [
+            AllocationSite(location=str(x.traceback[0]), size=x.size_diff, count=x.count_diff)
+            for x in sorted(diff, key=lambda x: x.size_diff, reverse=True)[: self._top]
+            if x.size_diff > 0
+        ]
+        self._record(name, phase, sum(x.size_diff for x in diff), sites)
+
+    def stop(self) -> None:
+        """
+        `stop` stops tracing allocations if the accountant started tracing them.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def usage(self, name: str) -> Optional[MemoryUsage]:
+        return self._usage.get(name)
+
+    def report(self) -> List[MemoryUsage]:
+        """
+        `report` returns the memory usage of every measured object, largest first.
+        """
+        return sorted(self._usage.values(), key=lambda x: x.total, reverse=True)
+
+    def _record(self, name: str, phase: str, delta: int, sites: List[AllocationSite]) -> None:
+        usage = self._usage.get(name)
+        if usage is None:
+            usage = self._usage[name] = MemoryUsage(name=name)
+
+        setattr(usage, phase, delta)
+        usage.top = sorted(usage.top + sites, key=lambda x: x.size, reverse=True)[: self._top]
@@ -0,0 +1,258 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
+
+from typing_extensions import Protocol
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter(Protocol):
+    def inc(self, amount: float = 1.0) -> None:
+        pass  # pragma: no cover
+
+
+class Gauge(Protocol):
+    def set(self, value: float) -> None:
+        pass  # pragma: no cover
+
+    def inc(self, amount: float = 1.0) -> None:
+        pass  # pragma: no cover
+
+    def dec(self, amount: float = 1.0) -> None:
+        pass  # pragma: no cover
+
+
+class Histogram(Protocol):
+    def observe(self, value: float) -> None:
+        pass  # pragma: no cover
+
+
+class Metrics(Protocol):
+    def counter(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+        pass  # pragma: no cover
+
+    def gauge(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Gauge:
+        pass  # pragma: no cover
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        pass  # pragma: no cover
+
+    def expose(self) -> str:
+        pass  # pragma: no cover
+
+
+class _Cells:
+    """
+    `_Cells` holds one list of values per thread that updates it. Updates only touch the calling
+    thread's list and never take a lock, the lists are only summed up when they are read.
+    """
+
+    __slots__ = ("_size", "_local", "_cells", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._cells: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        try:
+            return self._local.cell  # type: ignore
+        except AttributeError:
+            cell = [0.0] * self._size
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def sum(self) -> List[float]:
+        with self._lock:
+            cells = list(self._cells)
+
+        return [sum(c[i] for c in cells) for i in range(self._size)]
+
+
+class RegistryCounter:
+    __slots__ = ("_cells",)
+
+    def __init__(self) -> None:
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.sum()[0]
+
+
+class RegistryGauge:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class RegistryHistogram:
+    __slots__ = ("buckets", "_cells")
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, one for observations above the largest bucket and the sum.
+        self._cells = _Cells(len(self.buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def counts(self) -> List[float]:
+        """
+        `counts` returns the cumulative number of observations per bucket, including the `+Inf` bucket.
+        """
+        values = self._cells.sum()[:-1]
+        for i in range(1, len(values)):
+            values[i] += values[i - 1]
+
+        return values
+
+    @property
+    def count(self) -> float:
+        return sum(self._cells.sum()[:-1])
+
+    @property
+    def sum(self) -> float:
+        return self._cells.sum()[-1]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = labels + ((extra,) if extra is not None else ())
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    if value == int(value):
+        return str(int(value))
+
+    return repr(value)
+
+
+class Registry:
+    """
+    `Registry` is the default implementation of `jab.Metrics`. It keeps counters, gauges and
+    fixed-bucket histograms keyed on their name and labels. Counter and histogram updates only touch
+    a value owned by the calling thread, so they are cheap enough for hot paths. `expose` renders
+    every metric in the Prometheus text exposition format.
+
+    The Harness records its own lifecycle durations and ASGI request counts in its registry, and any
+    provided object that depends on `jab.Metrics` receives the same registry unless another
+    implementation has been provided.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._kinds: Dict[str, Tuple[str, str]] = {}
+        self._metrics: Dict[str, Dict[Labels, object]] = {}
+
+    def counter(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> RegistryCounter:
+        return cast(RegistryCounter, self._get(name, "counter", help, labels, RegistryCounter))
+
+    def gauge(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> RegistryGauge:
+        return cast(RegistryGauge, self._get(name, "gauge", help, labels, RegistryGauge))
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> RegistryHistogram:
+        return cast(
+            RegistryHistogram, self._get(name, "histogram", help, labels, lambda: RegistryHistogram(buckets))
+        )
+
+    def _get(
+        self, name: str, kind: str, help: str, labels: Optional[Dict[str, str]], new: Callable[[], object]
+    ) -> object:
+        """
+        `_get` returns the metric registered under `name` and `labels`, registering it if necessary.
+
+        Raises
+        ------
+        ValueError
+            If `name` is already registered as a different kind of metric.
+        """
+        key: Labels = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            registered = self._kinds.setdefault(name, (kind, help))
+            if registered[0] != kind:
+                raise ValueError(f"Metric {name} is already registered as a {registered[0]}")
+
+            series = self._metrics.setdefault(name, {})
+            if key not in series:
+                series[key] = new()
+
+            return series[key]
+
+    def expose(self) -> str:
+        """
+        `expose` renders every registered metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = [(name, self._kinds[name], dict(series)) for name, series in self._metrics.items()]
+
+        lines: List[str] = []
+        for name, (kind, help), series in sorted(metrics):
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for labels, metric in sorted(series.items()):
+                if isinstance(metric, RegistryHistogram):
+                    bounds = [_format_value(b) for b in metric.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, metric.counts()):
+                        lines.append(
+                            f"{name}_bucket{_format_labels(labels, ('le', bound))} {_format_value(count)}"
+                        )
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {_format_value(metric.count)}")
+                else:
+                    value: Any = metric
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value.value)}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Generator, List, Optional, TypeVar
+
+from dataclasses import dataclass, field
+
+from jab.logging import Logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class SlowStep:
+    owner: str
+    method: str
+    duration: float
+
+
+@dataclass
+class OwnerStats:
+    steps: int = 0
+    slow_steps: int = 0
+    busy: float = 0.0
+    max_step: float = 0.0
+
+
+@dataclass
+class LoopStats:
+    samples: int
+    mean_lag: float
+    p99_lag: float
+    max_lag: float
+    slow_steps: int
+    recent: List[SlowStep] = field(default_factory=list)
+    owners: Dict[str, OwnerStats] = field(default_factory=dict)
+
+
+class _Watched(Awaitable[T]):
+    """
+    `_Watched` drives a coroutine step by step, timing how long each step holds the event loop
+    and attributing that time to the provided object that owns the coroutine.
+    """
+
+    __slots__ = ("_coro", "_monitor", "_owner")
+
+    def __init__(self, coro: Any, monitor: "LoopMonitor", owner: str) -> None:
+        self._coro = coro
+        self._monitor = monitor
+        self._owner = owner
+
+    def __await__(self) -> Generator[Any, None, T]:
+        coro = self._coro
+        value: Any = None
+        error: Optional[BaseException] = None
+
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as e:
+                self._monitor._step(self._owner, time.perf_counter() - start)
+                return e.value  # type: ignore
+            except BaseException:
+                self._monitor._step(self._owner, time.perf_counter() - start)
+                raise
+
+            self._monitor._step(self._owner, time.perf_counter() - start)
+
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+class LoopMonitor:
+    """
+    `LoopMonitor` measures the scheduling lag of the event loop the Harness runs on and detects
+    coroutine steps that block it, attributing them to the `run`, `on_start` or `asgi` method of
+    the provided object that owns the coroutine.
+
+    Parameters
+    ----------
+    logger : Logger
+        Logger to report lag and slow steps to.
+    interval : float
+        Seconds between lag samples.
+    threshold : float
+        Lag or step duration in seconds above which a warning is logged.
+    window : int
+        Number of lag samples and slow steps kept for statistics.
+    """
+
+    def __init__(
+        self, logger: Logger, interval: float = 0.1, threshold: float = 0.05, window: int = 1024
+    ) -> None:
+        self._logger = logger
+        self._interval = interval
+        self._threshold = threshold
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._recent: Deque[SlowStep] = deque(maxlen=window)
+        self._owners: Dict[str, OwnerStats] = {}
+        self._samples = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+        self._slow_steps = 0
+        self._sampler: Optional["asyncio.Future[None]"] = None
+
+    def watch(self, coro: Awaitable[T], owner: str, method: str) -> Awaitable[T]:
+        """
+        `watch` wraps a coroutine of a provided object's lifecycle or ASGI method so that the time
+        each of its steps blocks the event loop is attributed to `owner.method`.
+        """
+        return _Watched(coro, self, f"{owner}.{method}")
+
+    def start(self) -> None:
+        """
+        `start` begins sampling the lag of the running event loop. Calling `start` while the
+        monitor is already sampling does nothing.
+        """
+        if self._sampler is None or self._sampler.done():
+            self._sampler = asyncio.ensure_future(self._sample())
+
+    async def stop(self) -> None:
+        if self._sampler is None:
+            return
+
+        self._sampler.cancel()
+        await asyncio.gather(self._sampler, return_exceptions=True)
+        self._sampler = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, loop.time() - expected)
+
+            self._samples += 1
+            self._total_lag += lag
+            self._max_lag = max(self._max_lag, lag)
+            self._lags.append(lag)
+
+            if lag > self._threshold:
+                self._logger.warning(f"Event loop lag of {lag * 1000:.1f}ms")
+
+    def _step(self, owner: str, duration: float) -> None:
+        stats = self._owners.get(owner)
+        if stats is None:
+            stats = self._owners[owner] = OwnerStats()
+
+        stats.steps += 1
+        stats.busy += duration
+        if duration > stats.max_step:
+            stats.max_step = duration
+
+        if duration > self._threshold:
+            stats.slow_steps += 1
+            self._slow_steps += 1
+            name, method = owner.rsplit(".", 1)
+            self._recent.append(SlowStep(owner=name, method=method, duration=duration))
+            self._logger.warning(f"{owner} blocked the event loop for {duration * 1000:.1f}ms")
+
+    def stats(self) -> LoopStats:
+        lags = sorted(self._lags)
+
+        return LoopStats(
+            samples=self._samples,
+            mean_lag=self._total_lag / self._samples if self._samples else 0.0,
+            p99_lag=lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+            max_lag=self._max_lag,
+            slow_steps=self._slow_steps,
+            recent=list(self._recent),
+            owners={k: OwnerStats(**vars(v)) for k, v in self._owners.items()},
+        )
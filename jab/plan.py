@@ -0,0 +1,524 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import keyword
+import os
+import re
+import tempfile
+from contextlib import AsyncExitStack
+from inspect import (
+    Parameter,
+    isasyncgen,
+    isawaitable,
+    isclass,
+    iscoroutinefunction,
+    isfunction,
+    isgenerator,
+    signature,
+)
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, get_type_hints
+
+import toposort
+
+from jab.cache import isshared
+from jab.exceptions import InvalidLifecycleMethod, NotFreezable
+from jab.lazy import lazy_target
+from jab.pool import pool_target
+from jab.readiness import isdeferred
+from jab.ref import isref
+from jab.transient import istransient
+
+Build = Callable[[Dict[str, Any], AsyncExitStack], Awaitable[Dict[str, Any]]]
+Start = Callable[[Dict[str, Any]], Awaitable[None]]
+Run = Callable[[Dict[str, Any]], List[Awaitable[None]]]
+
+_LIFECYCLE = ("on_start", "run", "on_stop")
+
+PLAN_VERSION = 1
+
+
+def _name(annotation: Any) -> str:
+    if isclass(annotation):
+        return f"{annotation.__module__}.{annotation.__qualname__}"
+
+    return repr(annotation)
+
+
+def _hints(fn: Any) -> Dict[str, Any]:
+    """
+    `_hints` returns the resolved annotations of a function, so that string annotations, like those
+    of modules using `from __future__ import annotations`, are fingerprinted as the types they refer
+    to. Annotations that can't be resolved are returned as they are declared.
+    """
+    try:
+        return get_type_hints(fn)
+    except Exception:
+        return dict(getattr(fn, "__annotations__", {}))
+
+
+def _signature(fn: Any) -> str:
+    try:
+        params = ",".join(f"{x.kind.name}:{x.name}" for x in signature(fn).parameters.values())
+    except (TypeError, ValueError):
+        params = ""
+
+    return f"({params}){';'.join(f'{k}:{_name(v)}' for k, v in _hints(fn).items())}"
+
+
+def _describe(annotation: Any) -> str:
+    """
+    `_describe` renders an annotation for a fingerprint. Classes, including the arguments of generic
+    types, are rendered with their public attributes and the signatures of their public methods, so
+    that a Protocol or class gaining or losing a method, or a method changing its signature, changes
+    the fingerprint.
+    """
+    if not isclass(annotation):
+        args = getattr(annotation, "__args__", None) or ()
+        return repr(annotation) + "".join(_describe(x) for x in args if isclass(x) or hasattr(x, "__args__"))
+
+    members = []
+    for name in dir(annotation):
+        if name.startswith("_"):
+            continue
+
+        attr = getattr(annotation, name, None)
+        members.append(f"{name}{_signature(attr)}" if callable(attr) and not isclass(attr) else name)
+
+    return f"{_name(annotation)}({','.join(members)})"
+
+
+def _annotations(fn: Any) -> str:
+    return ";".join(f"{k}:{_describe(v)}" for k, v in _hints(fn).items())
+
+
+def fingerprint(provided: Dict[str, Any], decorators: Iterable[Callable[..., Any]] = ()) -> str:
+    """
+    `fingerprint` hashes everything the wiring of a Harness is resolved from: the names and qualified
+    names of the provided constructors, the annotations of the constructors, decorators and lifecycle
+    methods, and the public attributes and method signatures of the provided types and of the
+    annotated classes and Protocols. Annotations are resolved with `get_type_hints`, but nothing is
+    searched or matched, so a fingerprint is much cheaper to compute than resolving the wiring again.
+
+    Parameters
+    ----------
+    provided : Dict[str, Any]
+        The provided constructors by name.
+    decorators : Iterable[Callable]
+        The decorators of the Harness.
+
+    Returns
+    -------
+    str
+        A hex digest that changes when any of the hashed declarations do. It doesn't cover what
+        only a constructor's body determines, like attributes assigned in `__init__`, or the types
+        provided by referenced constructors beyond their declared type and members.
+    """
+    h = hashlib.blake2b(digest_size=16)
+
+    def add(x: str) -> None:
+        h.update(x.encode())
+        h.update(b"\0")
+
+    for name in sorted(provided):
+        obj = provided[name]
+        add(name)
+        if isref(obj):
+            # Referenced constructors are fingerprinted without importing them.
+            declared = obj.declared if isinstance(obj.declared, str) else _describe(obj.declared)
+            add(f"{obj.target}:{declared}:{sorted(obj.members or ())}")
+            continue
+
+        add(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}")
+        add(_annotations(obj if isfunction(obj) else obj.__init__))
+
+        built = _hints(obj).get("return") if isfunction(obj) else obj
+        add(_describe(built))
+        for method in _LIFECYCLE:
+            hook = getattr(built, method, None)
+            add(f"{method}:{iscoroutinefunction(hook)}:{_annotations(hook)}" if hook is not None else "")
+
+    for fn in decorators:
+        add(f"{fn.__module__}.{fn.__qualname__}:{_annotations(fn)}")
+
+    return h.hexdigest()
+
+
+def load_plan(path: str, digest: str) -> Optional[Dict[str, Any]]:
+    """
+    `load_plan` reads a resolved wiring plan written by `store_plan`. It returns None if the file
+    doesn't exist, can't be parsed or was written for a different fingerprint or plan version.
+    """
+    try:
+        with open(path) as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(plan, dict) or plan.get("version") != PLAN_VERSION or plan.get("fingerprint") != digest:
+        return None
+
+    return plan
+
+
+def store_plan(path: str, digest: str, plan: Dict[str, Any]) -> None:
+    """
+    `store_plan` writes a resolved wiring plan as JSON along with the fingerprint it was resolved for.
+    The file is replaced atomically, so concurrently starting processes never read a partial plan.
+
+    Raises
+    ------
+    OSError
+        If the file can't be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".jab-plan-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(plan, version=PLAN_VERSION, fingerprint=digest), f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+async def enter(stack: AsyncExitStack, obj: Any) -> Any:
+    """
+    `enter` enters the object yielded by an (async) generator or context manager constructor in
+    generated code and registers the rest of the constructor as teardown.
+    """
+    from jab.harness import _afinish, _finish  # jab.harness imports this module.
+
+    if isawaitable(obj):
+        obj = await obj
+
+    if isgenerator(obj):
+        stack.callback(_finish, obj)
+        return next(obj)
+
+    if isasyncgen(obj):
+        stack.push_async_callback(_afinish, obj)
+        return await obj.__anext__()
+
+    if hasattr(obj, "__aenter__"):
+        return await stack.enter_async_context(obj)
+
+    return stack.enter_context(obj)
+
+
+class Frozen:
+    """
+    `Frozen` runs the wiring of a Harness generated by `python -m jab freeze`. The generated code
+    constructs every provided object with direct calls in the resolved execution order and calls the
+    lifecycle methods directly, so nothing is introspected or resolved at run time. When the Frozen
+    wiring is created, the fingerprint it was generated with is checked against the Harness it was
+    generated from, which covers the provided types' members as well as the constructors'
+    annotations. If they differ, the generated code is stale and the Harness is run normally. See
+    `fingerprint` for what it doesn't cover.
+
+    Lifecycle methods are taken from the provided types when the code is generated. Unlike a Harness,
+    a Frozen wiring doesn't discover `on_start` methods on objects whose provided type doesn't declare
+    them and tears everything down in the reverse order of construction, one object at a time.
+    """
+
+    def __init__(self, harness: Any, digest: str, build: Build, on_start: Start, run: Run) -> None:
+        self.harness = harness
+        self.env: Dict[str, Any] = {}
+        self.stale = fingerprint(harness._provided, harness._decorators) != digest
+        self._build = build
+        self._start = on_start
+        self._run = run
+        self._stack = AsyncExitStack()
+        self._running: Optional["asyncio.Future[None]"] = None
+
+        if self.stale:
+            harness._logger.warning("Frozen wiring is stale, resolving the harness instead")
+
+    async def _on_start(self) -> bool:
+        harness = self.harness
+        self.env = await self._build(dict(harness._builtins), self._stack)
+        harness._env = self.env
+        harness._readiness._expect(x for x in harness._provided if x in self.env)
+
+        try:
+            await self._start(self.env)
+        except KeyboardInterrupt:
+            harness._logger.critical("Keyboard interrupt during execution of on_start methods.")
+            return True
+        except Exception as e:
+            harness._logger.critical(
+                f"Encountered an unexpected error during execution of on_start methods ({str(e)})"
+            )
+            return True
+
+        for x in harness._provided:
+            if x in self.env:
+                harness._readiness._set(x)
+
+        return False
+
+    async def _arun(self) -> None:
+        try:
+            await asyncio.gather(self.harness._scheduler.run(), *self._run(self.env))
+        except Exception as e:
+            self.harness._logger.critical(
+                f"Encountered unexpected error during execution of run methods ({str(e)})"
+            )
+
+    async def _on_stop(self) -> None:
+        await self.harness._scheduler.stop()
+
+        try:
+            await self._stack.aclose()
+        except Exception as e:
+            self.harness._logger.error(f"Encountered an unexpected error during teardown ({str(e)})")
+
+    def run(self) -> None:
+        """
+        `run` executes the full lifecycle of the wiring on the Harness's event loop. See `Harness.run`.
+        """
+        if self.stale:
+            self.harness.run()
+            return
+
+        loop = self.harness._loop
+        if not loop.run_until_complete(self._on_start()):
+            try:
+                loop.run_until_complete(self._arun())
+            except KeyboardInterrupt:
+                self.harness._logger.critical("Keyboard interrupt during execution of run methods.")
+
+        loop.run_until_complete(self._on_stop())
+        loop.close()
+
+    async def start(self) -> None:
+        """
+        `start` constructs everything, calls the `on_start` methods and runs the `run` methods in the
+        background on the running event loop. See `Harness.start`.
+
+        Raises
+        ------
+        InvalidLifecycleMethod
+            If an `on_start` method fails. Everything constructed so far is torn down first.
+        """
+        if self.stale:
+            await self.harness.start()
+            return
+
+        if await self._on_start():
+            await self._on_stop()
+            raise InvalidLifecycleMethod("on_start methods failed while starting the frozen wiring")
+
+        self._running = asyncio.ensure_future(self._arun())
+
+    async def stop(self) -> None:
+        """
+        `stop` cancels any `run` methods that haven't completed yet and tears everything down on the
+        running event loop. See `Harness.stop`.
+        """
+        if self.stale:
+            await self.harness.stop()
+            return
+
+        if self._running is not None and not self._running.done():
+            self._running.cancel()
+            await asyncio.gather(self._running, return_exceptions=True)
+
+        self._running = None
+        await self._on_stop()
+
+    async def __aenter__(self) -> "Frozen":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+
+def _identifier(name: str, taken: Dict[str, str]) -> str:
+    """
+    `_identifier` returns a unique local variable name for a provided object in generated code.
+    """
+    base = re.sub(r"\W", "_", name).strip("_").lower() or "obj"
+    if base[0].isdigit() or keyword.iskeyword(base):
+        base = f"obj_{base}"
+
+    ident, n = base, 1
+    while ident in taken.values():
+        n += 1
+        ident = f"{base}_{n}"
+
+    return ident
+
+
+def _reference(obj: Any, modules: Dict[str, str]) -> str:
+    """
+    `_reference` returns an expression referencing an importable function or class in generated code.
+
+    Raises
+    ------
+    NotFreezable
+        If the object can't be imported by its qualified name.
+    """
+    module, qualname = getattr(obj, "__module__", None), getattr(obj, "__qualname__", "")
+    found: Any = importlib.import_module(module) if module else None
+    for part in qualname.split("."):
+        found = getattr(found, part, None)
+
+    if module is None or found is not obj:
+        raise NotFreezable(f"{obj} can't be imported by its qualified name {module}.{qualname}")
+
+    alias = modules.setdefault(module, "_" + module.replace(".", "_"))
+    return f"{alias}.{qualname}"
+
+
+def _call(fn: Any, params: Callable[[Any], List[Parameter]], args: Dict[str, str]) -> str:
+    """
+    `_call` renders the arguments of a call to `fn` in generated code. Arguments are passed by
+    position as long as possible and by keyword after that.
+    """
+    rendered, positional = [], True
+    for p in params(fn):
+        if p.name not in args:
+            positional = False
+            continue
+
+        if positional and p.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD):
+            rendered.append(args[p.name])
+        else:
+            positional = False
+            rendered.append(f"{p.name}={args[p.name]}")
+
+    return ", ".join(rendered)
+
+
+def _literal(s: str) -> str:
+    return json.dumps(s)
+
+
+def _parameters(fn: Any) -> List[Parameter]:
+    return list(signature(fn).parameters.values())
+
+
+def _method_parameters(fn: Any) -> List[Parameter]:
+    return _parameters(fn)[1:]
+
+
+def generate(harness: Any, target: str) -> str:
+    """
+    `generate` resolves a Harness and generates the source of a module that runs its wiring as a
+    `Frozen` wiring. The module exposes it as `harness`. See `Frozen`.
+
+    Parameters
+    ----------
+    harness : Harness
+        The Harness to generate the module for.
+    target : str
+        The `module:attribute` reference the generated module loads the Harness from.
+
+    Raises
+    ------
+    NotFreezable
+        If the Harness uses decorators, lazy dependencies, pools or shared, transient or deferred
+        constructors, or provides a constructor that can't be imported by its qualified name.
+    """
+    from jab.harness import _constructor, _provided_type, _yields  # jab.harness imports this module.
+
+    if harness._resolution is None:
+        harness.resolve()
+
+    if harness._decorators:
+        raise NotFreezable("Harnesses with decorators can't be frozen")
+
+    modules: Dict[str, str] = {}
+    idents: Dict[str, str] = {}
+    build: List[str] = []
+
+    for x in harness._exec_order:
+        if lazy_target(x) is not None:
+            raise NotFreezable(f"{x} is a lazy dependency, which can't be frozen")
+
+        if pool_target(x) is not None:
+            raise NotFreezable(f"{x} is a pool, which can't be frozen")
+
+        idents[x] = _identifier(x, idents)
+        if x in harness._builtins:
+            build.append(f"{idents[x]} = builtins[{_literal(x)}]")
+            continue
+
+        constructor = _constructor(harness._provided[x])
+        if isshared(constructor) or istransient(constructor) or isdeferred(constructor):
+            raise NotFreezable(f"{x} is a shared, transient or deferred constructor, which can't be frozen")
+
+        params = _parameters if isfunction(constructor) else _method_parameters
+        call = _call(
+            constructor if isfunction(constructor) else constructor.__init__,
+            params,
+            {k: idents[v] for k, v in harness._dep_graph[x].items()},
+        )
+        expr = f"{_reference(constructor, modules)}({call})"
+        if isfunction(constructor) and _yields(constructor):
+            expr = f"await enter(stack, {expr})"
+        elif iscoroutinefunction(constructor):
+            expr = f"await {expr}"
+
+        build.append(f"{idents[x]} = {expr}")
+
+        on_stop = getattr(_provided_type(constructor), "on_stop", None)
+        if on_stop is not None:
+            push = "push_async_callback" if iscoroutinefunction(on_stop) else "callback"
+            build.append(f"stack.{push}({idents[x]}.on_stop)")
+
+    on_start: List[str] = []
+    for x in toposort.toposort_flatten({k: set(v.values()) for k, v in harness._on_start_graph.items()}):
+        if x in harness._on_start_graph:
+            hook = _provided_type(_constructor(harness._provided[x])).on_start
+            args = {k: f"env[{_literal(v)}]" for k, v in harness._on_start_graph[x].items()}
+            call = f"env[{_literal(x)}].on_start({_call(hook, _method_parameters, args)})"
+            on_start.append(f"await {call}" if iscoroutinefunction(hook) else call)
+
+    run = [
+        f"env[{_literal(x)}].run(),"
+        for x in harness._exec_order
+        if x in harness._provided and hasattr(_provided_type(_constructor(harness._provided[x])), "run")
+    ]
+
+    env = [f"{_literal(x)}: {idents[x]}," for x in harness._exec_order]
+    imports = [f"import {m} as {alias}" for m, alias in sorted(modules.items())]
+
+    def block(lines: List[str], indent: int, empty: str = "pass") -> str:
+        return "\n".join(" " * indent + line for line in lines or [empty])
+
+    return f'''"""
+Generated by `python -m jab freeze {target}`. Do not edit, generate it again instead.
+"""
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Dict, List
+
+from jab.cli import load
+from jab.plan import Frozen, enter
+
+{chr(10).join(imports)}
+
+FINGERPRINT = {_literal(fingerprint(harness._provided, harness._decorators))}
+
+
+async def build(builtins: Dict[str, Any], stack: AsyncExitStack) -> Dict[str, Any]:
+{block(build, 4)}
+    return {{
+{block(env, 8)}
+    }}
+
+
+async def on_start(env: Dict[str, Any]) -> None:
+{block(on_start, 4)}
+
+
+def run(env: Dict[str, Any]) -> List[Awaitable[None]]:
+    return [
+{block(run, 8, "# No provided object has a run method.")}
+    ]
+
+
+harness = Frozen(load({_literal(target)}), FINGERPRINT, build, on_start, run)
+'''
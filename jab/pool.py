@@ -0,0 +1,307 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from inspect import isawaitable
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+from dataclasses import dataclass
+
+from jab.logging import Logger
+
+T = TypeVar("T")
+
+POOL = "POOL "
+
+# Default size, limit and idle seconds of the pools of constructors that aren't marked with `pooled`.
+DEFAULTS = (1, 16, 60.0)
+
+Teardown = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class PoolStats:
+    """
+    `PoolStats` records the use of a pool. `instances` and `in_use` are the current number of pooled
+    instances and of those that are checked out, and `waits` counts the checkouts that had to wait for
+    an instance to be checked in because the pool had reached its limit. `wait_seconds` is the total
+    time checkouts took, including constructing new instances.
+    """
+
+    size: int
+    limit: int
+    instances: int
+    in_use: int
+    peak_in_use: int
+    checkouts: int
+    waits: int
+    wait_seconds: float
+    max_wait: float
+    created: int
+    discarded: int
+
+    @property
+    def utilization(self) -> float:
+        return self.in_use / self.limit
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_seconds / self.checkouts if self.checkouts else 0.0
+
+
+def pooled(size: int = DEFAULTS[0], limit: int = DEFAULTS[1], idle: float = DEFAULTS[2]) -> Callable[[T], T]:
+    """
+    `pooled` configures the pool of a constructor that dependents check instances out of by depending
+    on `jab.Pool[T]`. The pool is filled with `size` instances when the Harness is built, grows up to
+    `limit` instances while checkouts would otherwise wait, and discards instances beyond `size` that
+    have been idle for `idle` seconds.
+
+    Raises
+    ------
+    ValueError
+        If `size` is negative, `limit` is smaller than `size` or 1, or `idle` isn't positive.
+    """
+    if size < 0 or limit < max(size, 1) or idle <= 0:
+        raise ValueError(f"Invalid pool size {size}, limit {limit} or idle time {idle}")
+
+    def mark(constructor: T) -> T:
+        setattr(constructor, "_jab_pooled", (size, limit, idle))
+        return constructor
+
+    return mark
+
+
+def pool_settings(constructor: Any) -> Tuple[int, int, float]:
+    settings: Tuple[int, int, float] = getattr(constructor, "_jab_pooled", DEFAULTS)
+    return settings
+
+
+def ispool(dep: object) -> bool:
+    return getattr(dep, "__origin__", None) is Pool
+
+
+def pool_target(name: str) -> Optional[str]:
+    """
+    `pool_target` returns the name of the provided object a pool's name refers to,
+    or None if `name` is not the name of a pool.
+    """
+    if name.startswith(POOL):
+        return name.replace(POOL, "", 1)
+
+    return None
+
+
+class Pool(Generic[T]):
+    """
+    `Pool` holds reusable instances of a provided object for dependents that need one at a time,
+    like per-request scratch buffers or serializer contexts. Constructors that depend on `Pool[T]`
+    receive the pool, and check instances out with `async with pool.checkout() as obj`. When an
+    instance is checked back in, its `reset` method is called if it has one, and the instance is
+    discarded if `reset` fails. Idle instances beyond `size` are discarded by a task the pool runs
+    from `fill` until `close`. Instances are torn down, like any provided object, when they are
+    discarded or the Harness stops. See `pooled`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        create: Callable[[], Awaitable[Tuple[T, Teardown]]],
+        logger: Logger,
+        size: int = DEFAULTS[0],
+        limit: int = DEFAULTS[1],
+        idle: float = DEFAULTS[2],
+    ) -> None:
+        self.name = name
+        self.size = size
+        self.limit = limit
+        self.idle = idle
+        self._create = create
+        self._logger = logger
+        # The free instances with the time they were checked in. Instances are checked out from the
+        # end, so the instances that have been idle the longest are at the start.
+        self._free: List[Tuple[T, Teardown, float]] = []
+        self._in_use = 0
+        self._instances = 0
+        self._available = asyncio.Condition()
+        self._closed = False
+        self._shrinking: Optional["asyncio.Future[None]"] = None
+
+        self._peak = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._created = 0
+        self._discarded = 0
+
+    async def fill(self) -> None:
+        """
+        `fill` constructs instances until the pool holds `size` of them, and starts discarding the
+        instances beyond `size` that have been idle for `idle` seconds in the background until the
+        pool is closed.
+        """
+        while self._instances < self.size:
+            self._instances += 1
+            obj, teardown = await self._construct()
+            self._free.append((obj, teardown, time.monotonic()))
+
+        if self._shrinking is None and not self._closed and self.limit > self.size:
+            self._shrinking = asyncio.ensure_future(self._shrink_idle())
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[T]:
+        """
+        `checkout` checks an instance out of the pool for the duration of the `async with` block. If
+        every instance is checked out, a new one is constructed unless the pool has reached its limit,
+        in which case the checkout waits for an instance to be checked in.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool was closed.
+        """
+        start = time.perf_counter()
+        obj, teardown = await self._acquire()
+
+        wait = time.perf_counter() - start
+        self._checkouts += 1
+        self._wait_seconds += wait
+        self._max_wait = max(self._max_wait, wait)
+
+        try:
+            yield obj
+        finally:
+            await self._release(obj, teardown)
+
+    async def shrink(self) -> None:
+        """
+        `shrink` discards the instances beyond `size` that have been idle for at least `idle` seconds.
+        """
+        now = time.monotonic()
+        expired = []
+        async with self._available:
+            while self._free and self._instances > self.size and now - self._free[0][2] >= self.idle:
+                expired.append(self._free.pop(0))
+                self._instances -= 1
+
+        self._discarded += len(expired)
+        for _, teardown, _ in expired:
+            await self._teardown(teardown)
+
+    async def close(self) -> None:
+        """
+        `close` tears down the free instances. Instances that are still checked out are torn down when
+        they are checked in, and checkouts that are waiting fail.
+        """
+        if self._shrinking is not None:
+            self._shrinking.cancel()
+            await asyncio.gather(self._shrinking, return_exceptions=True)
+            self._shrinking = None
+
+        async with self._available:
+            self._closed = True
+            free, self._free = self._free, []
+            self._instances -= len(free)
+            self._available.notify_all()
+
+        for _, teardown, _ in free:
+            await self._teardown(teardown)
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size,
+            limit=self.limit,
+            instances=self._instances,
+            in_use=self._in_use,
+            peak_in_use=self._peak,
+            checkouts=self._checkouts,
+            waits=self._waits,
+            wait_seconds=self._wait_seconds,
+            max_wait=self._max_wait,
+            created=self._created,
+            discarded=self._discarded,
+        )
+
+    async def _shrink_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle / 2)
+            await self.shrink()
+
+    async def _acquire(self) -> Tuple[T, Teardown]:
+        async with self._available:
+            waited = False
+            while not self._closed and not self._free and self._instances >= self.limit:
+                waited = True
+                await self._available.wait()
+
+            if self._closed:
+                raise RuntimeError(f"The pool of {self.name} is closed")
+
+            if waited:
+                self._waits += 1
+
+            self._in_use += 1
+            self._peak = max(self._peak, self._in_use)
+            if self._free:
+                obj, teardown, _ = self._free.pop()
+                return obj, teardown
+
+            # The instance is counted while it is constructed, so concurrent checkouts respect the limit.
+            self._instances += 1
+
+        try:
+            return await self._construct()
+        except BaseException:
+            self._in_use -= 1
+            raise
+
+    async def _release(self, obj: T, teardown: Teardown) -> None:
+        self._in_use -= 1
+        try:
+            reset = getattr(obj, "reset", None)
+            if reset is not None:
+                result = reset()
+                if isawaitable(result):
+                    await result
+        except Exception as e:
+            self._logger.error(f"Encountered an unexpected error resetting a pooled {self.name} ({str(e)})")
+            await self._discard(teardown)
+            return
+
+        if self._closed:
+            await self._discard(teardown)
+            return
+
+        async with self._available:
+            self._free.append((obj, teardown, time.monotonic()))
+            self._available.notify()
+
+    async def _construct(self) -> Tuple[T, Teardown]:
+        """
+        `_construct` constructs an instance that has already been counted in `_instances`.
+        """
+        try:
+            created = await self._create()
+        except BaseException:
+            async with self._available:
+                self._instances -= 1
+                self._available.notify()
+            raise
+
+        self._created += 1
+        return created
+
+    async def _discard(self, teardown: Teardown) -> None:
+        async with self._available:
+            self._instances -= 1
+            self._discarded += 1
+            self._available.notify()
+
+        await self._teardown(teardown)
+
+    async def _teardown(self, teardown: Teardown) -> None:
+        try:
+            await teardown()
+        except Exception as e:
+            self._logger.error(
+                f"Encountered an unexpected error during teardown of a pooled {self.name} ({str(e)})"
+            )
@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+def deferred(obj: T) -> T:
+    """
+    `deferred` marks a constructor or an `on_start` method as deferrable. When the Harness is
+    started through its ASGI lifespan, deferrable work that the ASGI handler does not depend on
+    keeps running in the background after startup has been reported complete.
+    """
+    setattr(obj, "_jab_deferred", True)
+    return obj
+
+
+def isdeferred(obj: Any) -> bool:
+    return getattr(obj, "_jab_deferred", False) is True
+
+
+class Readiness:
+    """
+    `Readiness` tracks which provided objects are ready, meaning they have been constructed and
+    their `on_start` method, if they have one, has completed. Constructors can depend on `jab.Readiness`
+    to check on objects whose construction has been deferred.
+    """
+
+    def __init__(self, lookup: Callable[[Any], Optional[str]]) -> None:
+        self._lookup = lookup
+        self._expected: Set[str] = set()
+        self._ready: Set[str] = set()
+        self._waiters: Dict[str, List["asyncio.Future[None]"]] = {}
+        self._error: Optional[BaseException] = None
+
+    def ready(self, arg: Any) -> bool:
+        """
+        `ready` reports whether the provided object satisfying a type or Protocol is ready.
+
+        Parameters
+        ----------
+        arg : Any
+            A type, Protocol or the name an object was provided under.
+        """
+        return self._name(arg) in self._ready
+
+    async def wait(self, arg: Any) -> None:
+        """
+        `wait` waits until the provided object satisfying a type or Protocol is ready.
+
+        Raises
+        ------
+        Exception
+            The exception that stopped the Harness from finishing its deferred work.
+        """
+        name = self._name(arg)
+        if name in self._ready:
+            return
+
+        if self._error is not None:
+            raise self._error
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(name, []).append(waiter)
+        await waiter
+
+    @property
+    def complete(self) -> bool:
+        return self._expected <= self._ready
+
+    def pending(self) -> List[str]:
+        """
+        `pending` returns the names of the provided objects that are not ready yet.
+        """
+        return sorted(self._expected - self._ready)
+
+    def _name(self, arg: Any) -> str:
+        if isinstance(arg, str):
+            return arg
+
+        name = self._lookup(arg)
+        if name is None:
+            raise KeyError(f"{arg} not registered with jab harness")
+
+        return name
+
+    def _expect(self, names: Iterable[str]) -> None:
+        self._expected = set(names)
+
+    def _set(self, name: str) -> None:
+        self._ready.add(name)
+
+        for waiter in self._waiters.pop(name, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _fail(self, error: BaseException) -> None:
+        self._error = error
+
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+
+        self._waiters = {}
@@ -0,0 +1,191 @@
+import importlib
+import sys
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple, Type, Union
+
+from dataclasses import dataclass
+
+from jab.exceptions import NoConstructor
+
+
+@dataclass
+class ImportStats:
+    """
+    `ImportStats` records the import of the module of a `Ref`. `seconds` and `modules` include
+    the modules it imported in turn, and are 0 if the module had already been imported.
+    """
+
+    module: str
+    seconds: float
+    modules: int
+
+
+_imports: Dict[str, ImportStats] = {}
+
+
+def import_stats() -> Dict[str, ImportStats]:
+    """
+    `import_stats` returns the imports of the modules of all loaded `Ref`s in the process by module.
+    """
+    return dict(_imports)
+
+
+def _import(module: str) -> Any:
+    """
+    `_import` imports a module, recording how long it took if it hadn't been imported yet.
+    """
+    if module in sys.modules:
+        _imports.setdefault(module, ImportStats(module=module, seconds=0.0, modules=0))
+        return sys.modules[module]
+
+    before = len(sys.modules)
+    start = time.perf_counter()
+    imported = importlib.import_module(module)
+    _imports[module] = ImportStats(
+        module=module, seconds=time.perf_counter() - start, modules=len(sys.modules) - before
+    )
+    return imported
+
+
+def _resolve(path: str) -> Any:
+    """
+    `_resolve` imports the object referenced by a `module:attribute` path. Attributes that aren't
+    found on a module are imported as its submodules.
+
+    Raises
+    ------
+    NoConstructor
+        If the module can't be imported or has no such attribute.
+    """
+    module, _, attr = path.partition(":")
+    try:
+        obj: Any = _import(module)
+        for part in attr.split("."):
+            if not hasattr(obj, part) and getattr(obj, "__name__", None) == module:
+                module = f"{module}.{part}"
+                _import(module)
+            obj = getattr(obj, part)
+    except ImportError as e:
+        raise NoConstructor(f"Could not import module '{module}' of '{path}' ({str(e)})")
+    except AttributeError:
+        raise NoConstructor(f"Module '{module}' has no attribute '{attr}' ('{path}')")
+
+    return obj
+
+
+def _split(path: str, what: str) -> Tuple[str, str]:
+    module, _, attr = path.partition(":")
+    if not module or not attr:
+        raise NoConstructor(f"Reference '{path}' to a {what} must be of the form module:attribute")
+
+    return module, attr
+
+
+class Ref:
+    """
+    `Ref` references a constructor by import path, so that its module is only imported once a
+    Harness needs it. The provided type may be referenced by import path as well, in which case
+    it is imported the first time the Harness matches a dependency against it. `members` are the
+    public attribute names of the provided type if they are known without importing it. The Harness
+    only imports the type to match it against a Protocol if its members cover the Protocol's, and
+    doesn't match a type whose members aren't known until its module is imported. See `ref`.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        provides: Union[Type[Any], str],
+        name: Optional[str] = None,
+        members: Optional[FrozenSet[str]] = None,
+    ) -> None:
+        self._module, _ = _split(target, "constructor")
+        self.target = target
+        self.declared = provides
+        if isinstance(provides, str):
+            self.provides_name = _split(provides, "type")[1].rsplit(".", 1)[-1]
+            self._provides: Any = None
+        else:
+            self.provides_name = provides.__name__
+            self._provides = provides
+
+        self.name = name or self.provides_name
+        self.members = members
+        self._constructor: Any = None
+
+    @property
+    def provides(self) -> Any:
+        if self._provides is None:
+            self._provides = _resolve(str(self.declared))
+
+        return self._provides
+
+    @property
+    def typed(self) -> bool:
+        """
+        `typed` reports whether the declared type can be resolved without importing a module.
+        """
+        return self._provides is not None or str(self.declared).partition(":")[0] in sys.modules
+
+    @property
+    def loaded(self) -> bool:
+        return self._constructor is not None
+
+    @property
+    def imported(self) -> Optional[ImportStats]:
+        return _imports.get(self._module) if self.loaded else None
+
+    def load(self) -> Any:
+        """
+        `load` imports the referenced constructor, recording how long importing its module took.
+
+        Raises
+        ------
+        NoConstructor
+            If the module can't be imported or has no such attribute.
+        """
+        if self._constructor is None:
+            self._constructor = _resolve(self.target)
+
+        return self._constructor
+
+    def __repr__(self) -> str:
+        return f"jab.ref({self.target!r}, provides={getattr(self.declared, '__name__', self.declared)!r})"
+
+
+def ref(
+    target: str,
+    provides: Union[Type[Any], str],
+    name: Optional[str] = None,
+    members: Optional[Iterable[str]] = None,
+) -> Ref:
+    """
+    `ref` references a constructor by its import path instead of the constructor itself, so that
+    modules that are expensive to import are only imported when they are needed. The Harness
+    matches dependencies against the declared `provides` type. A referenced constructor is only
+    imported, resolved and constructed if something the Harness constructs depends on it. Unlike
+    other provided constructors, it is not constructed on its own. How long importing each module
+    took is reported in the `imported` field of `Harness.inspect`'s records.
+
+    Parameters
+    ----------
+    target : str
+        The import path of the constructor, as `module:attribute`.
+    provides : Union[Type, str]
+        The type or Protocol the constructor provides, or its import path as `module:attribute`.
+    name : Optional[str]
+        The name the constructor is provided under. Defaults to the name of `provides`.
+    members : Optional[Iterable[str]]
+        The public attribute names of the provided type. A type referenced by import path is only
+        matched against Protocol dependencies once its module has been imported, unless its members
+        are given.
+
+    Raises
+    ------
+    NoConstructor
+        If the target isn't of the form `module:attribute`.
+    """
+    return Ref(target, provides, name, frozenset(members) if members is not None else None)
+
+
+def isref(obj: Any) -> bool:
+    return isinstance(obj, Ref)
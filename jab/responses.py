@@ -0,0 +1,234 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dataclasses import dataclass
+
+from jab.asgi import App, Receive, Send
+from jab.metrics import Registry
+
+CacheKey = Tuple[str, str, bytes, Tuple[Optional[bytes], ...]]
+
+_CACHEABLE_METHODS = {"GET", "HEAD"}
+
+# Request headers that identify the client, whose responses are only shared if they're marked public.
+_CREDENTIALS = (b"authorization", b"cookie")
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class _Response:
+    __slots__ = ("messages", "size", "expires")
+
+    def __init__(self, messages: List[Dict[str, Any]], size: int, expires: float) -> None:
+        self.messages = messages
+        self.size = size
+        self.expires = expires
+
+
+def _header(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+
+    return None
+
+
+def _vary(headers: Iterable[Tuple[bytes, bytes]]) -> List[bytes]:
+    """
+    `_vary` returns the lowercased header names listed in the Vary headers of a response.
+    """
+    names: List[bytes] = []
+    for key, value in headers:
+        if key.lower() == b"vary":
+            names.extend(x.strip().lower() for x in value.split(b",") if x.strip())
+
+    return names
+
+
+def _directives(cache_control: Optional[bytes]) -> Dict[str, Optional[str]]:
+    """
+    `_directives` parses the directives of a Cache-Control header.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (cache_control or b"").decode("latin-1").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    return directives
+
+
+def _ttl(directives: Dict[str, Optional[str]], default: float) -> float:
+    """
+    `_ttl` returns the number of seconds a response may be cached for according to the directives
+    of its Cache-Control header, or 0 if it must not be cached.
+    """
+    if "no-store" in directives or "no-cache" in directives or "private" in directives:
+        return 0
+
+    for name in ("s-maxage", "max-age"):
+        value = directives.get(name)
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return 0
+
+    return default
+
+
+class ResponseCache:
+    """
+    `ResponseCache` stores complete responses to GET and HEAD requests and replays them to later
+    requests for the same method, path, query string and values of the `vary` request headers
+    without calling the ASGI application. Responses are cached for `ttl` seconds unless their
+    Cache-Control header says otherwise, and responses marked `no-store`, `no-cache` or `private`
+    aren't cached at all. Neither are responses that set cookies or vary on request headers other
+    than the `vary` headers, or responses to requests with an Authorization or Cookie header that
+    aren't marked `public`. Requests with a `no-cache` Cache-Control header skip the cache. Once the
+    cached responses take up more than `max_bytes`, the least recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        max_bytes: int,
+        ttl: float = 1.0,
+        vary: Iterable[str] = (),
+        statuses: Iterable[int] = (200,),
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._vary = tuple(x.lower().encode() for x in vary)
+        self._statuses = set(statuses)
+        self._responses: "OrderedDict[CacheKey, _Response]" = OrderedDict()
+        self._bytes = 0
+        self._hits = registry.counter("jab_response_cache_hits_total", "Responses replayed from the cache")
+        self._misses = registry.counter("jab_response_cache_misses_total", "Responses not found in the cache")
+        self._evictions = 0
+        self._size = registry.gauge("jab_response_cache_bytes", "Bytes of cached responses")
+
+    def stats(self) -> ResponseCacheStats:
+        return ResponseCacheStats(
+            hits=int(self._hits.value),
+            misses=int(self._misses.value),
+            evictions=self._evictions,
+            entries=len(self._responses),
+            bytes=self._bytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def _key(self, scope: Dict[str, Any]) -> CacheKey:
+        headers = scope.get("headers", [])
+        return (
+            scope.get("method", "GET"),
+            scope.get("path", ""),
+            scope.get("query_string", b""),
+            tuple(_header(headers, name) for name in self._vary),
+        )
+
+    def _storable(
+        self, request: Iterable[Tuple[bytes, bytes]], response: Iterable[Tuple[bytes, bytes]], public: bool
+    ) -> bool:
+        """
+        `_storable` reports whether a response may be replayed to other clients.
+        """
+        if _header(response, b"set-cookie") is not None:
+            return False
+
+        if any(x not in self._vary for x in _vary(response)):
+            return False
+
+        return public or all(_header(request, x) is None for x in _CREDENTIALS)
+
+    def _get(self, key: CacheKey, now: float) -> Optional[_Response]:
+        response = self._responses.get(key)
+        if response is None:
+            return None
+
+        if response.expires <= now:
+            self._remove(key)
+            return None
+
+        self._responses.move_to_end(key)
+        return response
+
+    def _put(self, key: CacheKey, response: _Response) -> None:
+        if key in self._responses:
+            self._remove(key)
+
+        self._responses[key] = response
+        self._bytes += response.size
+
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._responses)))
+            self._evictions += 1
+
+        self._size.set(self._bytes)
+
+    def _remove(self, key: CacheKey) -> None:
+        self._bytes -= self._responses.pop(key).size
+        self._size.set(self._bytes)
+
+    def wrap(self, app: App) -> App:
+        """
+        `wrap` returns an ASGI application that answers cacheable requests from the cache and
+        caches the responses of `app` to the others.
+        """
+
+        async def cached(scope: Dict[str, str], receive: Receive, send: Send) -> None:
+            if scope.get("type") != "http" or scope.get("method", "GET") not in _CACHEABLE_METHODS:
+                return await app(scope, receive, send)
+
+            key = self._key(scope)
+            now = time.monotonic()
+            request_headers: Any = scope.get("headers", [])
+            skip = "no-cache" in _directives(_header(request_headers, b"cache-control"))
+
+            response = None if skip else self._get(key, now)
+            if response is not None:
+                self._hits.inc()
+                for msg in response.messages:
+                    await send(dict(msg))
+                return
+
+            self._misses.inc()
+            messages: List[Dict[str, Any]] = []
+            size = 0
+            ttl = 0.0
+
+            async def capture(msg: Dict[str, Any]) -> None:
+                nonlocal size, ttl
+                kind = msg["type"]
+                if kind == "http.response.start" and msg["status"] in self._statuses:
+                    headers = msg.get("headers", [])
+                    directives = _directives(_header(headers, b"cache-control"))
+                    if self._storable(request_headers, headers, "public" in directives):
+                        ttl = _ttl(directives, self.ttl)
+
+                if ttl > 0:
+                    messages.append(dict(msg))
+                    size += len(msg.get("body", b"")) + sum(
+                        len(k) + len(v) for k, v in msg.get("headers", [])
+                    )
+                    if size > self.max_bytes:
+                        # Responses larger than the whole cache are passed on without being cached.
+                        ttl = 0
+                        messages.clear()
+                    elif kind == "http.response.body" and not msg.get("more_body", False):
+                        self._put(key, _Response(messages, size, now + ttl))
+
+                await send(msg)
+
+            await app(scope, receive, capture)
+
+        return cached
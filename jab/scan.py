@@ -0,0 +1,352 @@
+import ast
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from jab.exceptions import NoAnnotation, NoConstructor
+from jab.ref import Ref
+
+T = TypeVar("T")
+
+SCAN_VERSION = 1
+
+# The import paths the `provided` marker can be referenced by.
+_MARKERS = {"jab:provided", "jab.scan:provided"}
+
+# The return annotations of generator and context manager constructors, which provide the type they
+# yield, along with their `typing` aliases.
+_GENERATORS = {
+    "Generator",
+    "AsyncGenerator",
+    "ContextManager",
+    "AsyncContextManager",
+    "AbstractContextManager",
+    "AbstractAsyncContextManager",
+}
+
+# The return annotations that only provide the type they yield for constructors that are generators.
+_ITERATING = {"Iterator", "Iterable", "AsyncIterator", "AsyncIterable"}
+
+
+def provided(constructor: T) -> T:
+    """
+    `provided` marks a class or constructor function to be provided by `scan`. Marking a constructor
+    doesn't change it, and a marked constructor can still be passed to `Harness.provide` directly.
+    """
+    setattr(constructor, "_jab_provided", True)
+    return constructor
+
+
+def isprovided(constructor: Any) -> bool:
+    return getattr(constructor, "_jab_provided", False) is True
+
+
+def scan(package: str, cache: Optional[str] = None) -> List[Ref]:
+    """
+    `scan` discovers the classes and constructor functions marked with `jab.provided` in the modules
+    of a package and its subpackages, and references them with `jab.ref`. Modules are parsed instead
+    of imported, so a module is only imported once the Harness constructs something it provides.
+    What is found in each module is cached on disk, keyed by the path, modification time and size
+    of its file, so only modules that changed since the last scan are parsed again.
+
+    Parameters
+    ----------
+    package : str
+        The import path of the package to scan.
+    cache : Optional[str]
+        The file to cache what was found in. Defaults to a file in the `__pycache__` directory of the
+        package. Failing to write the cache is ignored.
+
+    Returns
+    -------
+    List[Ref]
+        References to the marked constructors, to pass to `Harness.provide`.
+
+    Raises
+    ------
+    NoConstructor
+        If the package can't be found or a module can't be parsed.
+    NoAnnotation
+        If the type returned by a marked function can't be determined from its annotation.
+    """
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        spec = None
+
+    if spec is None:
+        raise NoConstructor(f"Could not find package '{package}' to scan")
+
+    files = list(_files(package, spec))
+    if cache is None and files:
+        cache = os.path.join(os.path.dirname(files[0][1]), "__pycache__", f"jab-scan-{package}.json")
+
+    cached = _load(cache)
+    scanned: Dict[str, Dict[str, Any]] = {}
+    for module, path in files:
+        stat = os.stat(path)
+        record = cached.get(path)
+        if (
+            record is None
+            or record.get("module") != module
+            or record.get("mtime") != stat.st_mtime_ns
+            or record.get("size") != stat.st_size
+        ):
+            record = dict(_parse(module, path), module=module, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+        scanned[path] = record
+
+    if scanned != cached:
+        _store(cache, scanned)
+
+    members: Dict[str, Optional[List[str]]] = {}
+    for record in scanned.values():
+        members.update(record["classes"])
+
+    refs = []
+    for _, path in files:
+        for entry in scanned[path]["entries"]:
+            known = members.get(entry["provides"])
+            refs.append(
+                Ref(
+                    entry["target"],
+                    entry["provides"],
+                    members=frozenset(known) if known is not None else None,
+                )
+            )
+
+    return refs
+
+
+def _files(package: str, spec: Any) -> Iterator[Tuple[str, str]]:
+    """
+    `_files` yields the import path and file of every module of a package, in a stable order.
+    """
+    if not spec.submodule_search_locations:
+        if spec.origin and spec.origin.endswith(".py"):
+            yield package, spec.origin
+        return
+
+    for location in spec.submodule_search_locations:
+        for directory, dirs, names in os.walk(location):
+            dirs[:] = sorted(x for x in dirs if x.isidentifier())
+            parts = os.path.relpath(directory, location).split(os.sep)
+            prefix = ".".join([package] + [x for x in parts if x != "."])
+            for name in sorted(names):
+                stem, ext = os.path.splitext(name)
+                if ext != ".py" or not stem.isidentifier():
+                    continue
+
+                module = prefix if stem == "__init__" else f"{prefix}.{stem}"
+                yield module, os.path.join(directory, name)
+
+
+def _load(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if path is None:
+        return {}
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != SCAN_VERSION:
+        return {}
+
+    files: Dict[str, Dict[str, Any]] = data.get("files", {})
+    return files
+
+
+def _store(path: Optional[str], files: Dict[str, Dict[str, Any]]) -> None:
+    if path is None:
+        return
+
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".jab-scan-", suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": SCAN_VERSION, "files": files}, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _parse(module: str, path: str) -> Dict[str, Any]:
+    """
+    `_parse` finds the marked constructors of a module without importing it. It returns the
+    references to them and the public attribute names of the classes the module defines.
+    """
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        raise NoConstructor(f"Could not parse module '{module}' to scan it ({str(e)})")
+
+    names = _Names(module, os.path.basename(path) == "__init__.py")
+    for node in tree.body:
+        names.add(node)
+
+    entries = []
+    classes: Dict[str, Optional[List[str]]] = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            classes[f"{module}:{node.name}"] = _members(node)
+
+        if not isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        if not any(names.resolve(x) in _MARKERS for x in node.decorator_list):
+            continue
+
+        target = f"{module}:{node.name}"
+        if isinstance(node, ast.ClassDef):
+            entries.append({"target": target, "provides": target})
+            continue
+
+        provides = names.annotation(node.returns, _generates(node))
+        if provides is None:
+            raise NoAnnotation(f"Could not determine the type returned by '{target}' from its annotation")
+
+        entries.append({"target": target, "provides": provides})
+
+    return {"entries": entries, "classes": classes}
+
+
+def _generates(node: ast.AST) -> bool:
+    """
+    `_generates` reports whether a function is a generator, that is whether it yields outside of the
+    functions, lambdas and classes it defines.
+    """
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+
+        if isinstance(child, (ast.Yield, ast.YieldFrom)) or _generates(child):
+            return True
+
+    return False
+
+
+def _members(node: ast.ClassDef) -> Optional[List[str]]:
+    """
+    `_members` returns the public attribute names a class defines, or None if it inherits from
+    other classes and so may have attributes that can't be known without importing them.
+    """
+    if any(not (isinstance(x, ast.Name) and x.id == "object") for x in node.bases):
+        return None
+
+    members: Set[str] = set()
+    for stmt in node.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            members.add(stmt.name)
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            members.add(stmt.target.id)
+        elif isinstance(stmt, ast.Assign):
+            members.update(x.id for x in stmt.targets if isinstance(x, ast.Name))
+
+    return sorted(x for x in members if not x.startswith("_"))
+
+
+class _Names:
+    """
+    `_Names` maps the names bound at the top level of a module to the import paths of what they
+    refer to. Modules are mapped to their dotted path, and everything else to `module:attribute`.
+    """
+
+    def __init__(self, module: str, package: bool) -> None:
+        self.module = module
+        self.package = module if package else module.rpartition(".")[0]
+        self.bound: Dict[str, str] = {}
+        self.modules: Set[str] = set()
+
+    def add(self, node: ast.stmt) -> None:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.bound[node.name] = f"{self.module}:{node.name}"
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                parts = alias.name.split(".")
+                self.modules.update(".".join(parts[: i + 1]) for i in range(len(parts)))
+                if alias.asname:
+                    self.bound[alias.asname] = alias.name
+                else:
+                    self.bound[parts[0]] = parts[0]
+        elif isinstance(node, ast.ImportFrom):
+            source = node.module or ""
+            if node.level:
+                base = self.package.split(".")
+                base = base[: len(base) - (node.level - 1)]
+                source = ".".join(x for x in base + [source] if x)
+
+            for alias in node.names:
+                if alias.name != "*":
+                    self.bound[alias.asname or alias.name] = f"{source}:{alias.name}"
+
+    def resolve(self, node: Optional[ast.expr]) -> Optional[str]:
+        """
+        `resolve` returns the import path of the object an expression refers to, if it can be
+        determined from the names bound in the module.
+        """
+        if isinstance(node, ast.Name):
+            return self.bound.get(node.id)
+
+        if isinstance(node, ast.Attribute):
+            base = self.resolve(node.value)
+            if base is None:
+                return None
+
+            if ":" in base:
+                return f"{base}.{node.attr}"
+
+            dotted = f"{base}.{node.attr}"
+            return dotted if dotted in self.modules else f"{base}:{node.attr}"
+
+        return None
+
+    def annotation(self, node: Optional[ast.expr], generator: bool = False) -> Optional[str]:
+        """
+        `annotation` returns the import path of the type a constructor annotated with `node` provides.
+        String annotations are parsed, and generators and context managers provide the type they yield.
+        """
+        text = _string(node)
+        if text is not None:
+            try:
+                node = ast.parse(text, mode="eval").body
+            except SyntaxError:
+                return None
+
+        if isinstance(node, ast.Subscript):
+            base = self.resolve(node.value)
+            kind = base.rpartition(":")[2].rsplit(".", 1)[-1] if base is not None else None
+            if kind not in _GENERATORS and not (generator and kind in _ITERATING):
+                return None
+
+            inner: Any = node.slice
+            if sys.version_info < (3, 9):
+                inner = inner.value
+
+            return self.annotation(inner.elts[0] if isinstance(inner, ast.Tuple) else inner)
+
+        path = self.resolve(node)
+        return path if path is not None and ":" in path else None
+
+
+def _string(node: Optional[ast.expr]) -> Optional[str]:
+    if sys.version_info < (3, 8):
+        return node.s if isinstance(node, ast.Str) else None
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+
+    return None
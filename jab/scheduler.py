@@ -0,0 +1,272 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from dataclasses import dataclass
+
+from jab.logging import Logger
+from jab.metrics import Registry
+
+Job = Callable[[], Union[Awaitable[None], None]]
+
+
+@dataclass
+class JobStats:
+    name: str
+    runs: int = 0
+    failures: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_duration: float = 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0.0
+
+
+class Cron:
+    """
+    `Cron` is a five field cron expression: minute, hour, day of month, month and day of week, with
+    Sunday being day 0. Fields are `*`, numbers, ranges `a-b`, steps `*/n` or `a-b/n` and lists of
+    them separated by commas. As in cron, a day matches if either the day of month or the day of
+    week matches, unless one of them is `*`.
+    """
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have five fields")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self._RANGES)
+        )
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            if span == "*":
+                start, stop = low, high
+            elif "-" in span:
+                first, last = span.split("-")
+                start, stop = int(first), int(last)
+            else:
+                start = stop = int(span)
+                if step:
+                    stop = high
+
+            if start < low or stop > high or start > stop:
+                raise ValueError(f"Cron field '{field}' is out of range {low}-{high}")
+
+            values.update(range(start, stop + 1, int(step) if step else 1))
+
+        return values
+
+    def _day_matches(self, t: datetime) -> bool:
+        day = t.day in self.days
+        weekday = (t.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+
+        return day or weekday
+
+    def next(self, after: datetime) -> datetime:
+        """
+        `next` returns the first time after `after` that matches the expression.
+        """
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+class Scheduler:
+    """
+    `Scheduler` runs periodic jobs and background tasks for provided objects, which can depend on
+    `jab.Scheduler` and register their jobs in their `on_start` methods. Jobs start running once the
+    Harness runs its `run` methods, or completes its ASGI lifespan startup, and never overlap with
+    themselves: a job that takes longer than its interval skips the runs it missed. Background tasks
+    are run by a bounded number of workers from a bounded queue, so submitting tasks waits while the
+    queue is full. When the Harness stops, the jobs are cancelled and the queued background tasks
+    are completed before any `on_stop` method is called.
+    """
+
+    def __init__(
+        self, logger: Logger, registry: Registry, concurrency: int = 8, queue_size: int = 1024
+    ) -> None:
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._logger = logger
+        self._registry = registry
+        self._jobs: Dict[str, Callable[[JobStats], Awaitable[None]]] = {}
+        self._stats: Dict[str, JobStats] = {}
+        self._tasks: List["asyncio.Future[None]"] = []
+        self._running = False
+        self._queue: Optional["asyncio.Queue[Callable[[], Awaitable[Any]]]"] = None
+        self._workers: List["asyncio.Future[None]"] = []
+
+    def every(self, interval: float, job: Job, jitter: float = 0.0, name: Optional[str] = None) -> None:
+        """
+        `every` runs `job` every `interval` seconds, delayed by up to `jitter` random seconds each time
+        so that jobs of many processes don't run in lockstep. Runs are scheduled relative to when the
+        job started rather than when the last run completed, so they don't drift.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between runs.
+        job : Callable
+            A sync or async function without parameters.
+        jitter : float
+            Maximum random delay of each run in seconds.
+        name : Optional[str]
+            The name statistics are reported under. Defaults to the job's qualified name.
+        """
+
+        async def loop(stats: JobStats) -> None:
+            start = time.monotonic()
+            ticks = 0
+            while True:
+                ticks = max(ticks + 1, int((time.monotonic() - start) // interval) + 1)
+                await asyncio.sleep(start + ticks * interval - time.monotonic() + random.uniform(0, jitter))
+                await self._execute(job, stats)
+
+        self._add(name or job.__qualname__, loop)
+
+    def cron(self, expression: str, job: Job, jitter: float = 0.0, name: Optional[str] = None) -> None:
+        """
+        `cron` runs `job` at the local times matching a five field cron expression like `*/5 * * * *`,
+        delayed by up to `jitter` random seconds each time. See `Cron` and `every`.
+
+        Raises
+        ------
+        ValueError
+            If the expression is invalid.
+        """
+        schedule = Cron(expression)
+
+        async def loop(stats: JobStats) -> None:
+            while True:
+                now = datetime.now()
+                delay = (schedule.next(now) - now).total_seconds()
+                await asyncio.sleep(delay + random.uniform(0, jitter))
+                await self._execute(job, stats)
+
+        self._add(name or job.__qualname__, loop)
+
+    async def submit(self, task: Callable[[], Awaitable[Any]]) -> None:
+        """
+        `submit` queues a background task, waiting while the queue is full.
+
+        Parameters
+        ----------
+        task : Callable[[], Awaitable]
+            An async function without parameters.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.queue_size)
+            self._workers = [asyncio.ensure_future(self._work(self._queue)) for _ in range(self.concurrency)]
+
+        await self._queue.put(task)
+
+    def stats(self) -> Dict[str, JobStats]:
+        """
+        `stats` returns the run-time statistics of the jobs by name.
+        """
+        return dict(self._stats)
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _add(self, name: str, loop: Callable[[JobStats], Awaitable[None]]) -> None:
+        if name in self._stats:
+            raise ValueError(f"A job named {name} is already scheduled")
+
+        self._stats[name] = stats = JobStats(name=name)
+        self._jobs[name] = loop
+        if self._running:
+            self._tasks.append(asyncio.ensure_future(loop(stats)))
+
+    async def _execute(self, job: Job, stats: JobStats) -> None:
+        start = time.perf_counter()
+        try:
+            result = job()
+            if isawaitable(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.failures += 1
+            self._logger.error(f"Scheduled job {stats.name} failed ({str(e)})")
+        finally:
+            duration = time.perf_counter() - start
+            stats.runs += 1
+            stats.total_duration += duration
+            stats.last_duration = duration
+            stats.max_duration = max(stats.max_duration, duration)
+            self._registry.histogram(
+                "jab_job_seconds", "Run time of scheduled jobs", {"job": stats.name}
+            ).observe(duration)
+
+    async def _work(self, queue: "asyncio.Queue[Callable[[], Awaitable[Any]]]") -> None:
+        while True:
+            task = await queue.get()
+            try:
+                await task()
+            except Exception as e:
+                self._logger.error(f"Background task {getattr(task, '__qualname__', task)} failed ({str(e)})")
+            finally:
+                queue.task_done()
+
+    async def run(self) -> None:
+        """
+        `run` starts the scheduled jobs and waits for them. It returns right away if no jobs are
+        scheduled. Jobs scheduled later start right away.
+        """
+        self._running = True
+        self._tasks.extend(
+            asyncio.ensure_future(loop(self._stats[name])) for name, loop in self._jobs.items()
+        )
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def stop(self) -> None:
+        """
+        `stop` cancels the jobs and waits for them to stop, then waits for the queued background tasks
+        to complete and stops the workers.
+        """
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._queue is not None:
+            await self._queue.join()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
@@ -1,5 +1,5 @@
-from inspect import isfunction
-from typing import Type, Optional, get_type_hints, Callable, Any, Union
+from inspect import isclass, isfunction
+from typing import Set, Type, Optional, get_type_hints, Callable, Any, Union
 
 from typing_extensions import Protocol, _get_protocol_attrs  # type: ignore
 
@@ -54,6 +54,13 @@ def isimplementation(cls_: Optional[Type[Any]], proto: Type[Any]) -> bool:
     return True
 
 
+def protocol_attrs(proto: Type[Any]) -> Set[str]:
+    """
+    `protocol_attrs` returns the names of the attributes a class must have to implement a Protocol.
+    """
+    return set(_get_protocol_attrs(proto))
+
+
 def func_satisfies(impl: Callable[..., Any], proto: Callable[..., Any]) -> bool:
     proto_signature = get_type_hints(proto)
 
@@ -62,7 +69,8 @@ def func_satisfies(impl: Callable[..., Any], proto: Callable[..., Any]) -> bool:
     except AttributeError:
         return False
 
-    if issubclass(proto_signature.get("return"), Protocol):  # type: ignore
+    proto_return_hint = proto_signature.get("return")
+    if isclass(proto_return_hint) and issubclass(proto_return_hint, Protocol):
         proto_return: Type[Any] = proto_signature["return"]
         cls_return: Optional[Type[Any]] = impl_signature.get("return")
         if isimplementation(cls_return, proto_return):
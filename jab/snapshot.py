@@ -0,0 +1,153 @@
+import mmap
+import os
+import re
+import struct
+import tempfile
+import zlib
+from inspect import isawaitable
+from typing import Any, List, Optional
+
+from jab.logging import Logger
+
+MAGIC = b"JABS"
+FORMAT_VERSION = 1
+
+# Magic, format version, snapshot version of the provided object, crc32 and length of the payload.
+_HEADER = struct.Struct("<4sHIIQ")
+
+
+class SnapshotStore:
+    """
+    `SnapshotStore` keeps the snapshots of provided objects in a directory, one file per object.
+    Each file starts with a header recording the snapshot format, the `snapshot_version` of the
+    object that wrote it and the length and crc32 of the payload. Snapshots are written to a
+    temporary file that replaces the previous snapshot atomically, and are read back by mapping
+    them into memory, so objects are restored from a view of the mapped file without copying it.
+    Snapshots that are truncated, corrupt or written by a different version are deleted.
+    """
+
+    def __init__(self, directory: str, logger: Logger) -> None:
+        self.directory = directory
+        self._logger = logger
+        self._maps: List[mmap.mmap] = []
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", name) + ".snapshot")
+
+    def read(self, name: str, version: int) -> Optional[memoryview]:
+        """
+        `read` returns a read-only view of the payload of the snapshot of `name`, or None if there is
+        no valid snapshot written by the same `version`. The view stays valid until `close`.
+        """
+        path = self.path(name)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+        except ValueError:
+            self._logger.warning(f"Discarding the snapshot of {name} (empty)")
+            self._discard(path)
+            return None
+
+        reason = None
+        if len(mapped) < _HEADER.size:
+            reason = "truncated"
+        else:
+            magic, fmt, written, crc, length = _HEADER.unpack_from(mapped)
+            start = _HEADER.size
+            if magic != MAGIC or fmt != FORMAT_VERSION or len(mapped) - start != length:
+                reason = "corrupt"
+            elif written != version:
+                reason = f"written by version {written}"
+            else:
+                payload = memoryview(mapped)[start:]
+                if zlib.crc32(payload) == crc:
+                    self._maps.append(mapped)
+                    return payload
+
+                payload.release()
+                reason = "corrupt"
+
+        mapped.close()
+        self._logger.warning(f"Discarding the snapshot of {name} ({reason})")
+        self._discard(path)
+        return None
+
+    def write(self, name: str, version: int, data: Any) -> None:
+        """
+        `write` atomically replaces the snapshot of `name` with `data`, a bytes-like object.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        payload = memoryview(data).cast("B")
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, version, zlib.crc32(payload), len(payload))
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".jab-snapshot-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path(name))
+        except BaseException:
+            self._discard(tmp)
+            raise
+
+    async def restore(self, name: str, obj: Any) -> None:
+        """
+        `restore` passes the snapshot of `name` to the `restore` method of `obj`, if it has both. A
+        snapshot that the object fails to restore from is logged and deleted.
+        """
+        restore = getattr(obj, "restore", None)
+        if restore is None:
+            return
+
+        buffer = self.read(name, getattr(obj, "snapshot_version", 0))
+        if buffer is None:
+            return
+
+        try:
+            result = restore(buffer)
+            if isawaitable(result):
+                await result
+        except Exception as e:
+            self._logger.error(
+                f"Encountered an unexpected error restoring {name} from its snapshot ({str(e)})"
+            )
+            self._discard(self.path(name))
+            return
+
+        self._logger.debug(f"Restored {name} from its snapshot")
+
+    async def save(self, name: str, obj: Any) -> None:
+        """
+        `save` writes the data returned by the `snapshot` method of `obj` as the snapshot of `name`.
+        Nothing is written if `snapshot` returns None.
+        """
+        data = obj.snapshot()
+        if isawaitable(data):
+            data = await data
+
+        if data is not None:
+            self.write(name, getattr(obj, "snapshot_version", 0), data)
+            self._logger.debug(f"Wrote the snapshot of {name}")
+
+    def close(self) -> None:
+        """
+        `close` unmaps the snapshots that were read. Snapshots that are still referenced by views are
+        left to be unmapped by the garbage collector.
+        """
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+
+        self._maps = []
+
+    def _discard(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
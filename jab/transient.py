@@ -0,0 +1,19 @@
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def transient(constructor: T) -> T:
+    """
+    `transient` marks a constructor whose object is only needed while the Harness starts, like a
+    large bootstrap configuration or a migration runner. Once everything that depends on a transient
+    object has been constructed and every `on_start` method that uses it has completed, the Harness
+    tears the object down, calling its `on_stop` method early, and drops its reference to it.
+    Objects held through a lazy handle are never released.
+    """
+    setattr(constructor, "_jab_transient", True)
+    return constructor
+
+
+def istransient(constructor: Any) -> bool:
+    return getattr(constructor, "_jab_transient", False) is True
@@ -0,0 +1,125 @@
+import asyncio
+import heapq
+from typing import Any, Dict, List
+
+import jab
+from jab.admission import AdmissionControl
+
+
+class Slow:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.handled: List[str] = []
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        await self.release.wait()
+        self.handled.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def urgent_first(scope: Dict[str, Any]) -> int:
+    return 0 if scope["path"].startswith("/urgent") else 1
+
+
+def test_admission_control() -> None:
+    h = (
+        jab.Harness()
+        .provide(Slow)
+        .admit(max_in_flight=1, max_queue=2, queue_timeout=5, priority=urgent_first)
+    )
+    statuses: Dict[str, int] = {}
+
+    async def request(path: str) -> None:
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            if msg["type"] == "http.response.start":
+                statuses[path] = msg["status"]
+
+        await h.asgi({"type": "http", "path": path})(receive, send)
+
+    async def scenario() -> None:
+        async with h:
+            slow = h._env["Slow"]
+            requests = []
+            for path in ["/first", "/second", "/third", "/urgent", "/fourth"]:
+                requests.append(asyncio.ensure_future(request(path)))
+                await asyncio.sleep(0)
+
+            # /first is in flight, /urgent displaced /third from the full queue and /fourth was rejected.
+            await asyncio.sleep(0.01)
+            assert statuses == {"/third": 503, "/fourth": 503}
+            stats = h.admission_stats()
+            assert stats is not None
+            assert (stats.in_flight, stats.queued, stats.rejected) == (1, 2, 2)
+
+            slow.release.set()
+            await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+            assert slow.handled == ["/first", "/urgent", "/second"]
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    stats = h.admission_stats()
+    assert stats is not None
+    assert (stats.in_flight, stats.queued, stats.admitted, stats.rejected) == (0, 0, 3, 2)
+    assert h.metrics().counter("jab_admission_rejected_total").value == 2
+
+
+def test_admission_timeout() -> None:
+    h = jab.Harness().provide(Slow).admit(max_in_flight=1, max_queue=1, queue_timeout=0.01)
+    statuses: List[int] = []
+
+    async def request() -> None:
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            if msg["type"] == "http.response.start":
+                statuses.append(msg["status"])
+
+        await h.asgi({"type": "http", "path": "/"})(receive, send)
+
+    async def scenario() -> None:
+        async with h:
+            first = asyncio.ensure_future(request())
+            await asyncio.sleep(0)
+            await asyncio.wait_for(request(), timeout=5)
+            assert statuses == [503]
+
+            h._env["Slow"].release.set()
+            await first
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    stats = h.admission_stats()
+    assert stats is not None
+    assert (stats.timed_out, stats.queued, stats.in_flight) == (1, 0, 0)
+
+
+def test_admission_cancelled_waiters() -> None:
+    control = AdmissionControl(jab.Registry(), max_in_flight=1, max_queue=1, queue_timeout=5)
+
+    async def scenario() -> None:
+        assert await control._acquire(1)
+
+        # A waiter that timed out but hasn't dequeued itself yet can't be displaced.
+        cancelled: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        cancelled.cancel()
+        heapq.heappush(control._queue, (1, -1, cancelled))
+        urgent = asyncio.ensure_future(control._acquire(0))
+        await asyncio.sleep(0)
+        control._release()
+        assert await urgent
+        control._dequeue((1, -1, cancelled))
+
+        # A request cancelled right after it was handed a slot gives the slot back.
+        queued = asyncio.ensure_future(control._acquire(1))
+        await asyncio.sleep(0)
+        control._release()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert control.stats().in_flight == (0 if queued.cancelled() else 1)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
@@ -0,0 +1,190 @@
+import asyncio
+from typing import Any, Dict, List
+
+import jab
+
+
+class Lifespan:
+    def __init__(self) -> None:
+        self.incoming: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self.sent: List[Dict[str, Any]] = []
+        self.changed = asyncio.Event()
+
+    async def receive(self) -> Dict[str, Any]:
+        return await self.incoming.get()
+
+    async def send(self, msg: Dict[str, Any]) -> None:
+        self.sent.append(msg)
+        self.changed.set()
+
+    async def expect(self, type_: str) -> None:
+        while not any(msg["type"] == type_ for msg in self.sent):
+            self.changed.clear()
+            await asyncio.wait_for(self.changed.wait(), timeout=5)
+
+
+class Gate:
+    def __init__(self) -> None:
+        self.open = asyncio.Event()
+
+
+@jab.deferred
+class SlowCache:
+    def __init__(self, gate: Gate) -> None:
+        self.gate = gate
+        self.warm = False
+
+    @jab.deferred
+    async def on_start(self) -> None:
+        await self.gate.open.wait()
+        self.warm = True
+
+
+class Config:
+    def __init__(self) -> None:
+        self.started = False
+
+    def on_start(self) -> None:
+        self.started = True
+
+
+class App:
+    def __init__(self, config: Config, readiness: jab.Readiness) -> None:
+        self.config = config
+        self.readiness = readiness
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        status = 200 if self.readiness.ready(SlowCache) else 503
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def request(harness: jab.Harness) -> int:
+    sent: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(msg: Dict[str, Any]) -> None:
+        sent.append(msg)
+
+    await harness.asgi({"type": "http", "path": "/"})(receive, send)
+    return sent[0]["status"]
+
+
+def test_progressive_startup() -> None:
+    harness = jab.Harness().provide(App, Config, SlowCache, Gate)
+
+    async def scenario() -> None:
+        lifespan = Lifespan()
+        task = asyncio.ensure_future(harness.asgi({"type": "lifespan"})(lifespan.receive, lifespan.send))
+
+        await lifespan.incoming.put({"type": "lifespan.startup"})
+        await lifespan.expect("lifespan.startup.complete")
+
+        assert harness._env["Config"].started
+        assert await request(harness) == 503
+        assert harness._readiness.pending() == ["SlowCache"]
+
+        harness._env["Gate"].open.set()
+        await harness._readiness.wait(SlowCache)
+        assert harness._env["SlowCache"].warm
+        assert harness._readiness.complete
+        assert await request(harness) == 200
+
+        await lifespan.incoming.put({"type": "lifespan.shutdown"})
+        await lifespan.expect("lifespan.shutdown.complete")
+        await task
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+
+def test_deferred_shutdown() -> None:
+    harness = jab.Harness().provide(App, Config, SlowCache, Gate)
+
+    async def scenario() -> None:
+        lifespan = Lifespan()
+        task = asyncio.ensure_future(harness.asgi({"type": "lifespan"})(lifespan.receive, lifespan.send))
+
+        await lifespan.incoming.put({"type": "lifespan.startup"})
+        await lifespan.expect("lifespan.startup.complete")
+
+        await lifespan.incoming.put({"type": "lifespan.shutdown"})
+        await lifespan.expect("lifespan.shutdown.complete")
+        await task
+
+        assert not harness._env["SlowCache"].warm
+        assert harness._deferred is not None
+        assert harness._deferred.cancelled()
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+
+class Trail:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+
+class RequestID:
+    def __init__(self, trail: Trail) -> None:
+        self.trail = trail
+
+    def middleware(self, app: jab.App) -> jab.App:
+        async def request_id(scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+            self.trail.calls.append("RequestID")
+
+            async def send_with_id(msg: Dict[str, Any]) -> None:
+                if msg["type"] == "http.response.start":
+                    msg["headers"] = msg["headers"] + [(b"x-request-id", b"1")]
+                await send(msg)
+
+            await app(scope, receive, send_with_id)
+
+        return request_id
+
+
+class Timing:
+    def __init__(self, trail: Trail, ids: RequestID) -> None:
+        self.trail = trail
+
+    def middleware(self, app: jab.App) -> jab.App:
+        async def timing(scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+            self.trail.calls.append("Timing")
+            await app(scope, receive, send)
+
+        return timing
+
+
+class Plain:
+    def __init__(self, trail: Trail) -> None:
+        self.trail = trail
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        self.trail.calls.append("Plain")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def test_middleware_chain() -> None:
+    harness = jab.Harness().provide(Timing, Plain, Trail, RequestID)
+
+    async def scenario() -> None:
+        lifespan = Lifespan()
+        task = asyncio.ensure_future(harness.asgi({"type": "lifespan"})(lifespan.receive, lifespan.send))
+        await lifespan.incoming.put({"type": "lifespan.startup"})
+        await lifespan.expect("lifespan.startup.complete")
+
+        sent: List[Dict[str, Any]] = []
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        await harness.asgi({"type": "http", "path": "/"})(lifespan.receive, send)
+
+        assert harness._env["Trail"].calls == ["RequestID", "Timing", "Plain"]
+        assert sent[0]["headers"] == [(b"x-request-id", b"1")]
+
+        await lifespan.incoming.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
@@ -0,0 +1,92 @@
+import re
+from contextlib import contextmanager
+from typing import ContextManager, Iterator
+
+import pytest
+
+import jab
+from jab.cache import SharedCache
+
+
+@jab.shared
+class Schema:
+    built = 0
+
+    def __init__(self) -> None:
+        Schema.built += 1
+        self.fields = ("name", "email")
+
+
+@jab.shared
+def ProvidePattern(s: Schema) -> re.Pattern[str]:
+    return re.compile("|".join(s.fields))
+
+
+class UsesPattern:
+    def __init__(self, p: re.Pattern[str]) -> None:
+        self.p = p
+
+
+def test_shared_across_harnesses() -> None:
+    jab.shared_cache.clear()
+    Schema.built = 0
+
+    first = jab.Harness().provide(Schema, ProvidePattern, UsesPattern)
+    first.build()
+    second = jab.Harness().provide(Schema, ProvidePattern, UsesPattern)
+    second.build()
+
+    assert Schema.built == 1
+    assert first._env["Pattern"] is second._env["Pattern"]
+    assert first._env["UsesPattern"] is not second._env["UsesPattern"]
+
+    record = second.inspect(ProvidePattern)
+    assert record.shared is not None
+    assert record.shared.hits == 1
+    assert record.shared.misses == 1
+    assert record.shared.references == 2
+    assert second.inspect(UsesPattern).shared is None
+
+    first._loop.run_until_complete(first._on_stop())
+    second._loop.run_until_complete(second._on_stop())
+    stats = second.inspect(ProvidePattern).shared
+    assert stats is not None
+    assert stats.references == 0
+
+
+def test_lru_eviction() -> None:
+    cache = SharedCache(maxsize=2)
+    keys = [SharedCache.key(object, {"n": n}) for n in range(3)]
+
+    for n, key in enumerate(keys):
+        assert cache.acquire(key) is None
+        cache.insert(key, n, {})
+
+    # Every instance is still referenced, so nothing can be evicted.
+    assert cache.stats().size == 3
+
+    cache.release(keys[1])
+    assert cache.stats().size == 2
+    assert cache.acquire(keys[1]) is None
+    assert cache.acquire(keys[0]) == 0
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 4, 1)
+
+
+def test_shared_generator() -> None:
+    def gen() -> Iterator[Schema]:
+        yield Schema()
+
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        jab.shared(gen)
+
+    @contextmanager
+    def managed() -> Iterator[Schema]:
+        yield Schema()
+
+    def ProvideManaged() -> ContextManager[Schema]:
+        return managed()
+
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        jab.shared(ProvideManaged)
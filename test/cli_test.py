@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+from jab.cli import check
+
+WIRING = """
+import jab
+from typing_extensions import Protocol
+
+
+class Named(Protocol):
+    def name(self) -> str:
+        pass
+
+
+class Constructed(Exception):
+    pass
+
+
+class Explodes:
+    def __init__(self) -> None:
+        raise Constructed
+
+    def name(self) -> str:
+        return "explodes"
+
+
+class NeedsName:
+    def __init__(self, n: Named) -> None:
+        raise Constructed
+
+    async def on_start(self, e: Explodes) -> None:
+        raise Constructed
+
+
+class Orphan:
+    def __init__(self, n: Named) -> None:
+        pass
+
+
+class Starts:
+    def __init__(self) -> None:
+        pass
+
+    def on_start(self, n: Named) -> None:
+        pass
+
+
+harness = jab.Harness().provide(Explodes, NeedsName)
+missing = jab.Harness().provide(Orphan)
+missing_on_start = jab.Harness().provide(Starts)
+"""
+
+
+@pytest.fixture()
+def wiring(tmp_path, monkeypatch):
+    (tmp_path / "cli_wiring.py").write_text(WIRING)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return "cli_wiring"
+
+
+def test_check_ok(wiring):
+    out, err = io.StringIO(), io.StringIO()
+
+    assert check(f"{wiring}:harness", out, err) == 0
+    assert "providers:      2" in out.getvalue()
+    assert "edges:          1" in out.getvalue()
+    assert "on_start hooks: 1" in out.getvalue()
+
+    assert check(f"{wiring}:harness.asgi", out, err) == 0
+
+
+def test_check_wiring_errors(wiring):
+    err = io.StringIO()
+
+    assert check(f"{wiring}:missing", io.StringIO(), err) == 1
+    assert "MissingDependency" in err.getvalue()
+
+    assert check(f"{wiring}:missing_on_start", io.StringIO(), err) == 1
+
+
+def test_check_bad_target(wiring):
+    assert check(f"{wiring}:nothing", io.StringIO(), io.StringIO()) == 2
+    assert check(f"{wiring}:Explodes", io.StringIO(), io.StringIO()) == 2
+    assert check("not_a_module_at_all:harness", io.StringIO(), io.StringIO()) == 2
+    assert check("cli_wiring", io.StringIO(), io.StringIO()) == 2
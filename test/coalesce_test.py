@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any, Dict, List
+
+import jab
+
+
+class Expensive:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        self.calls += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": scope["path"].encode()})
+
+
+def test_request_coalescing() -> None:
+    h = jab.Harness().provide(Expensive).coalesce_requests(timeout=5)
+    responses: List[List[Dict[str, Any]]] = []
+
+    async def request(path: str, method: str = "GET") -> None:
+        sent: List[Dict[str, Any]] = []
+        responses.append(sent)
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        await h.asgi({"type": "http", "method": method, "path": path})(receive, send)
+
+    async def scenario() -> None:
+        async with h:
+            expensive = h._env["Expensive"]
+            requests = [asyncio.ensure_future(request("/popular")) for _ in range(10)]
+            requests.append(asyncio.ensure_future(request("/other")))
+            requests.append(asyncio.ensure_future(request("/popular", method="POST")))
+            await asyncio.sleep(0.01)
+
+            stats = h.coalescing_stats()
+            assert stats is not None
+            assert stats.in_flight == 2
+            assert expensive.calls == 3
+
+            expensive.release.set()
+            await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    assert all(r == responses[0] for r in responses[:10])
+    assert responses[0][1]["body"] == b"/popular"
+    assert responses[0][0] is not responses[1][0]
+
+    stats = h.coalescing_stats()
+    assert stats is not None
+    assert (stats.executions, stats.coalesced, stats.fallbacks, stats.in_flight) == (2, 9, 0, 0)
+
+
+def test_coalescing_timeout() -> None:
+    h = jab.Harness().provide(Expensive).coalesce_requests(timeout=0.01)
+
+    async def request() -> None:
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            pass
+
+        await h.asgi({"type": "http", "method": "GET", "path": "/"})(receive, send)
+
+    async def scenario() -> None:
+        async with h:
+            requests = [asyncio.ensure_future(request()) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert h._env["Expensive"].calls == 2
+
+            h._env["Expensive"].release.set()
+            await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    stats = h.coalescing_stats()
+    assert stats is not None
+    assert (stats.executions, stats.fallbacks) == (1, 1)
+
+
+def test_coalescing_credentials() -> None:
+    h = jab.Harness().provide(Expensive).coalesce_requests(timeout=5)
+    responses: Dict[bytes, List[Dict[str, Any]]] = {}
+
+    async def request(token: bytes) -> None:
+        sent: List[Dict[str, Any]] = []
+        responses[token] = sent
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        scope = {"type": "http", "method": "GET", "path": "/me", "headers": [(b"authorization", token)]}
+        await h.asgi(scope)(receive, send)
+
+    async def scenario() -> None:
+        async with h:
+            requests = [asyncio.ensure_future(request(x)) for x in (b"Bearer a", b"Bearer b")]
+            await asyncio.sleep(0.01)
+            assert h._env["Expensive"].calls == 2
+
+            h._env["Expensive"].release.set()
+            await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    assert responses[b"Bearer a"][0] is not responses[b"Bearer b"][0]
+    stats = h.coalescing_stats()
+    assert stats is not None
+    assert (stats.executions, stats.coalesced) == (0, 0)
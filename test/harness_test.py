@@ -1,7 +1,8 @@
 import asyncio
 from collections import Counter
+from contextlib import contextmanager
 from inspect import isfunction
-from typing import get_type_hints
+from typing import AsyncIterator, Iterable, Iterator, List, get_type_hints
 
 import pytest
 import toposort
@@ -257,3 +258,328 @@ def test_inspect() -> None:
             hints = get_type_hints(x.constructor.__init__)
 
         assert len([x for x in hints.keys() if x != "return"]) == len(x.dependencies)
+
+
+class Resource:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+
+
+class UsesResource:
+    def __init__(self, r: Resource) -> None:
+        self.r = r
+
+    def on_stop(self) -> None:
+        self.r.events.append("UsesResource.on_stop")
+
+
+def ProvideResource() -> Iterator[Resource]:
+    r = Resource()
+    r.events.append("setup")
+    yield r
+    r.events.append("teardown")
+
+
+class Connection:
+    def __init__(self, r: Resource) -> None:
+        self.r = r
+
+    async def on_stop(self) -> None:
+        self.r.events.append("Connection.on_stop")
+
+
+async def ProvideConnection(r: Resource) -> AsyncIterator[Connection]:
+    yield Connection(r)
+    await asyncio.sleep(0)
+    r.events.append("Connection.teardown")
+
+
+@contextmanager
+def ProvideCounterContext() -> Iterator[Counter]:
+    c: Counter = Counter()
+    yield c
+    c["closed"] += 1
+
+
+def test_generator_constructors() -> None:
+    h = jab.Harness().provide(ProvideResource, UsesResource, ProvideConnection)
+    h.build()
+
+    r = h._env["Resource"]
+    assert h._env["UsesResource"].r is r
+    assert isinstance(h._env["Connection"], Connection)
+    assert r.events == ["setup"]
+
+    h._loop.run_until_complete(h._on_stop())
+
+    assert r.events[-1] == "teardown"
+    assert set(r.events[1:-1]) == {"UsesResource.on_stop", "Connection.on_stop", "Connection.teardown"}
+    assert r.events.index("Connection.on_stop") < r.events.index("Connection.teardown")
+    assert not h._teardowns
+
+
+def test_iterable_constructor() -> None:
+    def ProvideRoutes() -> Iterable[Resource]:
+        return [Resource(), Resource()]
+
+    h = jab.Harness().provide(ProvideRoutes)
+    h.build()
+
+    (routes,) = h._env.values()
+    assert isinstance(routes, list) and len(routes) == 2
+
+
+def test_context_manager_constructor() -> None:
+    h = jab.Harness().provide(ProvideCounterContext, NeedsCounter)
+    h.build()
+
+    c = h._env["Counter"]
+    assert h._env["NeedsCounter"].c is c
+    assert c["closed"] == 0
+
+    h._loop.run_until_complete(h._on_stop())
+    assert c["closed"] == 1
+
+
+def test_resolve_constructs_nothing() -> None:
+    h = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber, ArgedOnStart)
+    resolution = h.resolve()
+
+    assert h._env == {}
+    assert resolution.providers == 4
+    assert resolution.edges == 2
+    assert resolution.depth == 3
+    assert resolution.on_start_hooks == 2
+    assert resolution.exec_order.index("ClassBasic") < resolution.exec_order.index("ClassNew")
+
+    with pytest.raises(toposort.CircularDependencyError):
+        jab.Harness().provide(CircleOne, CircleTwo).resolve()
+
+
+class Store(Protocol):
+    def get(self, key: str) -> str:
+        pass  # pragma: no cover
+
+
+class Redis:
+    def __init__(self) -> None:
+        self.started: List[int] = []
+
+    def get(self, key: str) -> str:
+        return key
+
+    async def on_start(self, n: NumberProvider) -> None:
+        self.started.append(n.provide_number())
+
+
+def ProvideStore() -> Store:
+    return Redis()
+
+
+def test_protocol_constructor_on_start() -> None:
+    h = jab.Harness().provide(ProvideStore, ConcreteNumber)
+    assert h.resolve().on_start_hooks == 0
+
+    h.build()
+    h._loop.run_until_complete(h._on_start())
+    assert h._env["Store"].started == [5]
+
+    child = h.freeze().derive()
+    child.build()
+    child._loop.run_until_complete(child._on_start())
+    assert child._env["Store"].started == [5]
+
+
+class FakeNumber:
+    def __init__(self) -> None:
+        pass
+
+    def provide_number(self) -> int:
+        return 7
+
+
+class NotANumber:
+    def __init__(self) -> None:
+        pass
+
+
+def double_number(n: NumberProvider, c: Counter) -> NumberProvider:
+    c["decorated"] += 1
+
+    class Doubled:
+        def provide_number(self) -> int:
+            return 2 * n.provide_number()
+
+    return Doubled()
+
+
+def test_derive() -> None:
+    parent = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber).freeze()
+
+    with pytest.raises(jab.Exceptions.FrozenHarness):
+        parent.provide(ProvideCounter)
+
+    child = parent.derive(replace={ConcreteNumber: FakeNumber})
+    child.build()
+    assert child._env["ClassBasic"].get_thing() == "Hello, 7!"
+    assert isinstance(child._env["ConcreteNumber"], FakeNumber)
+
+    assert child._dep_graph["ClassNew"] is parent._dep_graph["ClassNew"]
+    assert child._dep_graph["ClassBasic"] is parent._dep_graph["ClassBasic"]
+
+    parent.build()
+    assert parent._env["ClassBasic"].get_thing() == "Hello, 5!"
+
+    with pytest.raises(jab.Exceptions.MissingDependency):
+        parent.derive(replace={"ConcreteNumber": NotANumber})
+
+    with pytest.raises(jab.Exceptions.UnknownConstructor):
+        parent.derive(replace={FakeNumber: ConcreteNumber})
+
+
+def test_derive_decorate() -> None:
+    parent = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber)
+    with pytest.raises(jab.Exceptions.UnfrozenHarness):
+        parent.derive(ProvideCounter)
+
+    assert not parent._frozen
+    child = parent.freeze().derive(ProvideCounter, decorate=[double_number])
+    child.build()
+
+    assert child._env["ClassBasic"].get_thing() == "Hello, 10!"
+    assert child._env["Counter"]["decorated"] == 1
+    assert child._exec_order.index("Counter") < child._exec_order.index("ConcreteNumber")
+
+    h = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber, ProvideCounter).decorate(double_number)
+    h.build()
+    assert h._env["ClassBasic"].get_thing() == "Hello, 10!"
+
+
+class Closing:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def on_stop(self) -> None:
+        self.closed = True
+
+
+class Audit:
+    def __init__(self) -> None:
+        self.closed: List[str] = []
+
+    async def on_stop(self) -> None:
+        self.closed.append("audit")
+
+
+class Audited:
+    def __init__(self, inner: Closing, audit: Audit) -> None:
+        self.inner = inner
+        self.audit = audit
+
+    async def on_stop(self) -> None:
+        await asyncio.sleep(0.01)
+        self.audit.closed.append("wrapper")
+
+
+def audited(c: Closing, audit: Audit) -> Closing:
+    return Audited(c, audit)  # type: ignore
+
+
+def test_decorated_teardown() -> None:
+    h = jab.Harness().provide(Closing, Audit).decorate(audited)
+    h.build()
+    inner = h._env["Closing"].inner
+    h._loop.run_until_complete(h._on_stop())
+
+    assert h._env["Audit"].closed == ["wrapper", "audit"]
+    assert not inner.closed
+
+
+class Worker:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+
+    async def on_start(self) -> None:
+        self.events.append("on_start")
+
+    async def run(self) -> None:
+        self.events.append("run")
+        await asyncio.Event().wait()
+
+    async def on_stop(self) -> None:
+        self.events.append("on_stop")
+
+
+class FailsToStart:
+    def __init__(self) -> None:
+        pass
+
+    def on_start(self) -> None:
+        raise RuntimeError("unavailable")
+
+
+def test_start_stop_on_running_loop() -> None:
+    async def scenario() -> None:
+        async with jab.Harness().provide(Worker) as h:
+            await asyncio.sleep(0.01)
+            assert h._env["Worker"].events == ["on_start", "run"]
+
+        assert h._env["Worker"].events == ["on_start", "run", "on_stop"]
+        assert not asyncio.get_running_loop().is_closed()
+
+        with pytest.raises(jab.Exceptions.InvalidLifecycleMethod):
+            await jab.Harness().provide(FailsToStart).start()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(scenario())
+    assert not loop.is_closed()
+    loop.close()
+
+
+@jab.transient
+class Bootstrap:
+    def __init__(self) -> None:
+        self.stopped = False
+
+    def on_stop(self) -> None:
+        self.stopped = True
+
+
+class Migrations:
+    def __init__(self) -> None:
+        self.applied = False
+
+    async def on_start(self, bootstrap: Bootstrap) -> None:
+        await asyncio.sleep(0.01)
+        self.applied = True
+
+
+class UsesBootstrap:
+    def __init__(self, bootstrap: Bootstrap) -> None:
+        self.bootstrap = bootstrap
+
+
+class HoldsBootstrap:
+    def __init__(self, bootstrap: jab.Lazy[Bootstrap]) -> None:
+        self.bootstrap = bootstrap
+
+
+def test_transient_release() -> None:
+    h = jab.Harness().provide(Bootstrap, Migrations, UsesBootstrap)
+    h.build()
+    bootstrap = h._env["Bootstrap"]
+    assert not h.inspect(Bootstrap).released
+
+    h._loop.run_until_complete(h._on_start())
+    assert h._env["Migrations"].applied
+    assert bootstrap.stopped
+    assert "Bootstrap" not in h._env
+    assert h.inspect(Bootstrap).released
+    assert h.inspect(Bootstrap).obj is None
+
+    h._loop.run_until_complete(h._on_stop())
+
+    h = jab.Harness().provide(Bootstrap, UsesBootstrap, HoldsBootstrap)
+    h.build()
+    h._loop.run_until_complete(h._on_start())
+    assert not h.inspect(Bootstrap).released
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Dict
+
+import jab
+
+
+class Routes:
+    def __init__(self) -> None:
+        pass
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        if scope["path"] == "/fail":
+            raise RuntimeError("failed")
+
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"hello", "more_body": True})
+        await send({"type": "http.response.body", "body": b"!"})
+
+
+def template(scope: Dict[str, Any]) -> str:
+    return "/users/{id}" if scope["path"].startswith("/users/") else scope["path"]
+
+
+def test_route_instrumentation() -> None:
+    h = jab.Harness().provide(Routes).instrument(route=template, max_routes=2)
+
+    async def scenario() -> None:
+        async with h:
+
+            async def receive() -> Dict[str, Any]:
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(msg: Dict[str, Any]) -> None:
+                pass
+
+            for path in ["/users/1", "/users/2", "/fail", "/health"]:
+                try:
+                    await h.asgi({"type": "http", "path": path})(receive, send)
+                except RuntimeError:
+                    pass
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    metrics = h.metrics()
+
+    users = {"route": "/users/{id}"}
+    assert metrics.histogram("jab_http_request_seconds", labels=users).count == 2
+    assert metrics.histogram("jab_http_ttfb_seconds", labels=users).sum >= 0.02
+    assert metrics.counter("jab_http_response_bytes_total", labels=users).value == 12
+    assert metrics.counter("jab_http_responses_total", labels={**users, "status": "201"}).value == 2
+
+    fail = {"route": "/fail", "status": "500"}
+    assert metrics.counter("jab_http_responses_total", labels=fail).value == 1
+
+    assert h._instrumentation is not None
+    assert h._instrumentation.routes() == ("/users/{id}", "/fail")
+    assert metrics.histogram("jab_http_request_seconds", labels={"route": "other"}).count == 1
@@ -0,0 +1,136 @@
+import asyncio
+from typing import List
+
+import jab
+
+
+class ReportClient:
+    built = 0
+
+    def __init__(self) -> None:
+        ReportClient.built += 1
+
+
+class Report:
+    def __init__(self, client: ReportClient) -> None:
+        self.client = client
+        self.started = False
+
+    def on_start(self) -> None:
+        self.started = True
+
+
+async def ProvideReport(client: ReportClient) -> Report:
+    await asyncio.sleep(0.01)
+    return Report(client)
+
+
+class Admin:
+    def __init__(self, report: jab.Lazy[Report]) -> None:
+        self.report = report
+
+    async def run(self) -> None:
+        reports = await asyncio.gather(*(self.report.get() for _ in range(5)))
+        assert all(r is reports[0] for r in reports)
+        assert reports[0].started
+
+
+class Parent:
+    def __init__(self, child: "Child") -> None:
+        self.child = child
+
+
+class Child:
+    def __init__(self, parent: jab.Lazy[Parent]) -> None:
+        self.parent = parent
+
+
+class Root:
+    def __init__(self, parent: Parent) -> None:
+        self.parent = parent
+
+
+def test_lazy_construction() -> None:
+    ReportClient.built = 0
+
+    h = jab.Harness().provide(Admin, ProvideReport, ReportClient)
+    h.build()
+
+    assert "Report" not in h._env
+    assert "ReportClient" not in h._env
+    assert not h._env["Admin"].report.built
+    assert h.inspect(Admin).dependencies[0].provided.obj is None
+
+    h._loop.run_until_complete(h._on_start())
+    h._run()
+
+    assert ReportClient.built == 1
+    assert h._env["Admin"].report.built
+    assert h._env["Report"].client is h._env["ReportClient"]
+    assert h._readiness.ready(Report)
+
+
+def test_lazy_breaks_cycle() -> None:
+    h = jab.Harness().provide(Root, Parent, Child)
+    h.build()
+
+    parent = h._env["Parent"]
+    assert h._env["Root"].parent is parent
+    assert h._loop.run_until_complete(parent.child.parent.get()) is parent
+
+
+class Teardowns:
+    def __init__(self) -> None:
+        self.order: List[str] = []
+
+
+class Settings:
+    def __init__(self, teardowns: Teardowns) -> None:
+        self.teardowns = teardowns
+
+    def on_stop(self) -> None:
+        self.teardowns.order.append("Settings")
+
+
+class Client:
+    def __init__(self, settings: jab.Lazy[Settings], teardowns: Teardowns) -> None:
+        self.settings = settings
+        self.teardowns = teardowns
+
+    async def on_start(self) -> None:
+        await self.settings.get()
+
+    def on_stop(self) -> None:
+        self.teardowns.order.append("Client")
+
+
+class Service:
+    def __init__(self, client: jab.Lazy[Client], teardowns: Teardowns) -> None:
+        self.client = client
+        self.teardowns = teardowns
+
+    async def run(self) -> None:
+        await self.client.get()
+
+    async def on_stop(self) -> None:
+        await asyncio.sleep(0.01)
+        self.teardowns.order.append("Service")
+
+
+def test_nested_lazy_access() -> None:
+    h = jab.Harness().provide(Service, Client, Settings, Teardowns)
+    h.build()
+    h._loop.run_until_complete(h._on_start())
+    h._loop.run_until_complete(asyncio.wait_for(h._env["Service"].run(), timeout=5))
+
+    assert h._readiness.ready(Client)
+    assert h._readiness.ready(Settings)
+
+    h._loop.run_until_complete(h._on_stop())
+    assert h._env["Teardowns"].order == ["Service", "Client", "Settings"]
+
+
+def test_lazy_cycle_teardown() -> None:
+    h = jab.Harness().provide(Root, Parent, Child)
+    h.build()
+    h._loop.run_until_complete(asyncio.wait_for(h._on_stop(), timeout=5))
@@ -0,0 +1,75 @@
+import asyncio
+from typing import List
+
+from typing_extensions import Protocol
+
+import jab
+
+
+class Directory(Protocol):
+    async def lookup(self, user: str) -> str:
+        pass  # pragma: no cover
+
+
+class RemoteDirectory:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    async def lookup(self, user: str) -> str:
+        self.calls.append(user)
+        await asyncio.sleep(0.01)
+        return user.upper()
+
+    def version(self) -> int:
+        self.calls.append("version")
+        return 1
+
+
+class Profiles:
+    def __init__(self, directory: Directory) -> None:
+        self.directory = directory
+
+
+def test_memoize() -> None:
+    h = (
+        jab.Harness()
+        .provide(RemoteDirectory, Profiles)
+        .decorate(jab.memoize(Directory, "lookup", "version", maxsize=2))
+    )
+
+    async def scenario() -> None:
+        async with h:
+            directory = h._env["Profiles"].directory
+            assert directory is h._env["RemoteDirectory"]
+
+            names = await asyncio.gather(*(directory.lookup("ada") for _ in range(5)))
+            assert names == ["ADA"] * 5
+            assert await directory.lookup("ada") == "ADA"
+            await directory.lookup("grace")
+            await directory.lookup("alan")
+            await directory.lookup("ada")
+            assert directory.version() == directory.version()
+
+            assert directory.calls == ["ada", "grace", "alan", "ada", "version"]
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    stats = h.inspect(RemoteDirectory).memoized
+    assert set(stats) == {"lookup", "version"}
+    lookup = stats["lookup"]
+    assert (lookup.hits, lookup.misses, lookup.coalesced, lookup.evictions, lookup.size) == (1, 4, 4, 2, 2)
+    assert stats["version"].hits == 1
+
+
+def test_memoize_ttl() -> None:
+    h = jab.Harness().provide(RemoteDirectory).decorate(jab.memoize(RemoteDirectory, "lookup", ttl=0.01))
+
+    async def scenario() -> None:
+        async with h:
+            directory = h._env["RemoteDirectory"]
+            await directory.lookup("ada")
+            await asyncio.sleep(0.02)
+            await directory.lookup("ada")
+            assert directory.calls == ["ada", "ada"]
+
+    asyncio.new_event_loop().run_until_complete(scenario())
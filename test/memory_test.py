@@ -0,0 +1,51 @@
+import jab
+
+
+class Small:
+    def __init__(self) -> None:
+        self.data = [0] * 10
+
+
+class Large:
+    def __init__(self, s: Small) -> None:
+        self.data = [bytes(100) for _ in range(20000)]
+
+    def on_start(self) -> None:
+        self.more = [bytes(100) for _ in range(5000)]
+
+
+def test_tracemalloc_accounting() -> None:
+    h = jab.Harness().provide(Small, Large).account_memory(top=3)
+    h.run()
+
+    report = h.memory_report()
+    assert [x.name for x in report] == ["Large", "Small"]
+
+    large = h.inspect(Large).memory
+    assert large is not None
+    assert large is report[0]
+    assert large.construct > 20000 * 100
+    assert large.on_start > 5000 * 100
+    assert len(large.top) <= 3
+    assert "memory_test.py" in large.top[0].location
+    small = h.inspect(Small).memory
+    assert small is not None
+    assert small.on_start == 0
+
+
+def test_rss_accounting() -> None:
+    h = jab.Harness().provide(Small, Large).account_memory(mode="rss")
+    h.build()
+
+    assert {x.name for x in h.memory_report()} == {"Small", "Large"}
+    large = h.inspect(Large).memory
+    assert large is not None
+    assert large.top == []
+
+
+def test_accounting_disabled() -> None:
+    h = jab.Harness().provide(Small)
+    h.build()
+
+    assert h.memory_report() == []
+    assert h.inspect(Small).memory is None
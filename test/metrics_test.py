@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+import jab
+from jab.metrics import Registry
+
+
+class Jobs:
+    def __init__(self, metrics: jab.Metrics) -> None:
+        self.processed = metrics.counter("jobs_processed_total", "Processed jobs")
+
+    async def on_start(self) -> None:
+        self.processed.inc()
+
+
+class Hello:
+    def __init__(self) -> None:
+        pass
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"hello"})
+
+
+def test_registry() -> None:
+    registry = Registry()
+    counter = registry.counter("requests_total", "Requests", {"route": "/"})
+    assert registry.counter("requests_total", labels={"route": "/"}) is counter
+
+    threads = [threading.Thread(target=lambda: [counter.inc() for _ in range(1000)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.value == 4000
+
+    histogram = registry.histogram("latency_seconds", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts() == [2, 3, 4]
+    assert histogram.count == 4
+
+    gauge = registry.gauge("in_flight")
+    gauge.inc(3)
+    gauge.dec()
+    assert gauge.value == 2
+
+    text = registry.expose()
+    assert "# HELP requests_total Requests\n# TYPE requests_total counter\n" in text
+    assert 'requests_total{route="/"} 4000\n' in text
+    assert 'latency_seconds_bucket{le="0.1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "latency_seconds_sum 2.65\n" in text
+    assert "in_flight 2\n" in text
+
+
+def test_harness_metrics() -> None:
+    h = jab.Harness().provide(Jobs, Hello).expose_metrics()
+
+    async def scenario() -> List[Dict[str, Any]]:
+        await h.start()
+        sent: List[Dict[str, Any]] = []
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        await h.asgi({"type": "http", "path": "/"})(receive, send)
+        await h.asgi({"type": "http", "path": "/metrics"})(receive, send)
+        await h.stop()
+        return sent
+
+    sent = asyncio.new_event_loop().run_until_complete(scenario())
+    assert sent[1]["body"] == b"hello"
+    assert sent[2]["status"] == 200
+
+    body = sent[3]["body"].decode()
+    assert "jobs_processed_total 1\n" in body
+    assert 'jab_asgi_requests_total{type="http"} 2\n' in body
+    assert 'jab_lifecycle_seconds_count{phase="on_start",provider="Jobs"} 1\n' in body
+
+    assert h._env["Jobs"].processed is h.metrics().counter("jobs_processed_total")
+    assert 'jab_lifecycle_seconds_count{phase="on_stop",provider="Jobs"} 1\n' in h.metrics().expose()
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import jab
+
+
+class Blocker:
+    def __init__(self) -> None:
+        pass
+
+    async def on_start(self) -> None:
+        await asyncio.sleep(0)
+
+    async def run(self) -> None:
+        await asyncio.sleep(0.05)
+        time.sleep(0.08)
+        await asyncio.sleep(0.05)
+
+
+class Quiet:
+    def __init__(self) -> None:
+        pass
+
+    async def run(self) -> None:
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+
+
+def test_slow_step_attribution() -> None:
+    h = jab.Harness().provide(Blocker, Quiet).monitor(interval=0.01, threshold=0.05)
+    h.run()
+
+    stats = h.loop_stats()
+    assert stats is not None
+    assert stats.samples > 0
+    assert stats.max_lag >= 0.05
+    assert stats.slow_steps == 1
+    assert stats.recent[0].owner == "Blocker"
+    assert stats.recent[0].method == "run"
+    assert stats.recent[0].duration >= 0.08
+
+    assert stats.owners["Blocker.run"].max_step >= 0.08
+    assert stats.owners["Blocker.on_start"].slow_steps == 0
+    assert stats.owners["Quiet.run"].steps == 6
+    assert stats.owners["Quiet.run"].slow_steps == 0
+
+
+def test_monitor_disabled() -> None:
+    h = jab.Harness().provide(Quiet)
+    h.run()
+    assert h.loop_stats() is None
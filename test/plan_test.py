@@ -0,0 +1,271 @@
+import asyncio
+import importlib
+import io
+import sys
+
+import pytest
+
+import jab
+from jab.cli import freeze
+from jab.plan import Frozen, fingerprint, generate
+
+WIRING = """
+from typing import AsyncIterator, List
+
+from typing_extensions import Protocol
+
+import jab
+
+events: List[str] = []
+
+
+class Named(Protocol):
+    def name(self) -> str:
+        pass
+
+
+class Config:
+    def __init__(self) -> None:
+        events.append("Config")
+
+    def name(self) -> str:
+        return "config"
+
+
+class Database:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    async def on_start(self) -> None:
+        events.append("Database.on_start")
+
+    def on_stop(self) -> None:
+        events.append("Database.on_stop")
+
+
+async def connect(n: Named) -> AsyncIterator[Database]:
+    events.append("connect")
+    yield Database(n.name())
+    events.append("disconnect")
+
+
+class Server:
+    def __init__(self, db: Database, *, log: jab.Logger) -> None:
+        self.db = db
+        self.log = log
+
+    def on_start(self, n: Named, db: Database) -> None:
+        events.append("Server.on_start")
+
+    async def run(self) -> None:
+        events.append("Server.run")
+
+    async def on_stop(self) -> None:
+        events.append("Server.on_stop")
+
+
+def decorate(s: Server) -> Server:
+    return s
+
+
+harness = jab.Harness().provide(Config, connect, Server)
+decorated = jab.Harness().provide(Config, connect, Server).decorate(decorate)
+"""
+
+MEMBERS = """
+from __future__ import annotations
+
+from typing_extensions import Protocol
+
+
+class Named(Protocol):
+    def name(self) -> str:
+        pass
+
+
+class Config:
+    def __init__(self) -> None:
+        pass
+
+
+class Settings:
+    def __init__(self) -> None:
+        pass
+
+    def name(self) -> str:
+        return "settings"
+
+
+class Server:
+    def __init__(self, n: Named) -> None:
+        self.n = n
+"""
+
+EVENTS = [
+    "Config",
+    "connect",
+    "Database.on_start",
+    "Server.on_start",
+    "Server.run",
+    "Server.on_stop",
+    "Database.on_stop",
+    "disconnect",
+]
+
+
+@pytest.fixture()
+def wiring(tmp_path, monkeypatch):
+    (tmp_path / "plan_wiring.py").write_text(WIRING)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("plan_wiring")
+    for module in ("plan_wiring", "plan_frozen"):
+        sys.modules.pop(module, None)
+
+
+def test_freeze(wiring, tmp_path):
+    out = io.StringIO()
+    assert freeze("plan_wiring:harness", str(tmp_path / "plan_frozen.py"), out, io.StringIO()) == 0
+    assert "OK plan_wiring:harness" in out.getvalue()
+
+    frozen = importlib.import_module("plan_frozen")
+    source = (tmp_path / "plan_frozen.py").read_text()
+    assert "_plan_wiring.Server(database, log=default_logger)" in source
+    assert not frozen.harness.stale
+
+    async def scenario() -> None:
+        async with frozen.harness:
+            await asyncio.sleep(0.01)
+            server = frozen.harness.env["Server"]
+            assert server.db.url == "config"
+            assert server.log is wiring.harness._logger
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert wiring.events == EVENTS
+
+    def title(self) -> str:
+        pass  # pragma: no cover
+
+    assert not Frozen(wiring.harness, frozen.FINGERPRINT, None, None, None).stale  # type: ignore
+    wiring.Config.title = title
+    assert Frozen(wiring.harness, frozen.FINGERPRINT, None, None, None).stale  # type: ignore
+
+
+def test_stale_freeze(wiring):
+    frozen = Frozen(wiring.harness, "stale", None, None, None)  # type: ignore
+    assert frozen.stale
+
+    async def scenario() -> None:
+        async with frozen:
+            await asyncio.sleep(0.01)
+            assert frozen.harness._env["Server"].db.url == "config"
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert wiring.events == EVENTS
+
+
+def test_fingerprint(wiring):
+    digest = fingerprint(wiring.harness._provided)
+    assert digest == fingerprint(dict(wiring.harness._provided))
+
+    class Server(wiring.Server):
+        def on_start(self, db: wiring.Database) -> None:  # type: ignore
+            pass
+
+    Server.__qualname__ = wiring.Server.__qualname__
+    Server.__module__ = wiring.Server.__module__
+    assert fingerprint(dict(wiring.harness._provided, Server=Server)) != digest
+
+    class Named:
+        def name(self) -> str:
+            pass  # pragma: no cover
+
+        def title(self) -> str:
+            pass  # pragma: no cover
+
+    def connect(n: Named) -> wiring.Database:
+        pass  # pragma: no cover
+
+    connect.__qualname__ = wiring.connect.__qualname__
+    connect.__module__ = wiring.connect.__module__
+    assert fingerprint(dict(wiring.harness._provided, connect=connect)) != digest
+
+
+def test_freeze_unfreezable(wiring):
+    err = io.StringIO()
+    assert freeze("plan_wiring:decorated", None, io.StringIO(), err) == 1
+    assert "NotFreezable" in err.getvalue()
+
+    assert freeze("plan_wiring:nothing", None, io.StringIO(), io.StringIO()) == 2
+
+    def Local() -> jab.Logger:
+        pass  # pragma: no cover
+
+    with pytest.raises(jab.Exceptions.NotFreezable):
+        generate(jab.Harness().provide(Local), "local:harness")
+
+
+def test_cache_plan(wiring, tmp_path, monkeypatch):
+    path = str(tmp_path / "plan.json")
+
+    def provide() -> jab.Harness:
+        return jab.Harness().provide(wiring.Config, wiring.connect, wiring.Server).cache_plan(path)
+
+    resolved = provide().resolve()
+    assert not resolved.cached
+
+    def search(self, dep):
+        raise AssertionError(f"searched for {dep}")
+
+    with monkeypatch.context() as m:
+        m.setattr(jab.Harness, "_search", search)
+        h = provide()
+        cached = h.resolve()
+
+        assert cached.cached
+        assert cached.exec_order == resolved.exec_order
+        assert (cached.edges, cached.depth, cached.on_start_hooks) == (3, 3, 2)
+
+        async def scenario() -> None:
+            async with h:
+                await asyncio.sleep(0.01)
+
+        asyncio.new_event_loop().run_until_complete(scenario())
+        assert wiring.events == EVENTS
+
+    changed = jab.Harness().provide(wiring.Config, wiring.connect).cache_plan(path)
+    assert not changed.resolve().cached
+    assert provide().resolve().cached is False
+
+    with open(path, "w") as f:
+        f.write("{")
+    assert not provide().resolve().cached
+    assert provide().resolve().cached
+
+
+def test_cache_plan_members(tmp_path, monkeypatch):
+    (tmp_path / "plan_members.py").write_text(MEMBERS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    members = importlib.import_module("plan_members")
+    path = str(tmp_path / "plan.json")
+
+    def provide() -> jab.Harness:
+        return jab.Harness().provide(members.Config, members.Settings, members.Server).cache_plan(path)
+
+    assert not provide().resolve().cached
+    assert provide().resolve().cached
+
+    digest = fingerprint(provide()._provided)
+    members.Named.title = members.Settings.name
+    assert fingerprint(provide()._provided) != digest
+    del members.Named.title
+
+    members.Config.name = members.Settings.name
+    h = provide()
+    assert not h.resolve().cached
+
+    async def scenario() -> None:
+        async with h:
+            assert isinstance(h._env["Server"].n, members.Config)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    sys.modules.pop("plan_members")
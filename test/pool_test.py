@@ -0,0 +1,169 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+import jab
+
+events: List[str] = []
+
+
+class Config:
+    def __init__(self) -> None:
+        self.capacity = 4
+
+
+@jab.pooled(size=2, limit=3, idle=0.05)
+class Buffer:
+    def __init__(self, config: Config) -> None:
+        self.data: List[int] = []
+        self.capacity = config.capacity
+
+    def reset(self) -> None:
+        if self.data == [-1]:
+            raise ValueError("corrupt")
+        self.data.clear()
+
+    def on_stop(self) -> None:
+        events.append("Buffer.on_stop")
+
+
+class Handler:
+    def __init__(self, buffers: jab.Pool[Buffer]) -> None:
+        self.buffers = buffers
+        self.seen: List[Buffer] = []
+
+    async def handle(self, value: int, hold: float = 0.0) -> None:
+        async with self.buffers.checkout() as buffer:
+            assert buffer.data == []
+            buffer.data.append(value)
+            self.seen.append(buffer)
+            await asyncio.sleep(hold)
+
+
+class Session:
+    pass
+
+
+async def connect() -> AsyncIterator[Session]:
+    events.append("connect")
+    yield Session()
+    events.append("disconnect")
+
+
+class Sessions:
+    def __init__(self, sessions: jab.Pool[Session]) -> None:
+        self.sessions = sessions
+
+
+def test_pool() -> None:
+    events.clear()
+    h = jab.Harness().provide(Config, Buffer, Handler)
+
+    async def scenario() -> None:
+        async with h:
+            assert "Buffer" not in h._env
+            handler: Handler = h._env["Handler"]
+            stats = h.inspect(Buffer).pool
+            assert (stats.instances, stats.in_use, stats.created) == (2, 0, 2)
+
+            await handler.handle(1)
+            await handler.handle(2)
+            assert handler.seen[0] is handler.seen[1]
+
+            await asyncio.gather(*(handler.handle(i, 0.02) for i in range(5)))
+            stats = h.inspect(Buffer).pool
+            assert (stats.instances, stats.peak_in_use, stats.created) == (3, 3, 3)
+            assert stats.checkouts == 7 and stats.waits == 2
+            assert stats.max_wait > 0.01 and stats.utilization == 0
+
+            await asyncio.sleep(0.15)
+            stats = h.inspect(Buffer).pool
+            assert (stats.instances, stats.discarded) == (2, 1)
+            assert h.job_stats() == {}
+            assert events == ["Buffer.on_stop"]
+
+            await handler.handle(-1)
+            stats = h.inspect(Buffer).pool
+            assert (stats.instances, stats.discarded) == (1, 2)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert events == ["Buffer.on_stop"] * 3
+
+
+def test_pool_generator() -> None:
+    events.clear()
+    h = jab.Harness().provide(connect, Sessions)
+
+    async def scenario() -> None:
+        async with h:
+            pool = h._env["Sessions"].sessions
+            async with pool.checkout() as a, pool.checkout() as b:
+                assert isinstance(a, Session) and a is not b
+
+        with pytest.raises(RuntimeError):
+            async with pool.checkout():
+                pass  # pragma: no cover
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert events == ["connect", "connect", "disconnect", "disconnect"]
+
+
+class Worker:
+    def __init__(self, buffers: jab.Pool[Buffer]) -> None:
+        self.buffers = buffers
+
+    async def run(self) -> None:
+        async with self.buffers.checkout() as buffer:
+            buffer.data.append(1)
+
+
+class App:
+    def __init__(self, handler: Handler) -> None:
+        self.handler = handler
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        await self.handler.handle(0, 0.02)
+
+
+def test_pool_run() -> None:
+    events.clear()
+    h = jab.Harness().provide(Config, Buffer, Worker)
+    h.run()
+
+    assert events == ["Buffer.on_stop"] * 2
+    assert h.inspect(Buffer).pool.checkouts == 1
+
+
+def test_pool_lifespan() -> None:
+    events.clear()
+    h = jab.Harness().provide(Config, Buffer, Handler, App)
+
+    async def scenario() -> None:
+        incoming: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+        async def send(msg: Dict[str, Any]) -> None:
+            pass
+
+        lifespan = asyncio.ensure_future(h.asgi({"type": "lifespan"})(incoming.get, send))
+        await incoming.put({"type": "lifespan.startup"})
+        await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(h.asgi({"type": "http", "path": "/"})(incoming.get, send) for _ in range(3)))
+        assert h.inspect(Buffer).pool.instances == 3
+
+        await asyncio.sleep(0.15)
+        stats = h.inspect(Buffer).pool
+        assert (stats.instances, stats.discarded) == (2, 1)
+        assert events == ["Buffer.on_stop"]
+
+        await incoming.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(lifespan, timeout=5)
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert events == ["Buffer.on_stop"] * 3
+
+
+def test_pooled_settings() -> None:
+    with pytest.raises(ValueError):
+        jab.pooled(size=4, limit=2)
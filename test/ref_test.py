@@ -0,0 +1,130 @@
+import asyncio
+import sys
+from typing import List
+
+import pytest
+from typing_extensions import Protocol
+
+import jab
+
+HEAVY = """
+from typing import List
+
+import ref_light
+
+
+class Model:
+    def __init__(self, events: ref_light.Events) -> None:
+        self.events = events
+
+    def predict(self) -> int:
+        return 42
+
+    def on_start(self) -> None:
+        self.events.append("Model.on_start")
+"""
+
+LIGHT = """
+from typing import List
+
+
+class Events(List[str]):
+    pass
+"""
+
+UNUSED = """
+raise RuntimeError("never imported")
+"""
+
+
+class Predictor(Protocol):
+    def predict(self) -> int:
+        pass  # pragma: no cover
+
+
+class Store(Protocol):
+    def fetch(self) -> bytes:
+        pass  # pragma: no cover
+
+
+class Service:
+    def __init__(self, predictor: Predictor) -> None:
+        self.predictor = predictor
+
+
+@pytest.fixture()
+def modules(tmp_path, monkeypatch):
+    for name, source in (("ref_heavy", HEAVY), ("ref_light", LIGHT), ("ref_unused", UNUSED)):
+        (tmp_path / f"{name}.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in ("ref_heavy", "ref_light", "ref_unused"):
+        sys.modules.pop(name, None)
+
+
+def test_ref(modules) -> None:
+    import ref_light
+
+    events: List[str] = ref_light.Events()
+
+    def provide_events() -> ref_light.Events:
+        return events  # type: ignore
+
+    h = jab.Harness().provide(
+        jab.ref("ref_heavy:Model", provides=Predictor),
+        jab.ref("ref_unused:Store", provides=Store),
+        Service,
+        provide_events,
+    )
+
+    resolution = h.resolve()
+    assert "ref_heavy" in sys.modules
+    assert "ref_unused" not in sys.modules
+    assert "Store" not in resolution.exec_order
+
+    async def scenario() -> None:
+        async with h:
+            assert h._env["Service"].predictor.predict() == 42
+            assert h._readiness.complete
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert events == ["Model.on_start"]
+    assert "ref_unused" not in sys.modules
+
+    records = {x.name: x for x in h.inspect()}
+    assert records["Predictor"].imported.module == "ref_heavy"
+    assert records["Predictor"].imported.seconds > 0
+    assert records["Predictor"].imported.modules == 1
+    assert records["Store"].imported is None and records["Store"].obj is None
+
+
+def test_bad_ref(modules) -> None:
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        jab.ref("ref_heavy.Model", provides=Predictor)
+
+    h = jab.Harness().provide(jab.ref("ref_heavy:Missing", provides=Predictor), Service)
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        h.resolve()
+
+    h = jab.Harness().provide(jab.ref("ref_missing:Store", provides=Predictor), Service)
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        h.resolve()
+
+
+def test_ref_protocol_import(modules) -> None:
+    import ref_light
+
+    def provide_events() -> ref_light.Events:
+        return ref_light.Events()
+
+    h = jab.Harness().provide(
+        jab.ref("ref_unused:Store", provides="ref_unused:Store"),
+        jab.ref("ref_unused:Cache", provides="ref_unused:Cache", members={"fetch"}),
+        jab.ref("ref_heavy:Model", provides="ref_heavy:Model", members={"on_start", "predict"}),
+        Service,
+        provide_events,
+    )
+
+    assert h.resolve().exec_order == ["Events", "Model", "Service"]
+    assert "ref_heavy" in sys.modules
+    assert "ref_unused" not in sys.modules
@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import jab
+
+
+class Catalog:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        self.calls += 1
+        headers = [(b"cache-control", b"no-store")] if scope["path"] == "/cart" else []
+        if scope["path"] == "/short":
+            headers = [(b"cache-control", b"max-age=0.05")]
+
+        body = scope["path"].encode() * 10
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body[:10], "more_body": True})
+        await send({"type": "http.response.body", "body": body[10:]})
+
+
+class Accounts:
+    HEADERS = {
+        "/session": [(b"set-cookie", b"session=1")],
+        "/any": [(b"vary", b"*")],
+        "/language": [(b"vary", b"Accept-Encoding, Accept-Language")],
+        "/format": [(b"Vary", b"Accept")],
+        "/public": [(b"cache-control", b"public, max-age=60")],
+    }
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        path = scope["path"]
+        self.calls[path] = self.calls.get(path, 0) + 1
+        headers: Any = scope["headers"]
+        user = dict(headers).get(b"authorization", b"")
+        await send({"type": "http.response.start", "status": 200, "headers": self.HEADERS.get(path, [])})
+        await send({"type": "http.response.body", "body": path.encode() + user})
+
+
+def test_response_cache_privacy() -> None:
+    h = jab.Harness().provide(Accounts).cache_responses(max_bytes=1000, ttl=60, vary=["accept"])
+
+    async def get(path: str, *headers: Tuple[bytes, bytes]) -> bytes:
+        body = b""
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            nonlocal body
+            body += msg.get("body", b"")
+
+        scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": list(headers)}
+        await h.asgi(scope)(receive, send)  # type: ignore
+        return body
+
+    async def scenario() -> None:
+        async with h:
+            accounts = h._env["Accounts"]
+            for path in ("/session", "/any", "/language", "/format"):
+                await get(path)
+                await get(path)
+
+            assert accounts.calls == {"/session": 2, "/any": 2, "/language": 2, "/format": 1}
+
+            assert await get("/profile", (b"authorization", b"alice")) == b"/profilealice"
+            assert await get("/profile", (b"authorization", b"bob")) == b"/profilebob"
+            await get("/profile", (b"cookie", b"session=1"))
+            assert accounts.calls["/profile"] == 3
+
+            await get("/public", (b"authorization", b"alice"))
+            assert await get("/public", (b"authorization", b"bob")) == b"/publicalice"
+            assert accounts.calls["/public"] == 1
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+
+def test_response_cache() -> None:
+    h = jab.Harness().provide(Catalog).cache_responses(max_bytes=200, ttl=60, vary=["accept"])
+
+    async def get(path: str, *headers: Tuple[bytes, bytes], method: str = "GET") -> List[Dict[str, Any]]:
+        sent: List[Dict[str, Any]] = []
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg)
+
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": b"",
+            "headers": list(headers),
+        }
+        await h.asgi(scope)(receive, send)  # type: ignore
+        return sent
+
+    async def scenario() -> None:
+        async with h:
+            catalog = h._env["Catalog"]
+
+            first = await get("/items")
+            assert await get("/items") == first
+            assert b"".join(m.get("body", b"") for m in first) == b"/items" * 10
+            assert catalog.calls == 1
+
+            await get("/items", (b"accept", b"text/html"))
+            await get("/items", (b"cache-control", b"no-cache"))
+            await get("/items", method="POST")
+            await get("/cart")
+            await get("/cart")
+            assert catalog.calls == 6
+
+            await get("/short")
+            await asyncio.sleep(0.06)
+            await get("/short")
+            assert catalog.calls == 8
+
+            # /items with and without the accept header take up 120 bytes, /short evicts the older one.
+            stats = h.response_cache_stats()
+            assert stats is not None
+            assert (stats.hits, stats.evictions, stats.entries) == (1, 1, 2)
+            assert stats.bytes <= 200
+
+    asyncio.new_event_loop().run_until_complete(scenario())
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from typing_extensions import Protocol
+
+import jab
+
+scanning = sys.modules["jab.scan"]
+
+DB = """
+import jab
+
+
+@jab.provided
+class Database:
+    def __init__(self) -> None:
+        self.rows = ["jab"]
+
+    def query(self) -> str:
+        return self.rows[0]
+"""
+
+SEARCH = """
+from typing import AsyncIterator
+
+from jab import provided
+
+from ..db import Database
+
+
+class Index:
+    def __init__(self, db: Database) -> None:
+        self.db = db
+
+    def search(self) -> str:
+        return self.db.query()
+
+
+@provided
+async def connect(db: "Database") -> "AsyncIterator[Index]":
+    yield Index(db)
+"""
+
+UNUSED = """
+import jab
+
+raise RuntimeError("never imported")
+
+
+@jab.provided
+class Mailer:
+    def send(self) -> None:
+        pass
+"""
+
+SESSIONS = """
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager
+
+import jab
+
+from .db import Database
+
+
+@jab.provided
+@asynccontextmanager
+async def session(db: Database) -> AsyncContextManager["Session"]:
+    yield Session()
+
+
+class Session:
+    pass
+"""
+
+UNANNOTATED = """
+import jab
+
+
+@jab.provided
+def connect():
+    pass
+"""
+
+ITERABLE = """
+from typing import Iterable
+
+import jab
+
+
+@jab.provided
+def routes() -> Iterable[str]:
+    return ["/"]
+"""
+
+
+class Searcher(Protocol):
+    def search(self) -> str:
+        pass  # pragma: no cover
+
+
+class Service:
+    def __init__(self, searcher: Searcher) -> None:
+        self.searcher = searcher
+
+
+@pytest.fixture()
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "scanpkg"
+    (root / "sub").mkdir(parents=True)
+    for path, source in (
+        ("__init__.py", ""),
+        ("db.py", DB),
+        ("unused.py", UNUSED),
+        ("sub/__init__.py", ""),
+        ("sub/search.py", SEARCH),
+        ("sessions.py", SESSIONS),
+    ):
+        (root / path).write_text(source)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield root
+    for module in [x for x in sys.modules if x == "scanpkg" or x.startswith("scanpkg.")]:
+        sys.modules.pop(module)
+
+
+def test_scan(package, monkeypatch) -> None:
+    refs = jab.scan("scanpkg")
+    assert {(x.target, x.declared, x.name) for x in refs} == {
+        ("scanpkg.db:Database", "scanpkg.db:Database", "Database"),
+        ("scanpkg.unused:Mailer", "scanpkg.unused:Mailer", "Mailer"),
+        ("scanpkg.sub.search:connect", "scanpkg.sub.search:Index", "Index"),
+        ("scanpkg.sessions:session", "scanpkg.sessions:Session", "Session"),
+    }
+    assert "scanpkg.db" not in sys.modules
+    assert os.path.exists(package / "__pycache__" / "jab-scan-scanpkg.json")
+
+    h = jab.Harness().provide(*refs, Service)
+
+    async def scenario() -> None:
+        async with h:
+            assert h._env["Service"].searcher.search() == "jab"
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert "scanpkg.unused" not in sys.modules
+
+    with monkeypatch.context() as m:
+        m.setattr(scanning, "_parse", lambda module, path: pytest.fail(f"parsed {module}"))
+        assert [x.target for x in jab.scan("scanpkg")] == [x.target for x in refs]
+
+    (package / "db.py").write_text(DB.replace("@jab.provided\n", ""))
+    os.utime(package / "db.py", ns=(0, 0))
+    assert "scanpkg.db:Database" not in [x.target for x in jab.scan("scanpkg")]
+
+
+def test_scan_errors(package) -> None:
+    with pytest.raises(jab.Exceptions.NoConstructor):
+        jab.scan("scanpkg_missing")
+
+    (package / "broken.py").write_text(UNANNOTATED)
+    with pytest.raises(jab.Exceptions.NoAnnotation):
+        jab.scan("scanpkg", cache=str(package / "scan.json"))
+
+    (package / "broken.py").write_text(ITERABLE)
+    with pytest.raises(jab.Exceptions.NoAnnotation):
+        jab.scan("scanpkg", cache=str(package / "scan.json"))
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+import jab
+from jab.scheduler import Cron
+
+
+class Heartbeat:
+    def __init__(self, scheduler: jab.Scheduler) -> None:
+        self.scheduler = scheduler
+        self.beats = 0
+        self.flushed: List[int] = []
+        self.stopped_with: List[int] = []
+
+    async def on_start(self) -> None:
+        self.scheduler.every(0.01, self.beat, name="beat")
+        self.scheduler.every(0.01, self.fail, name="fail")
+
+    def beat(self) -> None:
+        self.beats += 1
+
+    async def fail(self) -> None:
+        raise ValueError("down")
+
+    async def flush(self, n: int) -> None:
+        await asyncio.sleep(0.01)
+        self.flushed.append(n)
+
+    async def on_stop(self) -> None:
+        self.stopped_with = list(self.flushed)
+
+
+def test_scheduler() -> None:
+    h = jab.Harness().background(concurrency=2, queue_size=2).provide(Heartbeat)
+
+    async def scenario() -> None:
+        async with h:
+            heartbeat: Heartbeat = h._env["Heartbeat"]
+            await asyncio.sleep(0.1)
+            assert 2 < heartbeat.beats <= 12
+
+            for n in range(6):
+                await heartbeat.scheduler.submit(lambda n=n: heartbeat.flush(n))  # type: ignore
+            assert heartbeat.scheduler.queued <= 2
+
+        beats = heartbeat.beats
+        await asyncio.sleep(0.03)
+        assert heartbeat.beats == beats
+        assert sorted(heartbeat.stopped_with) == list(range(6))
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+
+    stats = h.job_stats()
+    assert stats["beat"].runs > 2 and stats["beat"].failures == 0
+    assert stats["fail"].runs == stats["fail"].failures > 2
+    assert stats["beat"].max_duration >= stats["beat"].mean_duration > 0
+    assert "jab_job_seconds_count" in h.metrics().expose()
+
+
+class Ping:
+    def __init__(self, heartbeat: Heartbeat) -> None:
+        self.heartbeat = heartbeat
+
+    async def asgi(self, scope: Dict[str, str], receive: jab.Receive, send: jab.Send) -> None:
+        pass  # pragma: no cover
+
+
+def test_scheduler_lifespan() -> None:
+    h = jab.Harness().provide(Heartbeat, Ping)
+
+    async def scenario() -> None:
+        incoming: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        sent: List[str] = []
+
+        async def send(msg: Dict[str, Any]) -> None:
+            sent.append(msg["type"])
+
+        lifespan = asyncio.ensure_future(h.asgi({"type": "lifespan"})(incoming.get, send))
+        await incoming.put({"type": "lifespan.startup"})
+        await asyncio.sleep(0.1)
+        assert sent == ["lifespan.startup.complete"]
+
+        heartbeat: Heartbeat = h._env["Heartbeat"]
+        assert heartbeat.beats > 2
+
+        await incoming.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(lifespan, timeout=5)
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+        beats = heartbeat.beats
+        await asyncio.sleep(0.03)
+        assert heartbeat.beats == beats
+
+    asyncio.new_event_loop().run_until_complete(scenario())
+    assert h.job_stats()["beat"].runs > 2
+
+
+def test_cron() -> None:
+    assert Cron("*/15 * * * *").next(datetime(2024, 1, 1, 10, 7, 30)) == datetime(2024, 1, 1, 10, 15)
+    assert Cron("0 9 * * 1-5").next(datetime(2024, 1, 5, 9, 0)) == datetime(2024, 1, 8, 9, 0)
+    assert Cron("30 0 29 2 *").next(datetime(2024, 3, 1)) == datetime(2028, 2, 29, 0, 30)
+    assert Cron("0 0 1,15 * 0").next(datetime(2024, 1, 1)) == datetime(2024, 1, 7)
+
+    with pytest.raises(ValueError):
+        Cron("* * * *")
+
+    with pytest.raises(ValueError):
+        Cron("60 * * * *")
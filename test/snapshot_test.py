@@ -0,0 +1,80 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+import jab
+
+stopped: List[Dict[str, int]] = []
+
+
+class Cache:
+    snapshot_version = 2
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, int] = {}
+        self.restored: Optional[memoryview] = None
+
+    def restore(self, buffer: memoryview) -> None:
+        self.restored = buffer
+        for line in bytes(buffer).decode().splitlines():
+            key, _, value = line.partition("=")
+            self.entries[key] = int(value)
+
+    async def snapshot(self) -> bytes:
+        return "\n".join(f"{k}={v}" for k, v in self.entries.items()).encode()
+
+    def on_stop(self) -> None:
+        stopped.append(dict(self.entries))
+        self.entries.clear()
+
+
+class Broken(Cache):
+    def restore(self, buffer: memoryview) -> None:
+        raise ValueError("unreadable")
+
+
+def test_snapshots(tmp_path) -> None:
+    directory = str(tmp_path / "snapshots")
+
+    def run(provided: type = Cache) -> Cache:
+        h = jab.Harness().snapshots(directory).provide(provided)
+
+        async def scenario() -> Cache:
+            async with h:
+                cache: Cache = h._env[provided.__name__]
+                cache.entries["hits"] = cache.entries.get("hits", 0) + 1
+                return cache
+
+        return asyncio.new_event_loop().run_until_complete(scenario())
+
+    first = run()
+    assert first.restored is None
+    assert stopped[-1] == {"hits": 1}
+    assert os.listdir(directory) == ["Cache.snapshot"]
+
+    second = run()
+    assert isinstance(second.restored, memoryview) and second.restored.readonly
+    assert stopped[-1] == {"hits": 2}
+
+    path = os.path.join(directory, "Cache.snapshot")
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"X")
+
+    third = run()
+    assert third.restored is None
+    assert stopped[-1] == {"hits": 1}
+
+    Cache.snapshot_version = 3
+    try:
+        assert run().restored is None
+    finally:
+        Cache.snapshot_version = 2
+
+    with open(path, "wb") as f:
+        f.write(b"JAB")
+    assert run().restored is None
+
+    os.replace(path, os.path.join(directory, "Broken.snapshot"))
+    assert run(Broken).restored is None
+    assert stopped[-1] == {"hits": 1}